@@ -4,6 +4,75 @@ Vercel serverless function for Waitlist API
 from http.server import BaseHTTPRequestHandler
 import json
 import os
+import sys
+from datetime import datetime, timedelta
+
+# Share row building (labels, header row) with the FastAPI app via app/ingestion.py
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.ingestion import Ingestion, SheetsSink  # noqa: E402
+
+# ── Google Sheets client cache ──────────────
+# Module globals survive warm invocations on the same Vercel instance, so the OAuth
+# token exchange, spreadsheet metadata fetch and header check happen once per instance
+# instead of once per submission. gspread/google-auth are imported lazily so GET and
+# OPTIONS never pay for them on a cold start.
+
+# Refresh the access token this long before it expires
+TOKEN_REFRESH_MARGIN_SECONDS = 300
+
+_sheets_cache = {}
+
+
+def _reset_sheets_cache():
+    _sheets_cache.clear()
+
+
+def _get_ingestion(spreadsheet_id, service_email, private_key, project_id):
+    """Ingestion pipeline appending to the authorized spreadsheet, reused across warm invocations."""
+    config_key = (spreadsheet_id, service_email, project_id, hash(private_key))
+    if _sheets_cache.get("config_key") != config_key:
+        _reset_sheets_cache()
+        import gspread
+        from google.oauth2.service_account import Credentials
+
+        scopes = [
+            'https://www.googleapis.com/auth/spreadsheets',
+            'https://www.googleapis.com/auth/drive'
+        ]
+        service_account_info = {
+            "type": "service_account",
+            "project_id": project_id,
+            "private_key": private_key,
+            "client_email": service_email,
+            "token_uri": "https://oauth2.googleapis.com/token",
+        }
+        credentials = Credentials.from_service_account_info(service_account_info, scopes=scopes)
+        client = gspread.authorize(credentials)
+        spreadsheet = client.open_by_key(spreadsheet_id)
+        _sheets_cache.update(
+            config_key=config_key,
+            credentials=credentials,
+            # The sink opens the worksheet and checks headers once, then only appends
+            ingestion=Ingestion(SheetsSink(lambda: spreadsheet)),
+        )
+
+    # google-auth refreshes on demand too; doing it ahead of expiry keeps the refresh
+    # off the append call and lets a failed refresh rebuild the client cleanly
+    credentials = _sheets_cache["credentials"]
+    expiry = credentials.expiry  # naive UTC, per google-auth
+    if not credentials.valid or (
+        expiry and expiry - datetime.utcnow() < timedelta(seconds=TOKEN_REFRESH_MARGIN_SECONDS)
+    ):
+        from google.auth.transport.requests import Request
+        try:
+            credentials.refresh(Request())
+        except Exception:
+            _reset_sheets_cache()
+            raise
+
+    return _sheets_cache["ingestion"]
+
 
 class handler(BaseHTTPRequestHandler):
     def _send_json(self, data, status=200):
@@ -48,6 +117,7 @@ class handler(BaseHTTPRequestHandler):
             self._send_json({"error": "Not found", "path": path}, 404)
             return
         
+        store, key = None, None
         try:
             # Read request body
             content_length = int(self.headers.get('Content-Length', 0))
@@ -75,183 +145,39 @@ class handler(BaseHTTPRequestHandler):
                 self._send_json({"success": True, "message": "Received (invalid key format)"})
                 return
             
-            # Import Google libraries
-            import gspread
-            from google.oauth2.service_account import Credentials
-            from datetime import datetime
-            
-            scopes = [
-                'https://www.googleapis.com/auth/spreadsheets',
-                'https://www.googleapis.com/auth/drive'
-            ]
-            
-            service_account_info = {
-                "type": "service_account",
-                "project_id": project_id,
-                "private_key": private_key,
-                "client_email": service_email,
-                "token_uri": "https://oauth2.googleapis.com/token",
-            }
-            
-            credentials = Credentials.from_service_account_info(service_account_info, scopes=scopes)
-            client = gspread.authorize(credentials)
-            spreadsheet = client.open_by_key(spreadsheet_id)
-            
-            try:
-                worksheet = spreadsheet.worksheet("Waitlist")
-            except gspread.WorksheetNotFound:
-                worksheet = spreadsheet.add_worksheet(title="Waitlist", rows=1000, cols=20)
+            # Double-clicks and client retries: same Idempotency-Key (or same email and answers)
+            # gets the first response back without another row or welcome email; a corrected
+            # resubmission hashes differently and goes through
+            from app.idempotency import DONE, get_idempotency_store, idempotency_key, normalize_email
+            header_key = self.headers.get('Idempotency-Key')
+            email_key = normalize_email(data.get('email', ''))
+            if header_key or email_key:
+                store = get_idempotency_store()
+                key = (
+                    idempotency_key("web:waitlist:key", header_key) if header_key
+                    else idempotency_key(
+                        "web:waitlist:email",
+                        email_key,
+                        json.dumps({k: v for k, v in data.items() if k != 'email'}, sort_keys=True),
+                    )
+                )
+                existing = store.claim(key)
+                if existing is not None:
+                    store, key = None, None  # not ours to release
+                    if existing["state"] == DONE:
+                        self._send_json(existing["result"])
+                    else:
+                        self._send_json({"success": False, "message": "This submission is already being processed"}, 409)
+                    return
+
+            ingestion = _get_ingestion(spreadsheet_id, service_email, private_key, project_id)
             
-            # Ensure headers - match the full schema from google_sheets.py
-            headers = [
-                "Timestamp",
-                "Full Name",
-                "Email",
-                "Phone",
-                "Role",
-                "Owner Email",
-                "Clinic Name",
-                "Clinic Type",
-                "Other Clinic Type",
-                "Clinic Size",
-                "Number of Doctors",
-                "Number of Locations",
-                "Doctor Emails",
-                "Location Addresses",
-                "Pain Points",
-                "Current Setup",
-                "Impact Level",
-                "Willingness to Pay",
-                "Price Range",
-                "Solution Wins",
-                "Other Wish"
-            ]
             try:
-                existing = worksheet.row_values(1)
-                if not existing or existing != headers:
-                    worksheet.update('A1', [headers])
-            except Exception as e:
-                print(f"Warning: Could not update headers: {e}")
-                worksheet.update('A1', [headers])
-            
-            timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-            
-            # Format phone with single quote prefix to force text format
-            phone_value = data.get('phone', '')
-            if phone_value:
-                phone_value = f"'{phone_value}"
-            
-            # Convert lists to readable strings
-            pain_points = data.get('painPoints', [])
-            if isinstance(pain_points, list):
-                # Convert pain point values to labels
-                pain_labels = {
-                    'no-shows': 'No-shows or last-minute cancellations',
-                    'phone-calls': 'Too many phone calls',
-                    'manual-scheduling': 'Manual scheduling or rescheduling',
-                    'intake-forms': 'Chasing intake forms',
-                    'admin-burnout': 'Admin burnout',
-                    'doctor-admin': 'Doctors spending time on admin work',
-                    'follow-ups': 'Follow-ups slipping through the cracks'
-                }
-                pain_points = ", ".join([pain_labels.get(p, p) for p in pain_points])
-            
-            solution_wins = data.get('solutionWins', [])
-            if isinstance(solution_wins, list):
-                solution_labels = {
-                    'fewer-no-shows': 'Fewer no-shows',
-                    'less-admin': 'Less admin work for staff',
-                    'prepared-visits': 'Doctors starting visits more prepared',
-                    'better-followups': 'Better follow-ups',
-                    'fewer-missed-calls': 'Fewer missed calls',
-                    'visibility': 'Clear visibility into clinic performance'
-                }
-                solution_wins = ", ".join([solution_labels.get(s, s) for s in solution_wins])
-            
-            # Convert clinic type to label
-            clinic_type = data.get('clinicType', '')
-            clinic_type_labels = {
-                'primary-care': 'Primary care',
-                'specialty': 'Specialty clinic',
-                'dental': 'Dental',
-                'physical-therapy': 'Physical therapy',
-                'mental-health': 'Mental health',
-                'other': 'Other'
-            }
-            clinic_type_label = clinic_type_labels.get(clinic_type, clinic_type)
-            
-            # Convert clinic size to label
-            clinic_size = data.get('clinicSize', '')
-            clinic_size_labels = {
-                'solo': 'Solo provider',
-                '2-5': '2 to 5',
-                '6-10': '6 to 10',
-                '10plus': '10+'
-            }
-            clinic_size_label = clinic_size_labels.get(clinic_size, clinic_size)
-            
-            # Convert role to label
-            role = data.get('role', '')
-            role_labels = {
-                'owner': 'Clinic Owner',
-                'admin': 'Administrative Assistant',
-                'practice-manager': 'Practice Manager',
-                'operations-manager': 'Operations Manager',
-                'cto': 'CTO / IT Director'
-            }
-            role_label = role_labels.get(role, role)
-            
-            # Convert other fields to labels
-            current_setup_labels = {
-                'front-desk': 'Front desk + phone calls',
-                'simple-tool': 'Simple scheduling tool',
-                'ehr': 'EHR scheduling',
-                'mix': 'Mix of tools',
-                'messy': 'Not sure / messy setup'
-            }
-            current_setup_label = current_setup_labels.get(data.get('currentSetup', ''), data.get('currentSetup', ''))
-            
-            impact_level_labels = {
-                'not-big': 'Not a big issue',
-                'somewhat': 'Somewhat painful',
-                'frustrating': 'Actively frustrating',
-                'hurting': 'Hurting revenue or staff morale'
-            }
-            impact_level_label = impact_level_labels.get(data.get('impactLevel', ''), data.get('impactLevel', ''))
-            
-            willingness_labels = {
-                'yes': 'Yes, definitely',
-                'possibly': 'Possibly, depending on price',
-                'not-now': 'Not right now',
-                'exploring': 'Just exploring'
-            }
-            willingness_label = willingness_labels.get(data.get('willingnessToPay', ''), data.get('willingnessToPay', ''))
-            
-            row_data = [
-                timestamp,
-                data.get('fullName', ''),
-                data.get('email', ''),
-                phone_value,
-                role_label,
-                data.get('ownerEmail', ''),
-                data.get('clinicName', ''),
-                clinic_type_label,
-                data.get('otherClinicType', ''),
-                clinic_size_label,
-                data.get('numberOfDoctors', ''),
-                data.get('numberOfLocations', ''),
-                data.get('doctorEmails', ''),
-                data.get('locationAddresses', ''),
-                pain_points,
-                current_setup_label,
-                impact_level_label,
-                willingness_label,
-                data.get('priceRange', ''),
-                solution_wins,
-                data.get('otherWish', '')
-            ]
-            
-            worksheet.append_row(row_data, value_input_option='USER_ENTERED')
+                ingestion.submit_waitlist(data)
+            except Exception:
+                # Cached handle may be stale (sheet deleted/renamed, revoked token) — rebuild next time
+                _reset_sheets_cache()
+                raise
 
             print(f"Successfully added waitlist submission for: {data.get('email', 'unknown')}")
 
@@ -267,12 +193,17 @@ class handler(BaseHTTPRequestHandler):
                 except Exception as email_err:
                     print(f"Warning: Failed to send waitlist welcome email: {email_err}")
 
-            self._send_json({"success": True, "message": "Successfully added to waitlist"})
+            response = {"success": True, "message": "Successfully added to waitlist"}
+            if store is not None:
+                store.complete(key, response)
+            self._send_json(response)
             
         except json.JSONDecodeError as e:
             print(f"JSON decode error: {e}")
             self._send_json({"success": False, "message": f"Invalid JSON: {str(e)}"}, 400)
         except Exception as e:
+            if store is not None:
+                store.release(key)
             error_msg = f"Error saving to Google Sheets: {type(e).__name__}: {str(e)}"
             print(error_msg)
             import traceback
@@ -0,0 +1,166 @@
+"""
+Booked Slots Cache — keeps the "Ava Calls" booked times off the inbound-call path
+
+get_booked_slots() is a synchronous gspread read of the whole Preferred Call Time
+column. Inbound calls read this in-memory copy instead; a background task refreshes
+it every BOOKED_SLOTS_REFRESH_SECONDS in a worker thread, and submit_to_waitlist
+adds newly booked slots immediately and triggers an early refresh. Each refresh also
+rebuilds the parsed SlotIndex used for conflict checks and free-slot suggestions.
+"""
+from __future__ import annotations
+
+import os
+import time
+import asyncio
+import logging
+from typing import Optional
+
+from app.ava.slot_index import SlotIndex
+from app.blocking_io import SHEETS_TIMEOUT_SECONDS, run_blocking
+
+logger = logging.getLogger("ava.slots")
+
+REFRESH_INTERVAL_SECONDS = float(os.getenv("BOOKED_SLOTS_REFRESH_SECONDS", "60"))
+# First retry delay after a failed read; doubles per consecutive failure, capped at the interval
+REFRESH_RETRY_SECONDS = float(os.getenv("BOOKED_SLOTS_RETRY_SECONDS", "5"))
+
+_slots: list[str] = []
+_index = SlotIndex()
+_fetched_at: float = 0.0  # monotonic; 0 = never loaded or invalidated
+_generation = 0  # bumped on every invalidation so an in-flight read can't clobber a new write
+_failures = 0  # consecutive failed reads
+_retry_at: float = 0.0  # monotonic; stale reads don't schedule a refresh before this
+_refresh_task: Optional[asyncio.Task] = None
+_refresher_task: Optional[asyncio.Task] = None
+_wake: Optional[asyncio.Event] = None
+
+
+def get_cached_booked_slots() -> list[str]:
+    """Return the cached booked slots without any I/O; schedules a refresh if stale."""
+    if time.monotonic() - _fetched_at > REFRESH_INTERVAL_SECONDS:
+        _schedule_refresh()
+    return list(_slots)
+
+
+def get_cached_slot_index() -> SlotIndex:
+    """Parsed, sorted view of the cached booked slots (same staleness rules as the list)."""
+    if time.monotonic() - _fetched_at > REFRESH_INTERVAL_SECONDS:
+        _schedule_refresh()
+    return _index
+
+
+def add_booked_slot(slot: str):
+    """Record a slot that was just written to the sheet, then refresh from the source of truth."""
+    if slot and "declined" not in slot.lower() and slot not in _slots:
+        _slots.append(slot)
+        _index.add(slot)
+    invalidate_booked_slots()
+
+
+def invalidate_booked_slots():
+    """Mark the cache stale and wake the background refresher."""
+    global _fetched_at, _generation
+    _fetched_at = 0.0
+    _generation += 1
+    _schedule_refresh()
+
+
+async def refresh_booked_slots() -> list[str]:
+    """Re-read booked slots from Google Sheets in the blocking I/O pool (single-flight)."""
+    return await asyncio.shield(_start_refresh())
+
+
+def _start_refresh() -> asyncio.Task:
+    """Start a refresh unless one is in flight; _refresh_task keeps it referenced until done."""
+    global _refresh_task
+    if _refresh_task is None or _refresh_task.done():
+        _refresh_task = asyncio.create_task(_refresh())
+        _refresh_task.add_done_callback(_refresh_done)
+    return _refresh_task
+
+
+def _refresh_done(task: asyncio.Task):
+    """Log a failed refresh (nobody may be awaiting it) and back off before the next one."""
+    global _failures, _retry_at
+    if task.cancelled():
+        return
+    error = task.exception()
+    if error is None:
+        _failures = 0
+        _retry_at = 0.0
+        return
+    _failures += 1
+    delay = min(REFRESH_RETRY_SECONDS * 2 ** (_failures - 1), REFRESH_INTERVAL_SECONDS)
+    _retry_at = time.monotonic() + delay
+    logger.warning(f"Booked slots refresh failed, serving the cached copy; next try in {delay:.0f}s: {error!r}")
+
+
+async def _refresh() -> list[str]:
+    global _slots, _index, _fetched_at
+    from app.ava.waitlist_submit import get_booked_slots
+
+    generation = _generation
+    started = time.monotonic()
+    # A failed or timed-out read raises here, leaving the last good slots, index and
+    # _fetched_at untouched: callers keep serving the cache and the next pass retries
+    slots = await run_blocking(get_booked_slots, timeout=SHEETS_TIMEOUT_SECONDS)
+    if generation != _generation:
+        # A slot was booked while we were reading — keep it and stay stale for the next pass
+        slots = slots + [s for s in _slots if s not in slots]
+    else:
+        _fetched_at = started
+    _index = await asyncio.to_thread(SlotIndex.from_slots, slots)
+    _slots = slots
+    logger.info(f"Booked slots cache refreshed: {len(slots)} slots in {time.monotonic() - started:.2f}s")
+    return slots
+
+
+def _schedule_refresh():
+    """Nudge the refresher from sync code; no-op outside a running event loop or while backing off."""
+    if time.monotonic() < _retry_at:
+        return
+    if _wake is not None:
+        _wake.set()
+        return
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return
+    _start_refresh()
+
+
+# ──────────────────────────────────────────────
+# BACKGROUND REFRESHER (started from the app lifespan)
+# ──────────────────────────────────────────────
+async def _refresher_loop():
+    while True:
+        try:
+            await refresh_booked_slots()
+        except Exception:
+            pass  # logged, and the retry backed off, by _refresh_done
+        try:
+            await asyncio.wait_for(_wake.wait(), timeout=REFRESH_INTERVAL_SECONDS)
+        except asyncio.TimeoutError:
+            pass
+        _wake.clear()
+
+
+def start_refresher():
+    """Start the periodic refresh task; the first run pre-warms the cache."""
+    global _refresher_task, _wake
+    if _refresher_task is not None and not _refresher_task.done():
+        return
+    _wake = asyncio.Event()
+    _refresher_task = asyncio.create_task(_refresher_loop())
+
+
+async def stop_refresher():
+    global _refresher_task, _wake
+    if _refresher_task is not None:
+        _refresher_task.cancel()
+        try:
+            await _refresher_task
+        except asyncio.CancelledError:
+            pass
+    _refresher_task = None
+    _wake = None
@@ -0,0 +1,258 @@
+"""
+Context Builder — token-budgeted prompt history for SMS conversations
+
+Keeps the per-turn prompt flat regardless of conversation length:
+  - every message is costed in tokens (tiktoken when installed, ~4 chars/token otherwise)
+  - history is grouped into atomic units: an assistant tool_calls message always
+    travels with its tool results, and orphaned/incomplete tool messages are dropped
+  - once the history goes over budget, the oldest units are folded into a rolling
+    summary message stored at the head of the conversation, down to a low-water
+    mark so compaction runs every few turns rather than every turn
+"""
+from __future__ import annotations
+
+import os
+import json
+import logging
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Optional
+
+logger = logging.getLogger("ava.context")
+
+# History token budget (excludes the system prompt). Compaction folds down to LOW_WATER.
+CONTEXT_TOKEN_BUDGET = int(os.getenv("SMS_CONTEXT_TOKEN_BUDGET", "1200"))
+CONTEXT_LOW_WATER_RATIO = 0.6
+
+SUMMARY_MODEL = os.getenv("SMS_SUMMARY_MODEL", "gpt-4.1-mini")
+SUMMARY_MAX_TOKENS = 200
+
+# Marks the rolling summary message (`name` is a valid field on system messages)
+SUMMARY_NAME = "conversation_summary"
+SUMMARY_PREFIX = "Summary of the earlier conversation:\n"
+
+# Per-message framing overhead in the chat format
+MESSAGE_OVERHEAD_TOKENS = 4
+
+
+# ──────────────────────────────────────────────
+# TOKEN COUNTING
+# ──────────────────────────────────────────────
+def _load_encoder():
+    try:
+        import tiktoken
+        return tiktoken.get_encoding("o200k_base")
+    except Exception:
+        logger.info("tiktoken not available — estimating tokens at ~4 chars/token")
+        return None
+
+
+_encoder = _load_encoder()
+
+
+@lru_cache(maxsize=4096)
+def count_tokens(text: str) -> int:
+    if not text:
+        return 0
+    if _encoder is not None:
+        return len(_encoder.encode(text))
+    return max(1, (len(text) + 3) // 4)
+
+
+def message_tokens(message: dict) -> int:
+    """Token cost of one chat message, including tool call arguments."""
+    tokens = MESSAGE_OVERHEAD_TOKENS + count_tokens(message.get("content") or "")
+    for call in message.get("tool_calls") or []:
+        fn = call.get("function", {})
+        tokens += count_tokens(fn.get("name", "")) + count_tokens(fn.get("arguments", ""))
+    return tokens
+
+
+def prompt_tokens(messages: list[dict]) -> int:
+    return sum(message_tokens(m) for m in messages)
+
+
+# ──────────────────────────────────────────────
+# GROUPING
+# ──────────────────────────────────────────────
+def is_summary(message: dict) -> bool:
+    return message.get("role") == "system" and message.get("name") == SUMMARY_NAME
+
+
+def make_summary_message(summary: str) -> dict:
+    return {"role": "system", "name": SUMMARY_NAME, "content": f"{SUMMARY_PREFIX}{summary}"}
+
+
+def summary_text(message: Optional[dict]) -> str:
+    if not message:
+        return ""
+    return (message.get("content") or "").removeprefix(SUMMARY_PREFIX)
+
+
+def group_units(messages: list[dict]) -> list[list[dict]]:
+    """
+    Split history into units that must be kept or dropped together.
+    A tool message whose parent was trimmed away, or a tool_calls message
+    missing any of its results, is not valid chat input and is dropped.
+    """
+    units: list[list[dict]] = []
+    i = 0
+    while i < len(messages):
+        msg = messages[i]
+        if msg.get("role") == "tool":
+            i += 1  # orphan — its tool_calls parent is gone
+            continue
+        if msg.get("role") == "assistant" and msg.get("tool_calls"):
+            pending = {c.get("id") for c in msg["tool_calls"]}
+            unit = [msg]
+            i += 1
+            while i < len(messages) and messages[i].get("role") == "tool":
+                pending.discard(messages[i].get("tool_call_id"))
+                unit.append(messages[i])
+                i += 1
+            if not pending:
+                units.append(unit)
+            continue
+        units.append([msg])
+        i += 1
+    return units
+
+
+# ──────────────────────────────────────────────
+# PLANNING
+# ──────────────────────────────────────────────
+@dataclass
+class CompactionPlan:
+    """Which stored messages to fold into the summary; the rest are kept verbatim."""
+    previous_summary: str
+    evicted: list[dict] = field(default_factory=list)
+    # Stored messages the new summary replaces, counted from the head (old summary included)
+    drop_first: int = 0
+
+
+def plan_compaction(
+    history: list[dict],
+    budget: int = CONTEXT_TOKEN_BUDGET,
+    max_messages: Optional[int] = None,
+) -> Optional[CompactionPlan]:
+    """
+    Return a plan if the history is over budget (tokens, or close to the store's
+    message cap), else None. The most recent unit is always kept verbatim.
+    """
+    summary_msg = history[0] if history and is_summary(history[0]) else None
+    body = history[1:] if summary_msg else history
+
+    over_tokens = prompt_tokens(history) > budget
+    over_count = max_messages is not None and len(history) > max_messages
+    if not (over_tokens or over_count):
+        return None
+
+    units = group_units(body)
+    if len(units) <= 1:
+        return None
+
+    # Keep the newest units that fit under the low-water mark (reserve room for the summary)
+    low_water = int(budget * CONTEXT_LOW_WATER_RATIO) - SUMMARY_MAX_TOKENS
+    kept_tokens = 0
+    kept_units = 0
+    for unit in reversed(units):
+        unit_tokens = prompt_tokens(unit)
+        if kept_units and kept_tokens + unit_tokens > low_water:
+            break
+        kept_tokens += unit_tokens
+        kept_units += 1
+    if kept_units == len(units):
+        kept_units -= 1  # over the message cap only — still fold the oldest unit
+
+    kept = [m for unit in units[len(units) - kept_units:] for m in unit]
+    evicted = [m for unit in units[:len(units) - kept_units] for m in unit]
+
+    # Everything stored before the first kept message goes (orphans included), counted
+    # from the head so messages appended while the summary is written are unaffected
+    start = next(i for i, m in enumerate(body) if m is kept[0])
+    drop_first = start + (1 if summary_msg else 0)
+
+    return CompactionPlan(
+        previous_summary=summary_text(summary_msg),
+        evicted=evicted,
+        drop_first=drop_first,
+    )
+
+
+def build_prompt_history(history: list[dict], budget: int = CONTEXT_TOKEN_BUDGET) -> list[dict]:
+    """
+    Valid, budget-bounded chat history for the model: the summary (if any) plus the
+    newest whole units that fit. Used every turn; compaction just keeps this lossless.
+    """
+    summary_msg = history[0] if history and is_summary(history[0]) else None
+    body = history[1:] if summary_msg else history
+
+    remaining = budget - (message_tokens(summary_msg) if summary_msg else 0)
+    selected: list[list[dict]] = []
+    for unit in reversed(group_units(body)):
+        unit_tokens = prompt_tokens(unit)
+        if selected and unit_tokens > remaining:
+            break
+        remaining -= unit_tokens
+        selected.append(unit)
+
+    prompt = [{"role": "system", "content": summary_msg["content"]}] if summary_msg else []
+    for unit in reversed(selected):
+        prompt.extend(unit)
+    return prompt
+
+
+# ──────────────────────────────────────────────
+# SUMMARIZATION
+# ──────────────────────────────────────────────
+def _render_transcript(messages: list[dict]) -> str:
+    lines = []
+    for m in messages:
+        if m.get("tool_calls"):
+            for call in m["tool_calls"]:
+                fn = call.get("function", {})
+                lines.append(f"AVA called {fn.get('name')}: {fn.get('arguments')}")
+        elif m.get("role") == "tool":
+            try:
+                result = json.loads(m.get("content") or "{}")
+                lines.append(f"TOOL RESULT: success={result.get('success')}")
+            except (TypeError, ValueError):
+                lines.append(f"TOOL RESULT: {m.get('content')}")
+        else:
+            speaker = "PATIENT" if m.get("role") == "user" else "AVA"
+            lines.append(f"{speaker}: {m.get('content') or ''}")
+    return "\n".join(lines)
+
+
+def fallback_summary(previous_summary: str, evicted: list[dict]) -> str:
+    """Extractive summary used when the LLM summary call fails — bounded to SUMMARY_MAX_TOKENS."""
+    text = "\n".join(filter(None, [previous_summary, _render_transcript(evicted)]))
+    limit = SUMMARY_MAX_TOKENS * 4
+    return text if len(text) <= limit else "…" + text[-limit:]
+
+
+def summarize(client, previous_summary: str, evicted: list[dict]) -> str:
+    """Fold evicted turns into the rolling summary with a small, fast model."""
+    instructions = (
+        "You maintain a running summary of an SMS conversation between Ava (Axis's assistant) "
+        "and a clinic contact. Merge the existing summary with the new transcript lines. "
+        "Keep every collected detail verbatim (name, email, role, clinic, preferred time, phone), "
+        "whether a demo was submitted, and any open question. Max 120 words, plain text."
+    )
+    content = f"EXISTING SUMMARY:\n{previous_summary or '(none)'}\n\nNEW LINES:\n{_render_transcript(evicted)}"
+    try:
+        response = client.chat.completions.create(
+            model=SUMMARY_MODEL,
+            messages=[
+                {"role": "system", "content": instructions},
+                {"role": "user", "content": content},
+            ],
+            max_tokens=SUMMARY_MAX_TOKENS,
+            temperature=0,
+        )
+        summary = (response.choices[0].message.content or "").strip()
+        if summary:
+            return summary
+    except Exception as e:
+        logger.warning(f"Summary call failed, using extractive fallback: {e}")
+    return fallback_summary(previous_summary, evicted)
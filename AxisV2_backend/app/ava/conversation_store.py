@@ -0,0 +1,414 @@
+"""
+Conversation Store — shared, bounded SMS conversation history
+
+Replaces the per-process defaultdict so a patient's conversation survives
+restarts and is visible to every uvicorn worker.
+
+Backends:
+  RedisConversationStore  — used when REDIS_URL is set (production, multi-worker)
+  SQLiteConversationStore — local fallback, file path from SMS_CONVERSATION_DB
+
+Both backends:
+  - expire each conversation independently (TTL refreshed on every write)
+  - append and trim to the history limit atomically
+  - sit behind a small in-memory LRU front cache, validated by a per-conversation
+    version number so a write on another worker is never served stale
+"""
+from __future__ import annotations
+
+import os
+import json
+import time
+import sqlite3
+import logging
+import threading
+from collections import OrderedDict
+from typing import Optional
+
+logger = logging.getLogger("ava.conversations")
+
+# Defaults mirror the old in-memory behaviour in sms_handler
+DEFAULT_MAX_MESSAGES = 30
+DEFAULT_TTL_SECONDS = 24 * 3600
+DEFAULT_CACHE_SIZE = 1024
+
+
+# ──────────────────────────────────────────────
+# FRONT CACHE
+# ──────────────────────────────────────────────
+class _LRUCache:
+    """
+    Thread-safe LRU of {phone: (version, messages)}.
+    Entries older than max_age are dropped: versions restart after a conversation
+    expires, so anything cached before that point can't be trusted.
+    """
+
+    def __init__(self, max_size: int = DEFAULT_CACHE_SIZE, max_age: float = DEFAULT_TTL_SECONDS):
+        self.max_size = max_size
+        self.max_age = max_age
+        self._data: OrderedDict[str, tuple[int, list[dict], float]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[tuple[int, list[dict]]]:
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return None
+            if time.monotonic() - entry[2] > self.max_age:
+                del self._data[key]
+                return None
+            self._data.move_to_end(key)
+            return entry[0], entry[1]
+
+    def put(self, key: str, version: int, messages: list[dict]):
+        with self._lock:
+            self._data[key] = (version, messages, time.monotonic())
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_size:
+                self._data.popitem(last=False)
+
+    def pop(self, key: str):
+        with self._lock:
+            self._data.pop(key, None)
+
+
+# ──────────────────────────────────────────────
+# BASE
+# ──────────────────────────────────────────────
+class ConversationStore:
+    """
+    Common front-cache logic. Backends implement:
+      _version(phone)            -> int (0 if the conversation doesn't exist / expired)
+      _load(phone)               -> (version, messages)
+      _append(phone, messages)   -> (version, messages) after append + trim
+      _compact(phone, head, replaced) -> (version, messages) after swapping the oldest
+                                    len(replaced) messages for head, or None if they
+                                    are no longer exactly `replaced`
+      _delete(phone)
+    """
+
+    def __init__(
+        self,
+        max_messages: int = DEFAULT_MAX_MESSAGES,
+        ttl_seconds: int = DEFAULT_TTL_SECONDS,
+        cache_size: int = DEFAULT_CACHE_SIZE,
+    ):
+        self.max_messages = max_messages
+        self.ttl_seconds = ttl_seconds
+        self._cache = _LRUCache(cache_size, max_age=ttl_seconds)
+
+    def get(self, phone: str) -> list[dict]:
+        """Return the conversation history for a phone number (oldest first)."""
+        cached = self._cache.get(phone)
+        if cached is not None:
+            version = self._version(phone)
+            if version == cached[0]:
+                return list(cached[1])
+            if version == 0:
+                self._cache.pop(phone)
+                return []
+
+        version, messages = self._load(phone)
+        if version:
+            self._cache.put(phone, version, messages)
+        return list(messages)
+
+    def append(self, phone: str, *messages: dict) -> list[dict]:
+        """Append messages, trim to max_messages and refresh the TTL. Returns the new history."""
+        if not messages:
+            return self.get(phone)
+        version, history = self._append(phone, list(messages))
+        self._cache.put(phone, version, history)
+        return list(history)
+
+    def compact(self, phone: str, head: dict, replaced: list[dict]) -> Optional[list[dict]]:
+        """
+        Atomically replace the oldest stored messages, `replaced` (the snapshot the
+        rolling summary `head` was written from), with `head`. Messages appended since
+        the snapshot are kept. Returns the new history, or None without changing
+        anything if the oldest messages are no longer `replaced` (another compaction,
+        or the append trim, got there first).
+        """
+        result = self._compact(phone, head, replaced)
+        if result is None:
+            return None
+        version, history = result
+        self._cache.put(phone, version, history)
+        return list(history)
+
+    def clear(self, phone: str):
+        self._cache.pop(phone)
+        self._delete(phone)
+
+    # Backend hooks
+    def _version(self, phone: str) -> int:
+        raise NotImplementedError
+
+    def _load(self, phone: str) -> tuple[int, list[dict]]:
+        raise NotImplementedError
+
+    def _append(self, phone: str, messages: list[dict]) -> tuple[int, list[dict]]:
+        raise NotImplementedError
+
+    def _compact(self, phone: str, head: dict, replaced: list[dict]) -> Optional[tuple[int, list[dict]]]:
+        raise NotImplementedError
+
+    def _delete(self, phone: str):
+        raise NotImplementedError
+
+
+# ──────────────────────────────────────────────
+# REDIS BACKEND
+# ──────────────────────────────────────────────
+class RedisConversationStore(ConversationStore):
+    """
+    One Redis list per conversation plus a version counter.
+    Append, trim, version bump and TTL refresh run in a single MULTI/EXEC.
+    """
+
+    KEY_PREFIX = "ava:sms:"
+    COMPACT_RETRIES = 5
+
+    def __init__(self, redis_url: str, **kwargs):
+        super().__init__(**kwargs)
+        import redis
+
+        self._redis = redis.Redis.from_url(redis_url, decode_responses=True)
+        # from_url doesn't connect; fail here so the factory can fall back to SQLite
+        self._redis.ping()
+
+    def _keys(self, phone: str) -> tuple[str, str]:
+        base = f"{self.KEY_PREFIX}{phone}"
+        return f"{base}:messages", f"{base}:version"
+
+    def _version(self, phone: str) -> int:
+        _, version_key = self._keys(phone)
+        return int(self._redis.get(version_key) or 0)
+
+    def _load(self, phone: str) -> tuple[int, list[dict]]:
+        messages_key, version_key = self._keys(phone)
+        pipe = self._redis.pipeline(transaction=True)
+        pipe.get(version_key)
+        pipe.lrange(messages_key, 0, -1)
+        version, raw = pipe.execute()
+        return int(version or 0), [json.loads(m) for m in raw]
+
+    def _append(self, phone: str, messages: list[dict]) -> tuple[int, list[dict]]:
+        messages_key, version_key = self._keys(phone)
+        pipe = self._redis.pipeline(transaction=True)
+        pipe.rpush(messages_key, *(json.dumps(m) for m in messages))
+        pipe.ltrim(messages_key, -self.max_messages, -1)
+        pipe.incr(version_key)
+        pipe.expire(messages_key, self.ttl_seconds)
+        pipe.expire(version_key, self.ttl_seconds)
+        pipe.lrange(messages_key, 0, -1)
+        results = pipe.execute()
+        return int(results[2]), [json.loads(m) for m in results[-1]]
+
+    def _compact(self, phone: str, head: dict, replaced: list[dict]) -> Optional[tuple[int, list[dict]]]:
+        from redis.exceptions import WatchError
+
+        messages_key, version_key = self._keys(phone)
+        with self._redis.pipeline(transaction=True) as pipe:
+            for _ in range(self.COMPACT_RETRIES):
+                try:
+                    # WATCH aborts the MULTI if anything writes the list after the check
+                    pipe.watch(messages_key)
+                    front = pipe.lrange(messages_key, 0, len(replaced) - 1)
+                    if [json.loads(m) for m in front] != replaced:
+                        pipe.unwatch()
+                        return None
+                    pipe.multi()
+                    pipe.ltrim(messages_key, len(replaced), -1)
+                    pipe.lpush(messages_key, json.dumps(head))
+                    pipe.incr(version_key)
+                    pipe.expire(messages_key, self.ttl_seconds)
+                    pipe.expire(version_key, self.ttl_seconds)
+                    pipe.lrange(messages_key, 0, -1)
+                    results = pipe.execute()
+                    return int(results[2]), [json.loads(m) for m in results[-1]]
+                except WatchError:
+                    continue  # an append landed in between: check the front again
+        return None
+
+    def _delete(self, phone: str):
+        self._redis.delete(*self._keys(phone))
+
+
+# ──────────────────────────────────────────────
+# SQLITE BACKEND
+# ──────────────────────────────────────────────
+class SQLiteConversationStore(ConversationStore):
+    """
+    Local single-host store. Expiry is checked per key on read; expired rows are
+    purged through an index on expires_at, at most once per purge interval.
+    """
+
+    PURGE_INTERVAL_SECONDS = 300
+
+    def __init__(self, path: str, **kwargs):
+        super().__init__(**kwargs)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript("""
+            CREATE TABLE IF NOT EXISTS sms_conversations (
+                phone TEXT PRIMARY KEY,
+                version INTEGER NOT NULL,
+                expires_at REAL NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS idx_sms_conversations_expires
+                ON sms_conversations (expires_at);
+            CREATE TABLE IF NOT EXISTS sms_messages (
+                phone TEXT NOT NULL,
+                seq INTEGER NOT NULL,
+                body TEXT NOT NULL,
+                PRIMARY KEY (phone, seq)
+            );
+        """)
+        self._last_purge = 0.0
+
+    def _purge_expired(self, now: float):
+        if now - self._last_purge < self.PURGE_INTERVAL_SECONDS:
+            return
+        self._last_purge = now
+        self._conn.execute(
+            "DELETE FROM sms_messages WHERE phone IN "
+            "(SELECT phone FROM sms_conversations WHERE expires_at < ?)",
+            (now,),
+        )
+        self._conn.execute("DELETE FROM sms_conversations WHERE expires_at < ?", (now,))
+
+    def _live_version(self, phone: str, now: float) -> int:
+        row = self._conn.execute(
+            "SELECT version, expires_at FROM sms_conversations WHERE phone = ?", (phone,)
+        ).fetchone()
+        if row is None:
+            return 0
+        if row[1] < now:
+            self._conn.execute("DELETE FROM sms_messages WHERE phone = ?", (phone,))
+            self._conn.execute("DELETE FROM sms_conversations WHERE phone = ?", (phone,))
+            return 0
+        return row[0]
+
+    def _messages(self, phone: str) -> list[dict]:
+        rows = self._conn.execute(
+            "SELECT body FROM sms_messages WHERE phone = ? ORDER BY seq", (phone,)
+        ).fetchall()
+        return [json.loads(r[0]) for r in rows]
+
+    def _version(self, phone: str) -> int:
+        with self._lock:
+            return self._live_version(phone, time.time())
+
+    def _load(self, phone: str) -> tuple[int, list[dict]]:
+        now = time.time()
+        with self._lock:
+            self._purge_expired(now)
+            version = self._live_version(phone, now)
+            if not version:
+                return 0, []
+            return version, self._messages(phone)
+
+    def _append(self, phone: str, messages: list[dict]) -> tuple[int, list[dict]]:
+        now = time.time()
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                version = self._live_version(phone, now)
+                next_seq = self._conn.execute(
+                    "SELECT COALESCE(MAX(seq), 0) FROM sms_messages WHERE phone = ?", (phone,)
+                ).fetchone()[0]
+                self._conn.executemany(
+                    "INSERT INTO sms_messages (phone, seq, body) VALUES (?, ?, ?)",
+                    [(phone, next_seq + i + 1, json.dumps(m)) for i, m in enumerate(messages)],
+                )
+                self._conn.execute(
+                    "DELETE FROM sms_messages WHERE phone = ? AND seq <= ?",
+                    (phone, next_seq + len(messages) - self.max_messages),
+                )
+                self._conn.execute(
+                    "INSERT INTO sms_conversations (phone, version, expires_at) VALUES (?, ?, ?) "
+                    "ON CONFLICT(phone) DO UPDATE SET version = excluded.version, expires_at = excluded.expires_at",
+                    (phone, version + 1, now + self.ttl_seconds),
+                )
+                history = self._messages(phone)
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+            return version + 1, history
+
+    def _compact(self, phone: str, head: dict, replaced: list[dict]) -> Optional[tuple[int, list[dict]]]:
+        now = time.time()
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                version = self._live_version(phone, now)
+                front = self._conn.execute(
+                    "SELECT seq, body FROM sms_messages WHERE phone = ? ORDER BY seq LIMIT ?",
+                    (phone, len(replaced)),
+                ).fetchall()
+                if not version or [json.loads(r[1]) for r in front] != replaced:
+                    self._conn.execute("ROLLBACK")
+                    return None
+                last_replaced = front[-1][0]
+                self._conn.execute(
+                    "DELETE FROM sms_messages WHERE phone = ? AND seq <= ?", (phone, last_replaced)
+                )
+                self._conn.execute(
+                    "INSERT INTO sms_messages (phone, seq, body) VALUES (?, ?, ?)",
+                    (phone, last_replaced, json.dumps(head)),
+                )
+                self._conn.execute(
+                    "INSERT INTO sms_conversations (phone, version, expires_at) VALUES (?, ?, ?) "
+                    "ON CONFLICT(phone) DO UPDATE SET version = excluded.version, expires_at = excluded.expires_at",
+                    (phone, version + 1, now + self.ttl_seconds),
+                )
+                history = self._messages(phone)
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+            return version + 1, history
+
+    def _delete(self, phone: str):
+        with self._lock:
+            self._conn.execute("DELETE FROM sms_messages WHERE phone = ?", (phone,))
+            self._conn.execute("DELETE FROM sms_conversations WHERE phone = ?", (phone,))
+
+
+# ──────────────────────────────────────────────
+# FACTORY
+# ──────────────────────────────────────────────
+_store: Optional[ConversationStore] = None
+_store_lock = threading.Lock()
+
+
+def get_conversation_store(**options) -> ConversationStore:
+    """
+    Lazy-init the process-wide store. Redis if REDIS_URL is set, otherwise SQLite.
+    `options` (max_messages, ttl_seconds, cache_size) apply on first call only.
+    """
+    global _store
+    if _store is not None:
+        return _store
+
+    with _store_lock:
+        if _store is not None:
+            return _store
+
+        redis_url = os.getenv("REDIS_URL", "")
+        if redis_url:
+            try:
+                _store = RedisConversationStore(redis_url, **options)
+                logger.info("SMS conversations stored in Redis")
+                return _store
+            except Exception as e:
+                logger.error(f"Failed to init Redis conversation store, falling back to SQLite: {e}")
+
+        path = os.getenv("SMS_CONVERSATION_DB", "ava_conversations.db")
+        _store = SQLiteConversationStore(path, **options)
+        logger.info(f"SMS conversations stored in SQLite ({path})")
+        return _store
@@ -14,36 +14,23 @@ Dynamic variables (injected per-call via register-call API):
 
 from __future__ import annotations
 
-from datetime import datetime, timedelta
-from typing import Optional
+from datetime import datetime
+from typing import TYPE_CHECKING, Optional
 from zoneinfo import ZoneInfo
 
+if TYPE_CHECKING:
+    from app.ava.slot_index import SlotIndex
+
 
 # ──────────────────────────────────────────────
 # HELPER — Generate available time slots
 # ──────────────────────────────────────────────
-def _get_available_slots() -> str:
-    eastern = ZoneInfo("America/New_York")
-    now = datetime.now(tz=eastern)
-    earliest = now + timedelta(hours=2)
-    minute = earliest.minute
-    remainder = minute % 15
-    if remainder != 0:
-        earliest = earliest + timedelta(minutes=(15 - remainder))
-    earliest = earliest.replace(second=0, microsecond=0)
-
-    def normalize_business(dt: datetime) -> datetime:
-        if dt.hour < 9:
-            dt = dt.replace(hour=10, minute=0, second=0, microsecond=0)
-        if dt.hour >= 17:
-            dt = (dt + timedelta(days=1)).replace(hour=10, minute=0, second=0, microsecond=0)
-        while dt.weekday() >= 5:
-            dt = (dt + timedelta(days=1)).replace(hour=10, minute=0, second=0, microsecond=0)
-        return dt
-
-    earliest = normalize_business(earliest)
-    slot1 = earliest
-    slot2 = normalize_business(slot1 + timedelta(hours=2))
+def _get_available_slots(slot_index: Optional["SlotIndex"] = None, near: Optional[datetime] = None) -> str:
+    """Two open demo times (skipping booked ones when a slot index is given), nearest to `near` if set."""
+    from app.ava.slot_index import SlotIndex
+
+    index = slot_index if slot_index is not None else SlotIndex()
+    slot1, slot2 = index.free_slots(count=2, near=near)
 
     def _fmt(dt: datetime) -> str:
         return dt.strftime("%A, %B %d at %-I:%M %p Eastern")
@@ -498,13 +485,17 @@ def build_elevenlabs_agent_config(webhook_base_url: str, voice_id: str) -> dict:
 def get_dynamic_variables(
     caller_phone: str = "",
     booked_slots: Optional[list] = None,
+    slot_index: Optional["SlotIndex"] = None,
 ) -> dict:
     eastern = ZoneInfo("America/New_York")
     now = datetime.now(tz=eastern)
+    if slot_index is None and booked_slots:
+        from app.ava.slot_index import SlotIndex
+        slot_index = SlotIndex.from_slots(booked_slots)
     return {
         "current_date": now.strftime("%A, %B %d, %Y"),
         "current_time": now.strftime("%-I:%M %p Eastern"),
-        "available_slots": _get_available_slots(),
+        "available_slots": _get_available_slots(slot_index),
         "booked_slots_info": get_booked_slots_info(booked_slots),
         "caller_phone": caller_phone or "unknown",
     }
@@ -0,0 +1,114 @@
+"""
+Phone Row Index — which "Ava Calls" row belongs to which caller
+
+save_transcript used to download the whole phone and transcript columns on every
+post-call webhook to find the caller's row. This SQLite index maps phone -> sheet
+row and is kept in sync from the sheets writer's append responses, so finding the
+row is a local lookup and the transcript write is one targeted update_cell.
+
+The index is built from a single full-column scan the first time it is used (or
+when a lookup turns out to be stale, e.g. after someone sorted the sheet by hand).
+"""
+from __future__ import annotations
+
+import os
+import time
+import sqlite3
+import logging
+import threading
+from typing import Optional
+
+from app.sheets_writer import SHEETS_JOURNAL_DB
+
+logger = logging.getLogger("ava.rows")
+
+AVA_ROW_INDEX_DB = os.getenv("AVA_ROW_INDEX_DB", SHEETS_JOURNAL_DB)
+
+
+def normalize_phone(phone: str) -> str:
+    """Phone as stored in the sheet minus the leading ' used to force text format."""
+    return (phone or "").replace("'", "").strip()
+
+
+class PhoneRowIndex:
+    """phone -> sheet rows, with whether each row already has a transcript."""
+
+    def __init__(self, path: str = AVA_ROW_INDEX_DB):
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript("""
+            CREATE TABLE IF NOT EXISTS ava_call_rows (
+                row INTEGER PRIMARY KEY,
+                phone TEXT NOT NULL,
+                has_transcript INTEGER NOT NULL DEFAULT 0
+            );
+            CREATE INDEX IF NOT EXISTS idx_ava_call_rows_phone ON ava_call_rows (phone, row);
+            CREATE TABLE IF NOT EXISTS ava_call_rows_meta (
+                key TEXT PRIMARY KEY,
+                value REAL NOT NULL
+            );
+        """)
+
+    @property
+    def built(self) -> bool:
+        with self._lock:
+            return self._conn.execute(
+                "SELECT 1 FROM ava_call_rows_meta WHERE key = 'built_at'"
+            ).fetchone() is not None
+
+    def record(self, phone: str, row: int, has_transcript: bool = False):
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO ava_call_rows (row, phone, has_transcript) VALUES (?, ?, ?)",
+                (row, normalize_phone(phone), int(has_transcript)),
+            )
+
+    def record_appended(self, rows: list[list], first_row: Optional[int], phone_col: int = 3):
+        """Sheets writer listener: index a batch of appended rows starting at first_row."""
+        if first_row is None:
+            logger.warning("Append response had no row range — index will rebuild on next miss")
+            return
+        with self._lock:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO ava_call_rows (row, phone, has_transcript) VALUES (?, ?, 0)",
+                [
+                    (first_row + i, normalize_phone(row[phone_col] if len(row) > phone_col else ""))
+                    for i, row in enumerate(rows)
+                ],
+            )
+
+    def latest_open_row(self, phone: str) -> Optional[int]:
+        """Most recent row for this phone that has no transcript yet."""
+        with self._lock:
+            found = self._conn.execute(
+                "SELECT row FROM ava_call_rows WHERE phone = ? AND has_transcript = 0 "
+                "ORDER BY row DESC LIMIT 1",
+                (normalize_phone(phone),),
+            ).fetchone()
+        return found[0] if found else None
+
+    def rebuild(self, phone_col: list[str], transcript_col: list[str]):
+        """Replace the index from full column reads (row 1 is the header)."""
+        transcript_col = transcript_col + [""] * (len(phone_col) - len(transcript_col))
+        entries = [
+            (i + 1, normalize_phone(phone_col[i]), int(bool(transcript_col[i].strip())))
+            for i in range(1, len(phone_col))
+            if normalize_phone(phone_col[i])
+        ]
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                self._conn.execute("DELETE FROM ava_call_rows")
+                self._conn.executemany(
+                    "INSERT INTO ava_call_rows (row, phone, has_transcript) VALUES (?, ?, ?)", entries
+                )
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO ava_call_rows_meta (key, value) VALUES ('built_at', ?)",
+                    (time.time(),),
+                )
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+        logger.info(f"Rebuilt Ava Calls row index: {len(entries)} rows")
@@ -0,0 +1,125 @@
+"""
+Slot Index — booked demo times as a sorted, timezone-aware index
+
+Booked slots are free text in the "Ava Calls" sheet. They are parsed once with
+_parse_preferred_time into Eastern datetimes and kept sorted, so a conflict check
+is a bisect plus a look at the two neighbouring bookings, and "next free slot"
+jumps straight past each blocking meeting instead of rescanning every string.
+"""
+from __future__ import annotations
+
+import os
+import bisect
+import logging
+from datetime import datetime, timedelta
+from typing import Iterable, Optional
+from zoneinfo import ZoneInfo
+
+from app.ava.waitlist_submit import _parse_preferred_time
+
+logger = logging.getLogger("ava.slots")
+
+EASTERN = ZoneInfo("America/New_York")
+
+# Length of a demo call — two bookings conflict when they overlap by any amount
+MEETING_DURATION_MINUTES = int(os.getenv("MEETING_DURATION_MINUTES", "30"))
+
+# Suggested times land on quarter hours, within business hours, at least LEAD_TIME out
+SLOT_GRANULARITY_MINUTES = 15
+LEAD_TIME = timedelta(hours=2)
+BUSINESS_START_HOUR = 9
+BUSINESS_END_HOUR = 17
+DEFAULT_START_HOUR = 10
+
+
+def _round_up(dt: datetime, minutes: int = SLOT_GRANULARITY_MINUTES) -> datetime:
+    dt = dt.replace(second=0, microsecond=0)
+    remainder = dt.minute % minutes
+    return dt + timedelta(minutes=minutes - remainder) if remainder else dt
+
+
+def next_business_time(dt: datetime) -> datetime:
+    """Move dt forward into weekday business hours (mornings start at DEFAULT_START_HOUR)."""
+    if dt.hour < BUSINESS_START_HOUR:
+        dt = dt.replace(hour=DEFAULT_START_HOUR, minute=0, second=0, microsecond=0)
+    if dt.hour >= BUSINESS_END_HOUR:
+        dt = (dt + timedelta(days=1)).replace(hour=DEFAULT_START_HOUR, minute=0, second=0, microsecond=0)
+    while dt.weekday() >= 5:
+        dt = (dt + timedelta(days=1)).replace(hour=DEFAULT_START_HOUR, minute=0, second=0, microsecond=0)
+    return dt
+
+
+class SlotIndex:
+    """Sorted booked start times; a booking blocks [start, start + duration)."""
+
+    def __init__(self, duration_minutes: int = MEETING_DURATION_MINUTES):
+        self.duration = timedelta(minutes=duration_minutes)
+        self._starts: list[datetime] = []
+        self._labels: set[str] = set()  # normalized strings that could not be parsed
+
+    @classmethod
+    def from_slots(cls, slots: Iterable[str], duration_minutes: int = MEETING_DURATION_MINUTES) -> "SlotIndex":
+        index = cls(duration_minutes)
+        starts = []
+        for slot in slots:
+            parsed = _parse_preferred_time(slot)
+            if parsed is not None:
+                starts.append(parsed)
+            elif slot:
+                index._labels.add(slot.lower().strip())
+        index._starts = sorted(starts)
+        return index
+
+    def __len__(self) -> int:
+        return len(self._starts) + len(self._labels)
+
+    def add(self, slot: str) -> Optional[datetime]:
+        """Insert one booked slot string; returns its parsed start (None if unparseable)."""
+        parsed = _parse_preferred_time(slot)
+        if parsed is None:
+            if slot:
+                self._labels.add(slot.lower().strip())
+            return None
+        bisect.insort(self._starts, parsed)
+        return parsed
+
+    def blocking(self, start: datetime) -> Optional[datetime]:
+        """Start of the booking that overlaps a meeting at `start`, or None if it is free."""
+        i = bisect.bisect_left(self._starts, start)
+        # Only the nearest booking on each side can overlap, since all share one duration
+        if i < len(self._starts) and self._starts[i] < start + self.duration:
+            return self._starts[i]
+        if i > 0 and self._starts[i - 1] + self.duration > start:
+            return self._starts[i - 1]
+        return None
+
+    def conflicts(self, preferred_time: str) -> bool:
+        """True if the requested time overlaps a booking (exact text match if it can't be parsed)."""
+        if not preferred_time:
+            return False
+        parsed = _parse_preferred_time(preferred_time)
+        if parsed is None:
+            return preferred_time.lower().strip() in self._labels
+        return self.blocking(parsed) is not None
+
+    def next_free(self, after: datetime) -> datetime:
+        """Earliest free business-hours start at or after `after`."""
+        candidate = next_business_time(_round_up(after))
+        # Each step clears at least one booking, so this ends within len(self) + 1 iterations
+        for _ in range(len(self._starts) + 1):
+            blocker = self.blocking(candidate)
+            if blocker is None:
+                return candidate
+            candidate = next_business_time(_round_up(blocker + self.duration))
+        return candidate
+
+    def free_slots(self, count: int = 2, near: Optional[datetime] = None, spacing: timedelta = LEAD_TIME) -> list[datetime]:
+        """`count` free suggestions, starting from `near` (or now + LEAD_TIME) and spaced apart."""
+        earliest = datetime.now(tz=EASTERN) + LEAD_TIME
+        cursor = max(near, earliest) if near is not None else earliest
+        slots = []
+        for _ in range(count):
+            slot = self.next_free(cursor)
+            slots.append(slot)
+            cursor = slot + spacing
+        return slots
@@ -6,35 +6,35 @@ Supports function calling to submit intake data to the waitlist API.
 Flow:
 1. Patient texts the Twilio number
 2. Twilio hits /api/sms webhook with the message
-3. We look up conversation history (in-memory)
-4. Send to OpenAI gpt-5.1 with system prompt + history + tools
-5. If OpenAI calls submit_waitlist, we post to the waitlist API and feed result back
-6. Return TwiML MessagingResponse with Ava's reply
+3. We look up conversation history (shared conversation store — Redis or SQLite)
+4. Fold old turns into a rolling summary once history exceeds the token budget
+5. Send to OpenAI gpt-5.1 with system prompt + summary + recent history + tools
+6. If OpenAI calls submit_waitlist, we post to the waitlist API and feed result back
+7. Return TwiML MessagingResponse with Ava's reply
 """
 
 import os
 import json
 import asyncio
 import logging
-from datetime import datetime, timedelta
-from collections import defaultdict
 from openai import OpenAI
 from twilio.twiml.messaging_response import MessagingResponse
 
 from app.ava.prompts import SMS_SYSTEM_PROMPT, SMS_GREETING_TEMPLATE, SUBMIT_WAITLIST_TOOL_CHAT
 from app.ava.waitlist_submit import submit_to_waitlist
+from app.ava.conversation_store import ConversationStore, get_conversation_store
+from app.ava.context_builder import (
+    CONTEXT_TOKEN_BUDGET, build_prompt_history, make_summary_message,
+    plan_compaction, prompt_tokens, summarize,
+)
 
 logger = logging.getLogger("ava.sms")
 
-# In-memory conversation store: {phone_number: {"messages": [...], "last_active": datetime}}
-# Conversations expire after 24 hours of inactivity
-_conversations: dict[str, dict] = defaultdict(lambda: {
-    "messages": [],
-    "last_active": datetime.now(),
-})
-
-# Max conversation history to send to OpenAI (keeps context window small & fast)
+# Max stored messages per conversation. The prompt itself is bounded by
+# CONTEXT_TOKEN_BUDGET; compaction kicks in before this cap is reached so the
+# store never has to drop the summary or split a tool call from its result.
 MAX_HISTORY_MESSAGES = 30
+COMPACT_AT_MESSAGES = MAX_HISTORY_MESSAGES - 6
 
 # Conversation expiry
 CONVERSATION_EXPIRY_HOURS = 24
@@ -45,36 +45,27 @@ def _get_openai_client() -> OpenAI:
     return OpenAI(api_key=os.getenv("OPENAI_API_KEY", ""))
 
 
-def _cleanup_expired():
-    """Remove conversations older than CONVERSATION_EXPIRY_HOURS."""
-    cutoff = datetime.now() - timedelta(hours=CONVERSATION_EXPIRY_HOURS)
-    expired = [phone for phone, conv in _conversations.items() if conv["last_active"] < cutoff]
-    for phone in expired:
-        del _conversations[phone]
+def _get_store() -> ConversationStore:
+    """Shared conversation store (Redis or SQLite), expiring after CONVERSATION_EXPIRY_HOURS of inactivity."""
+    return get_conversation_store(
+        max_messages=MAX_HISTORY_MESSAGES,
+        ttl_seconds=CONVERSATION_EXPIRY_HOURS * 3600,
+    )
 
 
 def _get_conversation(phone: str) -> list[dict]:
     """Get conversation history for a phone number."""
-    _cleanup_expired()
-    conv = _conversations[phone]
-    conv["last_active"] = datetime.now()
-    return conv["messages"]
+    return _get_store().get(phone)
 
 
-def _add_message(phone: str, role: str, content: str):
-    """Add a message to conversation history."""
-    conv = _conversations[phone]
-    conv["messages"].append({"role": role, "content": content})
-    conv["last_active"] = datetime.now()
-    # Trim to max history
-    if len(conv["messages"]) > MAX_HISTORY_MESSAGES:
-        conv["messages"] = conv["messages"][-MAX_HISTORY_MESSAGES:]
+def _add_message(phone: str, role: str, content: str) -> list[dict]:
+    """Add a message to conversation history (trimmed to MAX_HISTORY_MESSAGES). Returns the new history."""
+    return _get_store().append(phone, {"role": role, "content": content})
 
 
 def _add_tool_call(phone: str, tool_call_id: str, fn_name: str, fn_args: str):
     """Add a tool call assistant message to conversation history."""
-    conv = _conversations[phone]
-    conv["messages"].append({
+    _get_store().append(phone, {
         "role": "assistant",
         "content": None,
         "tool_calls": [{
@@ -83,18 +74,37 @@ def _add_tool_call(phone: str, tool_call_id: str, fn_name: str, fn_args: str):
             "function": {"name": fn_name, "arguments": fn_args},
         }],
     })
-    conv["last_active"] = datetime.now()
 
 
-def _add_tool_result(phone: str, tool_call_id: str, result: str):
-    """Add a tool result message to conversation history."""
-    conv = _conversations[phone]
-    conv["messages"].append({
+def _add_tool_result(phone: str, tool_call_id: str, result: str) -> list[dict]:
+    """Add a tool result message to conversation history. Returns the new history."""
+    return _get_store().append(phone, {
         "role": "tool",
         "tool_call_id": tool_call_id,
         "content": result,
     })
-    conv["last_active"] = datetime.now()
+
+
+def _compact_history(phone: str, history: list[dict], client: OpenAI) -> list[dict]:
+    """Fold the oldest turns into the rolling summary if history is over budget."""
+    plan = plan_compaction(history, CONTEXT_TOKEN_BUDGET, max_messages=COMPACT_AT_MESSAGES)
+    if plan is None:
+        return history
+
+    before = prompt_tokens(history)
+    summary = summarize(client, plan.previous_summary, plan.evicted)
+    # Only applied if the messages it summarizes are still the oldest stored ones;
+    # texts that arrived during the summary call are kept after it
+    compacted = _get_store().compact(phone, make_summary_message(summary), history[:plan.drop_first])
+    if compacted is None:
+        logger.info(f"SMS history for {phone} changed while summarizing; compaction skipped this turn")
+        return _get_store().get(phone)
+    history = compacted
+    logger.info(
+        f"Compacted SMS context for {phone}: {len(plan.evicted)} messages folded, "
+        f"{before} -> {prompt_tokens(history)} history tokens"
+    )
+    return history
 
 
 async def handle_incoming_sms(from_number: str, body: str) -> str:
@@ -110,14 +120,11 @@ async def handle_incoming_sms(from_number: str, body: str) -> str:
     """
     logger.info(f"SMS from {from_number}: {body}")
 
-    # Get conversation history
-    history = _get_conversation(from_number)
+    # Add the incoming message to history (one store round trip returns the full history)
+    history = _add_message(from_number, "user", body)
 
     # Check if this is a brand new conversation
-    is_new = len(history) == 0
-
-    # Add the incoming message to history
-    _add_message(from_number, "user", body)
+    is_new = len(history) == 1
 
     # Build messages for OpenAI
     messages = [
@@ -131,12 +138,13 @@ async def handle_incoming_sms(from_number: str, body: str) -> str:
             "content": "This is the start of a new conversation. Greet them warmly and start with Question 1 (full name).",
         })
 
-    # Add conversation history (includes the current message)
-    messages.extend(_get_conversation(from_number))
-
     try:
         client = _get_openai_client()
 
+        # Add summary + recent history (includes the current message), within the token budget
+        history = _compact_history(from_number, history, client)
+        messages.extend(build_prompt_history(history))
+
         # Use gpt-5.1 for reasoning, with function calling
         response = client.chat.completions.create(
             model="gpt-5.1",
@@ -172,12 +180,12 @@ async def handle_incoming_sms(from_number: str, body: str) -> str:
                     result = json.dumps({"success": False, "message": "Had an issue but we captured the info. Reassure the user."})
 
                 # Record the tool result
-                _add_tool_result(from_number, tool_call.id, result)
+                history = _add_tool_result(from_number, tool_call.id, result)
 
                 # Call OpenAI again to get Ava's final text response
                 followup_messages = [
                     {"role": "system", "content": SMS_SYSTEM_PROMPT},
-                ] + _get_conversation(from_number)
+                ] + build_prompt_history(history)
 
                 followup = client.chat.completions.create(
                     model="gpt-5.1",
@@ -17,7 +17,6 @@ Endpoints handled:
 from __future__ import annotations
 
 import os
-import re
 import json
 import hmac
 import hashlib
@@ -28,15 +27,16 @@ from fastapi import Request, Response
 from fastapi.responses import JSONResponse
 
 from app.ava.prompts import get_dynamic_variables
-from app.ava.waitlist_submit import submit_to_waitlist, get_booked_slots, save_transcript
+from app.ava.slot_index import SlotIndex
+from app.ava.waitlist_submit import submit_to_waitlist, save_transcript
+from app.ava.booked_slots import get_cached_booked_slots, get_cached_slot_index, refresh_booked_slots
+from app.http_clients import get_http_client
+from app.idempotency import DONE, get_idempotency_store, idempotency_key, normalize_email
 
 logger = logging.getLogger("ava.voice")
 
 ELEVENLABS_API_URL = "https://api.elevenlabs.io/v1"
 
-# Track which conversations have already had a successful submission to prevent duplicates
-_successful_submissions: dict[str, str] = {}
-
 
 def _verify_elevenlabs_signature(request: Request, body: bytes) -> bool:
     """
@@ -74,7 +74,8 @@ async def handle_twilio_voice_inbound(request: Request) -> Response:
 
     Flow:
     1. Extract caller phone from Twilio's form POST
-    2. Build dynamic variables (date/time/slots) for this call
+    2. Build dynamic variables (date/time/slots) for this call — booked slots come
+       from the in-memory cache (app.ava.booked_slots), never a live Sheets read
     3. Register the call with ElevenLabs (which returns TwiML)
     4. Return TwiML to Twilio — ElevenLabs takes over the call
     """
@@ -98,16 +99,13 @@ async def handle_twilio_voice_inbound(request: Request) -> Response:
         twiml = "<Response><Say>We're experiencing technical difficulties. Please try again later.</Say></Response>"
         return Response(content=twiml, media_type="application/xml")
 
-    try:
-        booked_slots = get_booked_slots()
-        logger.info(f"Loaded {len(booked_slots)} booked slots for call context")
-    except Exception as e:
-        logger.warning(f"Could not load booked slots: {e}")
-        booked_slots = []
+    booked_slots = get_cached_booked_slots()
+    logger.info(f"Using {len(booked_slots)} cached booked slots for call context")
 
     dynamic_vars = get_dynamic_variables(
         caller_phone=caller_phone,
         booked_slots=booked_slots,
+        slot_index=get_cached_slot_index(),
     )
 
     payload = {
@@ -121,18 +119,17 @@ async def handle_twilio_voice_inbound(request: Request) -> Response:
     }
 
     try:
-        async with httpx.AsyncClient(timeout=10.0) as client:
-            resp = await client.post(
-                f"{ELEVENLABS_API_URL}/convai/twilio/register-call",
-                json=payload,
-                headers={
-                    "xi-api-key": api_key,
-                    "Content-Type": "application/json",
-                },
-            )
-            resp.raise_for_status()
-            twiml = resp.text
-            logger.info(f"ElevenLabs registered call for {caller_phone}")
+        resp = await get_http_client("elevenlabs").post(
+            f"{ELEVENLABS_API_URL}/convai/twilio/register-call",
+            json=payload,
+            headers={
+                "xi-api-key": api_key,
+                "Content-Type": "application/json",
+            },
+        )
+        resp.raise_for_status()
+        twiml = resp.text
+        logger.info(f"ElevenLabs registered call for {caller_phone}")
     except httpx.HTTPStatusError as e:
         logger.error(f"ElevenLabs register-call HTTP error {e.response.status_code}: {e.response.text}")
         twiml = "<Response><Say>We're having trouble connecting. Please try again shortly.</Say></Response>"
@@ -187,62 +184,88 @@ async def handle_submit_waitlist_tool(request: Request) -> JSONResponse:
         f"role={role}, clinic={clinic_name}, time={preferred_time}"
     )
 
-    # Prevent duplicate submissions for the same conversation
-    if conversation_id and conversation_id in _successful_submissions:
-        prev_time = _successful_submissions[conversation_id]
-        logger.info(f"Duplicate submit for conversation {conversation_id} (already booked: {prev_time})")
-        return JSONResponse(content={
-            "result": (
-                f"This caller is already booked for {prev_time}. "
-                "No need to submit again — just confirm and end the call."
-            )
-        })
-
     if not full_name or not email:
         return JSONResponse(content={
             "result": "Missing required fields. Ask the caller for their full name and email before submitting."
         })
 
-    # Check for time conflicts with already-booked slots
-    booked_slots = get_booked_slots()
-    if preferred_time and _is_time_conflict(preferred_time, booked_slots):
-        logger.warning(f"Time conflict: {preferred_time} is already booked")
-        from app.ava.prompts import _get_available_slots
-        available = _get_available_slots()
+    # Prevent duplicate submissions for the same conversation (or, without one, the same
+    # email and time) across retries and workers — before any Sheets, Cal.com or SMTP work
+    store = get_idempotency_store()
+    key = (
+        idempotency_key("ava:conversation", conversation_id) if conversation_id
+        else idempotency_key("ava:email", normalize_email(email), preferred_time)
+    )
+    existing = store.claim(key)
+    if existing is not None:
+        if existing["state"] == DONE:
+            prev_time = (existing["result"] or {}).get("preferredTime", preferred_time)
+            logger.info(f"Duplicate submit for conversation {conversation_id or email} (already booked: {prev_time})")
+            return JSONResponse(content={
+                "result": (
+                    f"This caller is already booked for {prev_time}. "
+                    "No need to submit again — just confirm and end the call."
+                )
+            })
+        logger.info(f"Duplicate submit for conversation {conversation_id or email} while the first is in progress")
         return JSONResponse(content={
             "result": (
-                f"TIME CONFLICT: '{preferred_time}' is already booked. "
-                f"Do NOT retry this same time. Suggest one of these open slots instead:\n{available}\n"
-                "Ask the caller which of these works for them, then call submit_waitlist with the NEW time."
+                "This submission is already being processed. "
+                "Do not submit again — tell the caller they're all set."
             )
         })
 
-    waitlist_data = {
-        "fullName": full_name,
-        "email": email,
-        "role": role,
-        "clinicName": clinic_name,
-        "preferredTime": preferred_time,
-        "bestPhone": best_phone,
-    }
-
-    success = await submit_to_waitlist(waitlist_data, phone=caller_phone)
+    # Only a booked submission keeps the key; conflicts, failures and errors free it for a retry
+    booked = False
+    try:
+        # Check for time conflicts against a fresh read (off the event loop; falls back to the cache)
+        try:
+            await refresh_booked_slots()
+        except Exception as e:
+            logger.warning(f"Could not refresh booked slots, using cache: {e}")
+        slot_index = get_cached_slot_index()
+        if preferred_time and _is_time_conflict(preferred_time, slot_index):
+            logger.warning(f"Time conflict: {preferred_time} is already booked")
+            from app.ava.prompts import _get_available_slots
+            from app.ava.waitlist_submit import _parse_preferred_time
+            available = _get_available_slots(slot_index, near=_parse_preferred_time(preferred_time))
+            return JSONResponse(content={
+                "result": (
+                    f"TIME CONFLICT: '{preferred_time}' is already booked. "
+                    f"Do NOT retry this same time. Suggest one of these open slots instead:\n{available}\n"
+                    "Ask the caller which of these works for them, then call submit_waitlist with the NEW time."
+                )
+            })
+
+        waitlist_data = {
+            "fullName": full_name,
+            "email": email,
+            "role": role,
+            "clinicName": clinic_name,
+            "preferredTime": preferred_time,
+            "bestPhone": best_phone,
+        }
 
-    if success:
-        if conversation_id:
-            _successful_submissions[conversation_id] = preferred_time
-        logger.info(f"Waitlist submission successful for {email}")
-        return JSONResponse(content={
-            "result": (
-                "Waitlist submission successful. Tell the caller they're all set "
-                "and the Axis founders will reach out to confirm their demo."
-            )
-        })
-    else:
-        logger.error(f"Waitlist submission failed for {email}")
-        return JSONResponse(content={
-            "result": "Submission had an issue but we captured the info. Reassure the caller the team will follow up."
-        })
+        success = await submit_to_waitlist(waitlist_data, phone=caller_phone)
+
+        if success:
+            store.complete(key, {"preferredTime": preferred_time})
+            booked = True
+            logger.info(f"Waitlist submission successful for {email}")
+            return JSONResponse(content={
+                "result": (
+                    "Waitlist submission successful. Tell the caller they're all set "
+                    "and the Axis founders will reach out to confirm their demo."
+                )
+            })
+        else:
+            logger.error(f"Waitlist submission failed for {email}")
+            return JSONResponse(content={
+                "result": "Submission had an issue but we captured the info. Reassure the caller the team will follow up."
+            })
+    finally:
+        if not booked:
+            store.release(key)
 
 
 # ──────────────────────────────────────────────
@@ -330,7 +353,7 @@ async def _handle_post_call_transcription(data: dict):
     if transcript_text and caller_phone and caller_phone != "unknown":
         logger.info(f"Saving transcript for {caller_phone} ({len(transcript_text)} chars)")
         try:
-            save_transcript(caller_phone, transcript_text)
+            await save_transcript(caller_phone, transcript_text)
         except Exception as e:
             logger.error(f"Failed to save transcript: {e}")
 
@@ -346,14 +369,29 @@ async def _handle_post_call_transcription(data: dict):
             "preferredTime": "call dropped - follow up needed",
             "bestPhone": "",
         }
+        # ElevenLabs retries the webhook on a slow or failed response, and every worker
+        # may receive it: only the first delivery for this conversation submits
+        store = get_idempotency_store()
+        key = (
+            idempotency_key("ava:postcall", conversation_id) if conversation_id != "unknown"
+            else idempotency_key("ava:postcall:phone", caller_phone, caller_name)
+        )
+        if store.claim(key) is not None:
+            logger.info(f"Partial data for conversation {conversation_id} already submitted or in progress")
+            return
+        submitted = False
         try:
-            await submit_to_waitlist(partial_data, phone=caller_phone)
-            logger.info(f"Partial data submitted for: {caller_name}")
+            submitted = await submit_to_waitlist(partial_data, phone=caller_phone)
+            if submitted:
+                store.complete(key)
+                logger.info(f"Partial data submitted for: {caller_name}")
+            else:
+                logger.error(f"Partial data submission failed for: {caller_name}")
         except Exception as e:
             logger.error(f"Failed to submit partial data: {e}")
-
-    # Clean up submission tracking for this conversation
-    _successful_submissions.pop(conversation_id, None)
+        finally:
+            if not submitted:
+                store.release(key)
 
 
 def _handle_call_initiation_failure(data: dict):
@@ -367,29 +405,8 @@ def _handle_call_initiation_failure(data: dict):
 # ──────────────────────────────────────────────
 # HELPERS
 # ──────────────────────────────────────────────
-def _is_time_conflict(preferred_time: str, booked_slots: list[str]) -> bool:
-    """Check if the preferred time conflicts with any already-booked slot."""
-    if not preferred_time or not booked_slots:
+def _is_time_conflict(preferred_time: str, slot_index: SlotIndex) -> bool:
+    """Check if the preferred time overlaps any already-booked slot (meeting-length aware)."""
+    if not preferred_time or not len(slot_index):
         return False
-
-    norm = preferred_time.lower().strip()
-    for slot in booked_slots:
-        slot_norm = slot.lower().strip()
-        if norm == slot_norm:
-            return True
-        norm_nums = re.findall(r'\d+:\d+\s*[ap]m', norm)
-        slot_nums = re.findall(r'\d+:\d+\s*[ap]m', slot_norm)
-        if norm_nums and slot_nums and norm_nums[0] == slot_nums[0]:
-            norm_dates = re.findall(
-                r'(?:january|february|march|april|may|june|july|august|'
-                r'september|october|november|december)\s+\d+',
-                norm,
-            )
-            slot_dates = re.findall(
-                r'(?:january|february|march|april|may|june|july|august|'
-                r'september|october|november|december)\s+\d+',
-                slot_norm,
-            )
-            if norm_dates and slot_dates and norm_dates[0] == slot_dates[0]:
-                return True
-    return False
+    return slot_index.conflicts(preferred_time)
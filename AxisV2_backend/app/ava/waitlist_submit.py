@@ -8,6 +8,8 @@ from __future__ import annotations
 
 import os
 import ssl
+import time
+import asyncio
 import logging
 import smtplib
 from email.mime.text import MIMEText
@@ -16,7 +18,12 @@ from datetime import datetime, timedelta
 from typing import Optional
 from zoneinfo import ZoneInfo
 
-import httpx
+from app.blocking_io import SHEETS_TIMEOUT_SECONDS, SMTP_SEND_TIMEOUT_SECONDS, SMTP_TIMEOUT_SECONDS, run_blocking
+from app.http_clients import get_http_client
+from app.step_timing import record, timed
+from app.task_queue import get_task_queue
+from app.sheets_writer import SheetsWriter, WorksheetSpec, appended_first_row, create_writer
+from app.ava.row_index import PhoneRowIndex, normalize_phone
 
 logger = logging.getLogger("ava.waitlist")
 
@@ -24,6 +31,7 @@ logger = logging.getLogger("ava.waitlist")
 _sheets_client = None
 
 CAL_BOOKING_URL = "https://cal.com/axis-founders/15min"
+CAL_TIMEOUT_SECONDS = float(os.getenv("CAL_TIMEOUT_SECONDS", "15"))
 
 
 def _get_sheets_client():
@@ -62,6 +70,7 @@ def _get_sheets_client():
             scopes=scopes,
         )
         client = gspread.authorize(creds)
+        client.set_timeout(SHEETS_TIMEOUT_SECONDS)
         spreadsheet = client.open_by_key(spreadsheet_id)
         _sheets_client = (client, spreadsheet)
         logger.info("Google Sheets connected successfully")
@@ -86,12 +95,46 @@ WAITLIST_HEADERS = [
     "Transcript",
 ]
 
+AVA_CALLS_SHEET = "Ava Calls"
 
-def save_transcript(phone: str, transcript: str) -> bool:
+_sheets_writer: Optional[SheetsWriter] = None
+_row_index: Optional[PhoneRowIndex] = None
+
+
+def get_row_index() -> PhoneRowIndex:
+    """Persistent phone -> Ava Calls row index (see app.ava.row_index)."""
+    global _row_index
+    if _row_index is None:
+        _row_index = PhoneRowIndex()
+    return _row_index
+
+
+def get_sheets_writer() -> SheetsWriter:
+    """Write-behind appender for the Ava Calls sheet (see app.sheets_writer)."""
+    global _sheets_writer
+    if _sheets_writer is None:
+        _sheets_writer = create_writer(
+            lambda: _get_sheets_client()[1],
+            WorksheetSpec(title=AVA_CALLS_SHEET, headers=WAITLIST_HEADERS, cols=11),
+        )
+        # Keep the phone -> row index in sync from each batch append's response
+        _sheets_writer.on_append(AVA_CALLS_SHEET, get_row_index().record_appended)
+    return _sheets_writer
+
+
+async def save_transcript(phone: str, transcript: str) -> bool:
     """
     Find the most recent row matching this phone number and write the transcript.
     Called from the call_ended webhook after the full transcript is available.
     """
+    try:
+        return await run_blocking(_save_transcript, phone, transcript, timeout=SHEETS_TIMEOUT_SECONDS)
+    except asyncio.TimeoutError:
+        logger.error(f"Timed out saving transcript for {phone}")
+        return False
+
+
+def _save_transcript(phone: str, transcript: str) -> bool:
     _, spreadsheet = _get_sheets_client()
     if spreadsheet is None:
         logger.warning("Google Sheets not available — cannot save transcript")
@@ -101,26 +144,25 @@ def save_transcript(phone: str, transcript: str) -> bool:
         return False
 
     try:
-        import gspread
+        writer = get_sheets_writer()
+        index = get_row_index()
 
+        # The caller's submission row may still be queued — write it first so it's indexed
         try:
-            worksheet = spreadsheet.worksheet("Ava Calls")
-        except gspread.WorksheetNotFound:
-            return False
+            writer.flush(AVA_CALLS_SHEET)
+        except Exception as e:
+            logger.warning(f"Could not flush queued rows before saving transcript: {e}")
 
-        # Find the most recent row matching this phone with an EMPTY transcript
-        phone_col = worksheet.col_values(4)
-        # Pad transcript column to same length so indexing is safe
-        transcript_col = worksheet.col_values(11) if worksheet.col_count >= 11 else []
-        transcript_col += [""] * (len(phone_col) - len(transcript_col))
+        worksheet = writer.worksheet(AVA_CALLS_SHEET)
+        if not index.built:
+            _rebuild_row_index(worksheet)
 
-        target_row = None
-        clean_phone = phone.replace("'", "").strip()
-        for i in range(len(phone_col) - 1, 0, -1):
-            cell_val = phone_col[i].replace("'", "").strip()
-            if cell_val == clean_phone and not transcript_col[i].strip():
-                target_row = i + 1  # 1-indexed
-                break
+        # Most recent row for this phone with an EMPTY transcript; confirm the sheet still
+        # agrees (one cell read) and rebuild the index once if it was edited by hand
+        target_row = index.latest_open_row(phone)
+        if target_row is not None and not _row_matches_phone(worksheet, target_row, phone):
+            _rebuild_row_index(worksheet)
+            target_row = index.latest_open_row(phone)
 
         if target_row is None:
             # No matching row without a transcript — append a new minimal row
@@ -128,14 +170,17 @@ def save_transcript(phone: str, transcript: str) -> bool:
             timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
             phone_value = f"'{phone}" if phone else ""
             row = [timestamp, "", "", phone_value, "", "", "", "", "voice-call", ""]
-            worksheet.append_row(row, value_input_option="USER_ENTERED")
-            target_row = len(worksheet.col_values(1))  # the row we just appended
+            response = worksheet.append_row(row, value_input_option="USER_ENTERED")
+            target_row = appended_first_row(response)
+            if target_row is None:
+                target_row = len(worksheet.col_values(1))  # the row we just appended
 
         # Transcript column is 11 (K) — expand sheet if needed
         if worksheet.col_count < 11:
             worksheet.resize(cols=12)
             worksheet.update_cell(1, 11, "Transcript")
         worksheet.update_cell(target_row, 11, transcript)
+        index.record(phone, target_row, has_transcript=True)
         logger.info(f"Transcript saved for phone {phone} (row {target_row})")
         return True
 
@@ -144,32 +189,47 @@ def save_transcript(phone: str, transcript: str) -> bool:
         return False
 
 
+def _row_matches_phone(worksheet, row: int, phone: str) -> bool:
+    return normalize_phone(worksheet.cell(row, 4).value or "") == normalize_phone(phone)
+
+
+def _rebuild_row_index(worksheet):
+    """Full scan of the phone + transcript columns — only on first use or a stale index."""
+    with get_sheets_writer().paused():
+        phone_col = worksheet.col_values(4)
+        transcript_col = worksheet.col_values(11) if worksheet.col_count >= 11 else []
+        get_row_index().rebuild(phone_col, transcript_col)
+
+
 def get_booked_slots() -> list[str]:
-    """Read the 'Preferred Call Time' column from Google Sheets to find already-booked slots."""
+    """
+    Read the 'Preferred Call Time' column from Google Sheets to find already-booked slots,
+    plus any submissions still queued in the sheets writer journal.
+
+    Raises when the sheet can't be read: an empty list means nothing is booked, so a
+    failure must not look like one (app.ava.booked_slots keeps its last good copy).
+    """
     _, spreadsheet = _get_sheets_client()
     if spreadsheet is None:
-        logger.warning("Google Sheets not available — cannot read booked slots")
-        return []
+        raise RuntimeError("Google Sheets not available — cannot read booked slots")
 
-    try:
-        import gspread
+    import gspread
 
-        try:
-            worksheet = spreadsheet.worksheet("Ava Calls")
-        except gspread.WorksheetNotFound:
-            return []
-
-        all_values = worksheet.col_values(7)
-        slots = [
-            v for v in all_values[1:]
-            if v and "declined" not in v.lower()
-        ]
-        logger.info(f"Found {len(slots)} booked slots in Google Sheets")
-        return slots
+    # Read the journal before the sheet so a row flushed in between is seen at least once
+    queued = [row[6] for row in get_sheets_writer().pending(AVA_CALLS_SHEET) if len(row) > 6]
 
-    except Exception as e:
-        logger.error(f"Error reading booked slots: {e}", exc_info=True)
-        return []
+    try:
+        worksheet = spreadsheet.worksheet(AVA_CALLS_SHEET)
+        all_values = worksheet.col_values(7)[1:]
+    except gspread.WorksheetNotFound:
+        all_values = []
+
+    slots = list(dict.fromkeys(
+        v for v in all_values + queued
+        if v and "declined" not in v.lower()
+    ))
+    logger.info(f"Found {len(slots)} booked slots in Google Sheets")
+    return slots
 
 
 # ──────────────────────────────────────────────
@@ -271,28 +331,28 @@ async def _create_cal_booking(
     }
 
     try:
-        async with httpx.AsyncClient(timeout=15.0) as client:
-            resp = await client.post(
-                f"https://api.cal.com/v1/bookings?apiKey={cal_api_key}",
-                json=payload,
-                headers={"Content-Type": "application/json"},
-            )
+        resp = await get_http_client("cal").post(
+            "/v1/bookings",
+            params={"apiKey": cal_api_key},
+            json=payload,
+            headers={"Content-Type": "application/json"},
+        )
 
-            if resp.status_code in (200, 201):
-                data = resp.json()
-                booking_uid = data.get("uid", "")
-                booking_id = data.get("id", "")
-                logger.info(
-                    f"Cal.com booking created: id={booking_id}, uid={booking_uid}, "
-                    f"time={preferred_time}, email={email}"
-                )
-                return f"https://cal.com/booking/{booking_uid}" if booking_uid else CAL_BOOKING_URL
-            else:
-                logger.error(
-                    f"Cal.com booking failed: status={resp.status_code}, "
-                    f"body={resp.text[:500]}"
-                )
-                return None
+        if resp.status_code in (200, 201):
+            data = resp.json()
+            booking_uid = data.get("uid", "")
+            booking_id = data.get("id", "")
+            logger.info(
+                f"Cal.com booking created: id={booking_id}, uid={booking_uid}, "
+                f"time={preferred_time}, email={email}"
+            )
+            return f"https://cal.com/booking/{booking_uid}" if booking_uid else CAL_BOOKING_URL
+        else:
+            logger.error(
+                f"Cal.com booking failed: status={resp.status_code}, "
+                f"body={resp.text[:500]}"
+            )
+            return None
 
     except Exception as e:
         logger.error(f"Cal.com API error: {e}", exc_info=True)
@@ -301,15 +361,21 @@ async def _create_cal_booking(
 
 async def submit_to_waitlist(data: dict, phone: str = "") -> bool:
     """
-    Write caller data to Google Sheets, create Cal.com booking,
-    and send confirmation email.
+    Create the Cal.com booking and journal the caller's row for Google Sheets,
+    then queue the confirmation email.
+
+    The booking and the Sheets client warm-up run concurrently, each with its own
+    timeout. The row (which carries the booking link) is journaled locally right
+    after — Sheets itself is written by the background writer — and the email goes
+    to the background task queue with retry, so the live caller only waits for the
+    booking.
 
     Args:
         data: Dict with keys: fullName, email, role, clinicName, preferredTime
         phone: Caller's phone number
 
     Returns:
-        True if write succeeded, False otherwise.
+        True if the submission was journaled, False otherwise.
     """
     full_name = data.get("fullName", "")
     email = data.get("email", "")
@@ -319,25 +385,50 @@ async def submit_to_waitlist(data: dict, phone: str = "") -> bool:
     best_phone = data.get("bestPhone", "")
 
     logger.info(f"Submitting waitlist: {full_name} ({email}), clinic={clinic_name}, time={preferred_time}")
-
-    # 1) Try to create Cal.com booking
-    cal_booking_url = await _create_cal_booking(full_name, email, preferred_time, clinic_name)
+    started = time.perf_counter()
+
+    # 1) Cal.com booking ‖ Sheets client (authorizes on first use; cached afterwards)
+    booking, _ = await asyncio.gather(
+        timed("submit.cal_booking", asyncio.wait_for(
+            _create_cal_booking(full_name, email, preferred_time, clinic_name), timeout=CAL_TIMEOUT_SECONDS,
+        )),
+        timed("submit.sheets_client", run_blocking(_get_sheets_client, timeout=SHEETS_TIMEOUT_SECONDS)),
+        return_exceptions=True,
+    )
+    if isinstance(booking, BaseException):
+        logger.error(f"Cal.com booking failed for {email}: {booking!r}")
+        booking = None
+    cal_booking_url = booking or ""
     if cal_booking_url:
         logger.info(f"Cal.com booking created: {cal_booking_url}")
     else:
         logger.info("Cal.com booking skipped or failed — continuing with sheet + email")
-        cal_booking_url = ""
-
-    # 2) Write to Google Sheets
-    sheets_ok = _write_to_sheets(
-        full_name, email, phone, role, clinic_name,
-        preferred_time, best_phone, cal_booking_url,
-    )
 
-    # 3) Send confirmation email
+    # 2) Journal the row (local SQLite; the sheets writer appends it in the background)
+    try:
+        sheets_ok = await timed("submit.sheets_journal", run_blocking(
+            _write_to_sheets,
+            full_name, email, phone, role, clinic_name,
+            preferred_time, best_phone, cal_booking_url,
+            timeout=SHEETS_TIMEOUT_SECONDS,
+        ))
+    except asyncio.TimeoutError:
+        logger.error(f"Timed out writing waitlist submission for {email}")
+        sheets_ok = False
+    if sheets_ok:
+        from app.ava.booked_slots import add_booked_slot
+        add_booked_slot(preferred_time)
+
+    # 3) Confirmation email — off the response path, retried on failure
     if email:
-        _send_confirmation_email(full_name, email, preferred_time, clinic_name, cal_booking_url)
+        get_task_queue().submit(
+            "submit.confirmation_email",
+            _send_confirmation_email,
+            full_name, email, preferred_time, clinic_name, cal_booking_url,
+            timeout=SMTP_SEND_TIMEOUT_SECONDS,
+        )
 
+    record("submit.response_path", time.perf_counter() - started, sheets_ok)
     return sheets_ok
 
 
@@ -345,27 +436,13 @@ def _write_to_sheets(
     full_name, email, phone, role, clinic_name,
     preferred_time, best_phone="", cal_booking_url="",
 ) -> bool:
-    """Write a row to the Ava Calls sheet."""
+    """Queue a row for the Ava Calls sheet (journaled, then batch-appended by the sheets writer)."""
     _, spreadsheet = _get_sheets_client()
     if spreadsheet is None:
         logger.error("Google Sheets not available — cannot save submission")
         return False
 
     try:
-        import gspread
-
-        try:
-            worksheet = spreadsheet.worksheet("Ava Calls")
-        except gspread.WorksheetNotFound:
-            worksheet = spreadsheet.add_worksheet(title="Ava Calls", rows=1000, cols=11)
-
-        try:
-            existing = worksheet.row_values(1)
-            if not existing or existing != WAITLIST_HEADERS:
-                worksheet.update("A1", [WAITLIST_HEADERS])
-        except Exception:
-            worksheet.update("A1", [WAITLIST_HEADERS])
-
         timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
         phone_value = f"'{phone}" if phone else ""
         best_phone_value = f"'{best_phone}" if best_phone else ""
@@ -383,8 +460,8 @@ def _write_to_sheets(
             cal_booking_url,
         ]
 
-        worksheet.append_row(row, value_input_option="USER_ENTERED")
-        logger.info(f"Waitlist submission saved for {email}")
+        pending = get_sheets_writer().enqueue(AVA_CALLS_SHEET, row)
+        logger.info(f"Waitlist submission journaled for {email} ({pending} pending for Sheets)")
         return True
 
     except Exception as e:
@@ -574,9 +651,10 @@ The Axis Team
 
     try:
         context = ssl.create_default_context()
-        with smtplib.SMTP_SSL(smtp_host, smtp_port, context=context) as server:
+        with smtplib.SMTP_SSL(smtp_host, smtp_port, context=context, timeout=SMTP_TIMEOUT_SECONDS) as server:
             server.login(smtp_email, smtp_password)
             server.sendmail(smtp_email, to_email, msg.as_string())
         logger.info(f"Confirmation email sent to {to_email}")
     except Exception as e:
         logger.error(f"Failed to send confirmation email to {to_email}: {e}", exc_info=True)
+        raise  # the task queue retries it (unless it gave up waiting — see app.task_queue)
@@ -0,0 +1,68 @@
+"""
+Blocking I/O pool — keeps gspread and SMTP calls off the event loop
+
+gspread and smtplib are synchronous; called directly from an async handler they
+stall every other request on the worker for as long as Google or the SMTP server
+takes to answer. run_blocking() hands the call to a small dedicated thread pool
+and stops waiting after a per-call timeout, so one slow upstream only ties up a
+pool thread. The underlying clients also get socket timeouts (see
+SHEETS_TIMEOUT_SECONDS / SMTP_TIMEOUT_SECONDS) so abandoned calls don't pin a
+thread forever.
+"""
+from __future__ import annotations
+
+import os
+import asyncio
+import logging
+import functools
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Optional
+
+logger = logging.getLogger("blocking_io")
+
+BLOCKING_IO_WORKERS = int(os.getenv("BLOCKING_IO_WORKERS", "8"))
+SHEETS_TIMEOUT_SECONDS = float(os.getenv("SHEETS_TIMEOUT_SECONDS", "20"))
+SMTP_TIMEOUT_SECONDS = float(os.getenv("SMTP_TIMEOUT_SECONDS", "20"))
+# SMTP_TIMEOUT_SECONDS bounds each socket operation; a whole send (connect + TLS,
+# login, MAIL/RCPT/DATA) is several of them, so callers wait for this long in total
+SMTP_SEND_TIMEOUT_SECONDS = float(os.getenv("SMTP_SEND_TIMEOUT_SECONDS", str(SMTP_TIMEOUT_SECONDS * 4)))
+
+_executor: Optional[ThreadPoolExecutor] = None
+
+
+class BlockingCallTimeout(asyncio.TimeoutError):
+    """run_blocking stopped waiting; the call is still running and may yet succeed."""
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(max_workers=BLOCKING_IO_WORKERS, thread_name_prefix="blocking-io")
+    return _executor
+
+
+async def run_blocking(fn: Callable[..., Any], *args, timeout: float, **kwargs) -> Any:
+    """
+    Run a blocking callable in the I/O pool and await its result.
+    Raises BlockingCallTimeout (an asyncio.TimeoutError) if it takes longer than
+    `timeout` seconds (the thread finishes in the background; its result is discarded).
+    """
+    loop = asyncio.get_running_loop()
+    future = loop.run_in_executor(_get_executor(), functools.partial(fn, *args, **kwargs))
+    # asyncio.wait rather than wait_for: a socket timeout raised by fn is a TimeoutError
+    # too, and must not be mistaken for the call still running
+    done, _ = await asyncio.wait({future}, timeout=timeout)
+    if not done:
+        future.cancel()  # stop awaiting; the thread itself runs to completion
+        name = getattr(fn, '__qualname__', fn)
+        logger.warning(f"{name} timed out after {timeout:.0f}s")
+        raise BlockingCallTimeout(f"{name} still running after {timeout:.0f}s")
+    return future.result()
+
+
+def shutdown_blocking_pool():
+    """Stop accepting work; in-flight calls are left to finish on their own."""
+    global _executor
+    if _executor is not None:
+        _executor.shutdown(wait=False, cancel_futures=True)
+        _executor = None
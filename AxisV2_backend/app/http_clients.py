@@ -0,0 +1,89 @@
+"""
+HTTP Client Registry — one pooled httpx.AsyncClient per upstream
+
+A fresh httpx.AsyncClient per request means a new TCP + TLS handshake to
+ElevenLabs or Cal.com on every inbound call and every booking. Clients here are
+created once per upstream and reused, so requests ride a warm keep-alive (and,
+with h2 installed, multiplexed HTTP/2) connection. Each upstream gets its own
+timeout so a slow Cal.com can't be configured into the ElevenLabs budget.
+
+The ava_server lifespan calls close_http_clients() on shutdown; a client used
+after that is simply recreated on the next get_http_client().
+"""
+from __future__ import annotations
+
+import os
+import logging
+from dataclasses import dataclass
+from typing import Optional
+
+import httpx
+
+logger = logging.getLogger("http_clients")
+
+HTTP_MAX_CONNECTIONS = int(os.getenv("HTTP_MAX_CONNECTIONS", "20"))
+HTTP_MAX_KEEPALIVE = int(os.getenv("HTTP_MAX_KEEPALIVE", "10"))
+HTTP_KEEPALIVE_EXPIRY_SECONDS = float(os.getenv("HTTP_KEEPALIVE_EXPIRY_SECONDS", "60"))
+HTTP_CONNECT_TIMEOUT_SECONDS = float(os.getenv("HTTP_CONNECT_TIMEOUT_SECONDS", "5"))
+HTTP2_ENABLED = os.getenv("HTTP2_ENABLED", "true").lower() == "true"
+
+
+@dataclass(frozen=True)
+class Upstream:
+    base_url: str
+    timeout: float
+
+
+UPSTREAMS = {
+    "elevenlabs": Upstream("https://api.elevenlabs.io", float(os.getenv("ELEVENLABS_TIMEOUT_SECONDS", "10"))),
+    "cal": Upstream("https://api.cal.com", float(os.getenv("CAL_TIMEOUT_SECONDS", "15"))),
+}
+
+
+def _http2_available() -> bool:
+    try:
+        import h2  # noqa: F401
+        return True
+    except ImportError:
+        return False
+
+
+_clients: dict[str, httpx.AsyncClient] = {}
+_http2: Optional[bool] = None
+
+
+def _build_client(upstream: Upstream) -> httpx.AsyncClient:
+    global _http2
+    if _http2 is None:
+        _http2 = HTTP2_ENABLED and _http2_available()
+        if HTTP2_ENABLED and not _http2:
+            logger.info("h2 not installed — shared HTTP clients use HTTP/1.1 keep-alive")
+    return httpx.AsyncClient(
+        base_url=upstream.base_url,
+        http2=_http2,
+        timeout=httpx.Timeout(upstream.timeout, connect=min(HTTP_CONNECT_TIMEOUT_SECONDS, upstream.timeout)),
+        limits=httpx.Limits(
+            max_connections=HTTP_MAX_CONNECTIONS,
+            max_keepalive_connections=HTTP_MAX_KEEPALIVE,
+            keepalive_expiry=HTTP_KEEPALIVE_EXPIRY_SECONDS,
+        ),
+    )
+
+
+def get_http_client(name: str) -> httpx.AsyncClient:
+    """Shared client for a named upstream (see UPSTREAMS); requests take paths relative to its base_url."""
+    client = _clients.get(name)
+    if client is None or client.is_closed:
+        client = _clients[name] = _build_client(UPSTREAMS[name])
+    return client
+
+
+async def close_http_clients():
+    """Close every pooled connection; called from the ava_server lifespan on shutdown."""
+    clients = list(_clients.values())
+    _clients.clear()
+    for client in clients:
+        try:
+            await client.aclose()
+        except Exception as e:
+            logger.warning(f"Error closing HTTP client: {e}")
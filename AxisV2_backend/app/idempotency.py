@@ -0,0 +1,202 @@
+"""
+Idempotency Store — short-circuit repeated submissions before any side effects
+
+Double-clicks, client retries and a voice agent re-invoking its tool all used to
+repeat the whole submission: another sheet row, another Cal.com booking, another
+email. Each submission now claims a key first (the Idempotency-Key header, the
+ElevenLabs conversation_id, or the normalized email) and only the first claim
+does the work; repeats get the stored result back.
+
+Backends (same selection as the SMS conversation store):
+  RedisIdempotencyStore  — used when REDIS_URL is set (shared by every worker)
+  SQLiteIdempotencyStore — local fallback, file path from IDEMPOTENCY_DB
+
+A claim is "pending" until complete() stores the result for IDEMPOTENCY_TTL_SECONDS.
+Pending claims expire after IDEMPOTENCY_PENDING_TTL_SECONDS so a request that
+crashed mid-way doesn't block retries; release() frees a claim after a failure.
+"""
+from __future__ import annotations
+
+import os
+import json
+import time
+import hashlib
+import sqlite3
+import logging
+import threading
+from typing import Optional
+
+logger = logging.getLogger("idempotency")
+
+IDEMPOTENCY_TTL_SECONDS = int(os.getenv("IDEMPOTENCY_TTL_SECONDS", str(24 * 3600)))
+IDEMPOTENCY_PENDING_TTL_SECONDS = int(os.getenv("IDEMPOTENCY_PENDING_TTL_SECONDS", "60"))
+IDEMPOTENCY_DB = os.getenv(
+    "IDEMPOTENCY_DB", "/tmp/idempotency.db" if os.getenv("VERCEL") else "idempotency.db"
+)
+
+PENDING = "pending"
+DONE = "done"
+
+
+def normalize_email(email: str) -> str:
+    return (email or "").strip().lower()
+
+
+def idempotency_key(scope: str, *parts: str) -> str:
+    """Namespaced key; parts are hashed so raw emails and client keys aren't stored."""
+    digest = hashlib.sha256("\x1f".join(str(p) for p in parts).encode()).hexdigest()[:32]
+    return f"{scope}:{digest}"
+
+
+class IdempotencyStore:
+    """
+    Backends implement:
+      claim(key)           -> None if this caller now owns the key, else the existing
+                              record {"state": "pending" | "done", "result": ...}
+      complete(key, result)
+      release(key)
+    """
+
+    def __init__(
+        self,
+        ttl_seconds: int = IDEMPOTENCY_TTL_SECONDS,
+        pending_ttl_seconds: int = IDEMPOTENCY_PENDING_TTL_SECONDS,
+    ):
+        self.ttl_seconds = ttl_seconds
+        self.pending_ttl_seconds = pending_ttl_seconds
+
+    def claim(self, key: str) -> Optional[dict]:
+        raise NotImplementedError
+
+    def complete(self, key: str, result=None):
+        raise NotImplementedError
+
+    def release(self, key: str):
+        raise NotImplementedError
+
+
+# ──────────────────────────────────────────────
+# REDIS BACKEND
+# ──────────────────────────────────────────────
+class RedisIdempotencyStore(IdempotencyStore):
+    """SET NX claims; the record is a JSON string with its own expiry."""
+
+    KEY_PREFIX = "axis:idem:"
+
+    def __init__(self, redis_url: str, **kwargs):
+        super().__init__(**kwargs)
+        import redis
+
+        self._redis = redis.Redis.from_url(redis_url, decode_responses=True)
+
+    def claim(self, key: str) -> Optional[dict]:
+        redis_key = self.KEY_PREFIX + key
+        record = json.dumps({"state": PENDING, "result": None})
+        if self._redis.set(redis_key, record, nx=True, ex=self.pending_ttl_seconds):
+            return None
+        existing = self._redis.get(redis_key)
+        if existing is None:  # expired between SET and GET — try once more
+            if self._redis.set(redis_key, record, nx=True, ex=self.pending_ttl_seconds):
+                return None
+            existing = self._redis.get(redis_key)
+        return json.loads(existing) if existing else {"state": PENDING, "result": None}
+
+    def complete(self, key: str, result=None):
+        self._redis.set(
+            self.KEY_PREFIX + key, json.dumps({"state": DONE, "result": result}), ex=self.ttl_seconds
+        )
+
+    def release(self, key: str):
+        self._redis.delete(self.KEY_PREFIX + key)
+
+
+# ──────────────────────────────────────────────
+# SQLITE BACKEND
+# ──────────────────────────────────────────────
+class SQLiteIdempotencyStore(IdempotencyStore):
+    """Single-host store; expired keys are purged through an index on expires_at."""
+
+    PURGE_INTERVAL_SECONDS = 300
+
+    def __init__(self, path: str, **kwargs):
+        super().__init__(**kwargs)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript("""
+            CREATE TABLE IF NOT EXISTS idempotency_keys (
+                key TEXT PRIMARY KEY,
+                state TEXT NOT NULL,
+                result TEXT,
+                expires_at REAL NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS idx_idempotency_keys_expires ON idempotency_keys (expires_at);
+        """)
+        self._last_purge = 0.0
+
+    def claim(self, key: str) -> Optional[dict]:
+        now = time.time()
+        with self._lock:
+            if now - self._last_purge >= self.PURGE_INTERVAL_SECONDS:
+                self._last_purge = now
+                self._conn.execute("DELETE FROM idempotency_keys WHERE expires_at < ?", (now,))
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                row = self._conn.execute(
+                    "SELECT state, result, expires_at FROM idempotency_keys WHERE key = ?", (key,)
+                ).fetchone()
+                if row is not None and row[2] >= now:
+                    self._conn.execute("COMMIT")
+                    return {"state": row[0], "result": json.loads(row[1]) if row[1] else None}
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO idempotency_keys (key, state, result, expires_at) VALUES (?, ?, NULL, ?)",
+                    (key, PENDING, now + self.pending_ttl_seconds),
+                )
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+        return None
+
+    def complete(self, key: str, result=None):
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO idempotency_keys (key, state, result, expires_at) VALUES (?, ?, ?, ?)",
+                (key, DONE, json.dumps(result), time.time() + self.ttl_seconds),
+            )
+
+    def release(self, key: str):
+        with self._lock:
+            self._conn.execute("DELETE FROM idempotency_keys WHERE key = ?", (key,))
+
+
+# ──────────────────────────────────────────────
+# FACTORY
+# ──────────────────────────────────────────────
+_store: Optional[IdempotencyStore] = None
+_store_lock = threading.Lock()
+
+
+def get_idempotency_store() -> IdempotencyStore:
+    """Lazy-init the process-wide store. Redis if REDIS_URL is set, otherwise SQLite."""
+    global _store
+    if _store is not None:
+        return _store
+
+    with _store_lock:
+        if _store is not None:
+            return _store
+
+        redis_url = os.getenv("REDIS_URL", "")
+        if redis_url:
+            try:
+                _store = RedisIdempotencyStore(redis_url)
+                logger.info("Idempotency keys stored in Redis")
+                return _store
+            except Exception as e:
+                logger.error(f"Failed to init Redis idempotency store, falling back to SQLite: {e}")
+
+        _store = SQLiteIdempotencyStore(IDEMPOTENCY_DB)
+        logger.info(f"Idempotency keys stored in SQLite ({IDEMPOTENCY_DB})")
+        return _store
@@ -0,0 +1,422 @@
+"""
+Submission Ingestion — the one code path every waitlist/contact entry point uses
+
+The FastAPI service (app/services/google_sheets.py), the Vercel handler
+(api/index.py) and the standalone main.py used to each carry their own header
+list, label dicts (rebuilt on every request) and phone quoting. They now all call
+waitlist_row()/contact_row() here, which read from lookup tables built once at
+import, and hand the row to one or more sinks:
+
+  SheetsSink    — appends to a worksheet; header check once per worksheet per process
+  WriterSink    — app.sheets_writer journal (local store, replicated to Sheets in the background)
+  SQLiteSink    — local table of every submitted row
+  PostgresSink  — same table in Postgres (psycopg2, imported only when used)
+
+Ingestion(batch_size=N) buffers rows and hands each sink N rows at a time.
+The Vercel handler imports this on its cold-start path, so module-level imports are
+kept to what the handler's runtime has loaded anyway (no typing, no logging); sink
+backends import their drivers on first use.
+"""
+from __future__ import annotations
+
+import os
+import json
+import time
+import threading
+from datetime import datetime
+from collections.abc import Callable, Mapping
+
+
+def _warn(message: str):
+    import logging
+    logging.getLogger("ingestion").warning(message)
+
+WAITLIST_SHEET = "Waitlist"
+CONTACT_SHEET = "Contact"
+
+WAITLIST_HEADERS = [
+    "Timestamp",
+    "Full Name",
+    "Email",
+    "Phone",
+    "Role",
+    "Owner Email",
+    "Clinic Name",
+    "Clinic Type",
+    "Other Clinic Type",
+    "Clinic Size",
+    "Number of Doctors",
+    "Number of Locations",
+    "Doctor Emails",
+    "Location Addresses",
+    "Pain Points",
+    "Current Setup",
+    "Impact Level",
+    "Willingness to Pay",
+    "Price Range",
+    "Solution Wins",
+    "Other Wish",
+]
+
+CONTACT_HEADERS = [
+    "Timestamp",
+    "Name",
+    "Email",
+    "Clinic Name",
+    "Role",
+    "Message",
+]
+
+# Header rows pre-shaped for worksheet.update("A1", ...)
+HEADER_ROWS = {
+    WAITLIST_SHEET: [WAITLIST_HEADERS],
+    CONTACT_SHEET: [CONTACT_HEADERS],
+}
+
+
+# ──────────────────────────────────────────────
+# LABEL LOOKUP TABLES (built once at import)
+# ──────────────────────────────────────────────
+ROLE_LABELS = {
+    "owner": "Clinic Owner",
+    "admin": "Administrative Assistant",
+    "practice-manager": "Practice Manager",
+    "operations-manager": "Operations Manager",
+    "cto": "CTO / IT Director",
+}
+
+CLINIC_TYPE_LABELS = {
+    "primary-care": "Primary care",
+    "specialty": "Specialty clinic",
+    "dental": "Dental",
+    "physical-therapy": "Physical therapy",
+    "mental-health": "Mental health",
+    "other": "Other",
+}
+
+CLINIC_SIZE_LABELS = {
+    "solo": "Solo provider",
+    "2-5": "2 to 5",
+    "6-10": "6 to 10",
+    "10plus": "10+",
+}
+
+PAIN_POINT_LABELS = {
+    "no-shows": "No-shows or last-minute cancellations",
+    "phone-calls": "Too many phone calls",
+    "manual-scheduling": "Manual scheduling or rescheduling",
+    "intake-forms": "Chasing intake forms",
+    "admin-burnout": "Admin burnout",
+    "doctor-admin": "Doctors spending time on admin work",
+    "follow-ups": "Follow-ups slipping through the cracks",
+}
+
+CURRENT_SETUP_LABELS = {
+    "front-desk": "Front desk + phone calls",
+    "simple-tool": "Simple scheduling tool",
+    "ehr": "EHR scheduling",
+    "mix": "Mix of tools",
+    "messy": "Not sure / messy setup",
+}
+
+IMPACT_LEVEL_LABELS = {
+    "not-big": "Not a big issue",
+    "somewhat": "Somewhat painful",
+    "frustrating": "Actively frustrating",
+    "hurting": "Hurting revenue or staff morale",
+}
+
+WILLINGNESS_LABELS = {
+    "yes": "Yes, definitely",
+    "possibly": "Possibly, depending on price",
+    "not-now": "Not right now",
+    "exploring": "Just exploring",
+}
+
+SOLUTION_WIN_LABELS = {
+    "fewer-no-shows": "Fewer no-shows",
+    "less-admin": "Less admin work for staff",
+    "prepared-visits": "Doctors starting visits more prepared",
+    "better-followups": "Better follow-ups",
+    "fewer-missed-calls": "Fewer missed calls",
+    "visibility": "Clear visibility into clinic performance",
+}
+
+
+def _label(table: dict, value) -> str:
+    return table.get(value, value) if value else ""
+
+
+def _label_list(table: dict, values) -> str:
+    if not values:
+        return ""
+    if isinstance(values, str):
+        return values
+    return ", ".join([table.get(v, v) for v in values])
+
+
+def quote_phone(phone) -> str:
+    """Prefix with ' so Sheets keeps the number as text (the quote is invisible in the cell)."""
+    return f"'{phone}" if phone else ""
+
+
+def now_timestamp() -> str:
+    return datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+
+
+# ──────────────────────────────────────────────
+# ROW BUILDERS
+# ──────────────────────────────────────────────
+def waitlist_row(data: Mapping[str, object], timestamp: str | None = None) -> list:
+    """Sheet row for a waitlist submission (plain dict, e.g. a request body or model_dump())."""
+    get = data.get
+    return [
+        timestamp or now_timestamp(),
+        get("fullName") or "",
+        get("email") or "",
+        quote_phone(get("phone")),
+        _label(ROLE_LABELS, get("role")),
+        get("ownerEmail") or "",
+        get("clinicName") or "",
+        _label(CLINIC_TYPE_LABELS, get("clinicType")),
+        get("otherClinicType") or "",
+        _label(CLINIC_SIZE_LABELS, get("clinicSize")),
+        get("numberOfDoctors") or "",
+        get("numberOfLocations") or "",
+        get("doctorEmails") or "",
+        get("locationAddresses") or "",
+        _label_list(PAIN_POINT_LABELS, get("painPoints")),
+        _label(CURRENT_SETUP_LABELS, get("currentSetup")),
+        _label(IMPACT_LEVEL_LABELS, get("impactLevel")),
+        _label(WILLINGNESS_LABELS, get("willingnessToPay")),
+        get("priceRange") or "",
+        _label_list(SOLUTION_WIN_LABELS, get("solutionWins")),
+        get("otherWish") or "",
+    ]
+
+
+def contact_row(data: Mapping[str, object], timestamp: str | None = None) -> list:
+    """Sheet row for a contact form submission."""
+    get = data.get
+    return [
+        timestamp or now_timestamp(),
+        get("name") or "",
+        get("email") or "",
+        get("clinicName") or "",
+        _label(ROLE_LABELS, get("role")),
+        get("message") or "",
+    ]
+
+
+ROW_BUILDERS: dict[str, Callable[..., list]] = {
+    WAITLIST_SHEET: waitlist_row,
+    CONTACT_SHEET: contact_row,
+}
+
+
+# ──────────────────────────────────────────────
+# SINKS
+# ──────────────────────────────────────────────
+class Sink:
+    """Destination for built rows. write() receives every row for one sheet in one call."""
+
+    def write(self, sheet: str, rows: list[list]):
+        raise NotImplementedError
+
+
+class SheetsSink(Sink):
+    """Direct append_rows; the worksheet handle and header check are cached per process."""
+
+    def __init__(
+        self,
+        get_spreadsheet: Callable[[], object],
+        sizes: dict[str, tuple[int, int]] | None = None,
+        text_columns: dict[str, list[str]] | None = None,
+    ):
+        self._get_spreadsheet = get_spreadsheet
+        self._sizes = sizes or {WAITLIST_SHEET: (1000, 20), CONTACT_SHEET: (1000, 10)}
+        self._text_columns = text_columns or {}  # e.g. {"Waitlist": ["D:D"]} for phone numbers
+        self._worksheets: dict[str, object] = {}
+        self._lock = threading.Lock()
+
+    def worksheet(self, sheet: str):
+        worksheet = self._worksheets.get(sheet)
+        if worksheet is not None:
+            return worksheet
+
+        import gspread
+
+        with self._lock:
+            spreadsheet = self._get_spreadsheet()
+            if spreadsheet is None:
+                raise RuntimeError("Google Sheets is not configured")
+            try:
+                worksheet = spreadsheet.worksheet(sheet)
+            except gspread.WorksheetNotFound:
+                rows, cols = self._sizes.get(sheet, (1000, 20))
+                worksheet = spreadsheet.add_worksheet(title=sheet, rows=rows, cols=cols)
+
+            header_row = HEADER_ROWS[sheet]
+            try:
+                existing = worksheet.row_values(1)
+                if not existing or existing != header_row[0]:
+                    worksheet.update("A1", header_row)
+            except Exception as e:
+                _warn(f"Could not check headers on '{sheet}': {e}")
+                worksheet.update("A1", header_row)
+            for column_range in self._text_columns.get(sheet, []):
+                try:
+                    worksheet.format(column_range, {"numberFormat": {"type": "TEXT"}})
+                except Exception as e:
+                    _warn(f"Could not format {sheet}!{column_range} as text: {e}")
+            self._worksheets[sheet] = worksheet
+        return worksheet
+
+    def reset(self):
+        """Forget cached worksheets (after an error, or when the client is rebuilt)."""
+        self._worksheets.clear()
+
+    def write(self, sheet: str, rows: list[list]):
+        try:
+            self.worksheet(sheet).append_rows(rows, value_input_option="USER_ENTERED")
+        except Exception:
+            self.reset()
+            raise
+
+
+class WriterSink(Sink):
+    """Hands rows to a SheetsWriter (journaled write-behind, batched append_rows)."""
+
+    def __init__(self, writer):
+        self.writer = writer
+
+    def write(self, sheet: str, rows: list[list]):
+        for row in rows:
+            self.writer.enqueue(sheet, row)
+
+
+class SQLiteSink(Sink):
+    """Every submitted row in a local SQLite table (WAL)."""
+
+    def __init__(self, path: str):
+        import sqlite3
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=FULL")
+        self._conn.executescript("""
+            CREATE TABLE IF NOT EXISTS submissions (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                sheet TEXT NOT NULL,
+                row TEXT NOT NULL,
+                created_at REAL NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS idx_submissions_sheet ON submissions (sheet, id);
+        """)
+
+    def write(self, sheet: str, rows: list[list]):
+        now = time.time()
+        with self._lock:
+            # One transaction (one fsync) per batch rather than per row
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                self._conn.executemany(
+                    "INSERT INTO submissions (sheet, row, created_at) VALUES (?, ?, ?)",
+                    [(sheet, json.dumps(row), now) for row in rows],
+                )
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+
+
+class PostgresSink(Sink):
+    """Every submitted row in a Postgres table (e.g. the dashboard database)."""
+
+    def __init__(self, dsn: str):
+        import psycopg2
+
+        self._lock = threading.Lock()
+        self._conn = psycopg2.connect(dsn)
+        self._conn.autocommit = True
+        with self._conn.cursor() as cur:
+            cur.execute("""
+                CREATE TABLE IF NOT EXISTS waitlist_submissions (
+                    id BIGSERIAL PRIMARY KEY,
+                    sheet TEXT NOT NULL,
+                    row JSONB NOT NULL,
+                    created_at TIMESTAMPTZ NOT NULL DEFAULT now()
+                )
+            """)
+
+    def write(self, sheet: str, rows: list[list]):
+        from psycopg2.extras import execute_values
+
+        with self._lock, self._conn.cursor() as cur:
+            execute_values(
+                cur,
+                "INSERT INTO waitlist_submissions (sheet, row) VALUES %s",
+                [(sheet, json.dumps(row)) for row in rows],
+            )
+
+
+def sinks_from_env(primary: Sink) -> list[Sink]:
+    """
+    `primary` plus any extra sinks named in INGESTION_EXTRA_SINKS (comma-separated: sqlite,
+    postgres). The FastAPI service's primary sink already keeps every row in SUBMISSIONS_DB,
+    so "sqlite" is only useful for a second local copy (INGESTION_SQLITE_DB).
+    """
+    sinks = [primary]
+    for name in filter(None, (s.strip() for s in os.getenv("INGESTION_EXTRA_SINKS", "").split(","))):
+        if name == "sqlite":
+            sinks.append(SQLiteSink(os.getenv("INGESTION_SQLITE_DB", "ingestion_copy.db")))
+        elif name == "postgres":
+            sinks.append(PostgresSink(os.getenv("SUBMISSIONS_DATABASE_URL", "")))
+        else:
+            _warn(f"Unknown ingestion sink '{name}' — ignored")
+    return sinks
+
+
+# ──────────────────────────────────────────────
+# PIPELINE
+# ──────────────────────────────────────────────
+class Ingestion:
+    """
+    Builds rows and fans them out to sinks. With batch_size > 1 rows are buffered
+    per sheet and each sink gets one write() per batch; call flush() to drain.
+    """
+
+    def __init__(self, *sinks: Sink, batch_size: int = 1):
+        self.sinks = list(sinks)
+        self.batch_size = max(1, batch_size)
+        self._buffers: dict[str, list[list]] = {}
+        self._lock = threading.Lock()
+
+    def submit(self, sheet: str, data: Mapping[str, object]) -> list:
+        row = ROW_BUILDERS[sheet](data)
+        with self._lock:
+            buffer = self._buffers.setdefault(sheet, [])
+            buffer.append(row)
+            if len(buffer) < self.batch_size:
+                return row
+            self._buffers[sheet] = []
+        self._write(sheet, buffer)
+        return row
+
+    def submit_waitlist(self, data: Mapping[str, object]) -> list:
+        return self.submit(WAITLIST_SHEET, data)
+
+    def submit_contact(self, data: Mapping[str, object]) -> list:
+        return self.submit(CONTACT_SHEET, data)
+
+    def flush(self):
+        with self._lock:
+            buffers, self._buffers = self._buffers, {}
+        for sheet, rows in buffers.items():
+            if rows:
+                self._write(sheet, rows)
+
+    def _write(self, sheet: str, rows: list[list]):
+        for sink in self.sinks:
+            sink.write(sheet, rows)
@@ -1,11 +1,16 @@
-from fastapi import FastAPI, HTTPException
+from typing import Optional
+
+from fastapi import BackgroundTasks, FastAPI, Header, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
+import asyncio
 import os
 
 from app.config import settings
 from app.schemas import WaitlistSubmission, WaitlistResponse, ContactSubmission, ContactResponse
 from app.services import get_google_sheets_service
 from app.services.google_sheets import send_waitlist_welcome_email
+from app.blocking_io import SMTP_SEND_TIMEOUT_SECONDS, run_blocking
+from app.idempotency import DONE, get_idempotency_store, idempotency_key, normalize_email
 
 # Create FastAPI app (lifespan disabled for serverless via Mangum)
 app = FastAPI(
@@ -54,42 +59,54 @@ async def health_check():
 
 
 @app.post("/api/waitlist", response_model=WaitlistResponse)
-async def submit_waitlist(submission: WaitlistSubmission):
+async def submit_waitlist(
+    submission: WaitlistSubmission,
+    background_tasks: BackgroundTasks,
+    idempotency_key_header: Optional[str] = Header(None, alias="Idempotency-Key"),
+):
     """
     Submit a new waitlist entry.
-    Saves the submission to Google Sheets with timestamp.
+    Stores the submission locally and acknowledges it; replication to Google Sheets
+    and the welcome email happen after the response. Repeats (same Idempotency-Key,
+    or the same email and answers without one) get the first response back and do
+    nothing else; a corrected resubmission is a new submission.
     """
+    key = idempotency_key_header and idempotency_key("web:waitlist:key", idempotency_key_header)
+    key = key or idempotency_key(
+        "web:waitlist:email",
+        normalize_email(submission.email),
+        submission.model_dump_json(exclude={"email"}),
+    )
+    previous = await _claim_submission(key)
+    if previous is not None:
+        return WaitlistResponse(**previous)
+
     try:
-        # Initialize service on each request for serverless compatibility
+        # Cheap after the first request: opens the local store, not Google
         sheets_service = get_google_sheets_service()
-        
-        # Check if Google Sheets is configured
-        if sheets_service.client is None or sheets_service.spreadsheet is None:
-            # Return success but log that Google Sheets is not configured
-            print(f"Warning: Waitlist submission received but Google Sheets not configured. Submission: {submission.email}")
-            return WaitlistResponse(
-                success=True,
-                message="Successfully received submission (Google Sheets not configured)"
-            )
-        
         await sheets_service.add_waitlist_submission(submission)
 
-        # Send waitlist welcome email
+        # Send waitlist welcome email once the response is out
         if submission.email:
-            try:
-                send_waitlist_welcome_email(
-                    full_name=submission.fullName,
-                    email=submission.email,
-                    clinic_name=submission.clinicName,
-                )
-            except Exception as e:
-                print(f"Warning: Failed to send waitlist welcome email: {e}")
-
-        return WaitlistResponse(
-            success=True,
-            message="Successfully added to waitlist"
-        )
+            background_tasks.add_task(
+                _send_welcome_email, submission.fullName, submission.email, submission.clinicName
+            )
+
+        if not sheets_service.configured:
+            print(f"Warning: Waitlist submission stored but Google Sheets not configured. Submission: {submission.email}")
+            response = WaitlistResponse(
+                success=True,
+                message="Successfully received submission (Google Sheets not configured)"
+            )
+        else:
+            response = WaitlistResponse(
+                success=True,
+                message="Successfully added to waitlist"
+            )
+        await asyncio.to_thread(get_idempotency_store().complete, key, response.model_dump())
+        return response
     except Exception as e:
+        await asyncio.to_thread(get_idempotency_store().release, key)
         print(f"Error processing waitlist submission: {e}")
         import traceback
         traceback.print_exc()
@@ -100,30 +117,40 @@ async def submit_waitlist(submission: WaitlistSubmission):
 
 
 @app.post("/api/contact", response_model=ContactResponse)
-async def submit_contact(submission: ContactSubmission):
+async def submit_contact(
+    submission: ContactSubmission,
+    idempotency_key_header: Optional[str] = Header(None, alias="Idempotency-Key"),
+):
     """
     Submit a contact form entry.
-    Saves the submission to Google Sheets with timestamp.
+    Stores the submission locally; it is replicated to Google Sheets in the background.
+    Repeats (same Idempotency-Key, or same email and message) are answered from the first.
     """
+    key = idempotency_key_header and idempotency_key("web:contact:key", idempotency_key_header)
+    key = key or idempotency_key("web:contact:email", normalize_email(submission.email), submission.message or "")
+    previous = await _claim_submission(key)
+    if previous is not None:
+        return ContactResponse(**previous)
+
     try:
-        # Initialize service on each request for serverless compatibility
         sheets_service = get_google_sheets_service()
-        
-        # Check if Google Sheets is configured
-        if sheets_service.client is None or sheets_service.spreadsheet is None:
-            print(f"Warning: Contact submission received but Google Sheets not configured. Submission: {submission.email}")
-            return ContactResponse(
+        await sheets_service.add_contact_submission(submission)
+
+        if not sheets_service.configured:
+            print(f"Warning: Contact submission stored but Google Sheets not configured. Submission: {submission.email}")
+            response = ContactResponse(
                 success=True,
                 message="Successfully received contact submission (Google Sheets not configured)"
             )
-        
-        await sheets_service.add_contact_submission(submission)
-        
-        return ContactResponse(
-            success=True,
-            message="Successfully submitted contact form"
-        )
+        else:
+            response = ContactResponse(
+                success=True,
+                message="Successfully submitted contact form"
+            )
+        await asyncio.to_thread(get_idempotency_store().complete, key, response.model_dump())
+        return response
     except Exception as e:
+        await asyncio.to_thread(get_idempotency_store().release, key)
         print(f"Error processing contact submission: {e}")
         import traceback
         traceback.print_exc()
@@ -133,6 +160,31 @@ async def submit_contact(submission: ContactSubmission):
         )
 
 
+async def _claim_submission(key: str) -> Optional[dict]:
+    """None if this request owns `key`; the stored response if it already completed."""
+    # Redis round trip or SQLite write — keep it off the event loop
+    existing = await asyncio.to_thread(get_idempotency_store().claim, key)
+    if existing is None:
+        return None
+    if existing["state"] == DONE:
+        print("Duplicate submission — returning the original response")
+        return existing["result"]
+    raise HTTPException(status_code=409, detail="This submission is already being processed")
+
+
+async def _send_welcome_email(full_name: str, email: str, clinic_name: str):
+    try:
+        await run_blocking(
+            send_waitlist_welcome_email,
+            full_name=full_name,
+            email=email,
+            clinic_name=clinic_name,
+            timeout=SMTP_SEND_TIMEOUT_SECONDS,
+        )
+    except Exception as e:
+        print(f"Warning: Failed to send waitlist welcome email: {e}")
+
+
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run(app, host="0.0.0.0", port=8001)
@@ -0,0 +1,394 @@
+"""
+Sheets Write-Behind — batches Google Sheets row appends through a local journal
+
+Every submission used to cost 3-4 Sheets API calls (header read, header update,
+column format, append_row) against a per-minute quota. Rows are now written to a
+SQLite journal first and flushed with one append_rows per worksheet when
+SHEETS_BATCH_SIZE rows are pending or every SHEETS_FLUSH_INTERVAL_SECONDS.
+Header checks (and any column formatting) run once per worksheet per process.
+
+The journal makes a queued row durable: rows left behind by a crash are flushed
+on the next start. Delivery is at-least-once — a crash between a successful
+append and the journal delete can duplicate a row, never lose one.
+
+Several processes can share one journal (ava_server runs with --workers 2).
+Each flush first claims its batch in a single SQLite write transaction
+(claimed_by / claimed_at) and appends only the rows it claimed, so concurrent
+flushers never send the same row. A claim left by a process that died mid-append
+expires after SHEETS_CLAIM_TIMEOUT_SECONDS and the rows are picked up again.
+
+A writer created with retain=True keeps every row after it is appended (marked
+with replicated_at) instead of deleting it, so the journal doubles as the local
+system of record that scripts/reconcile_submissions.py diffs against the sheet.
+Failed flushes are retried by the background thread with exponential backoff.
+
+On serverless hosts (VERCEL set) there is no background thread to rely on, so
+write-behind defaults to off: enqueue() journals the row and flushes immediately.
+A failed immediate flush is logged, not raised — the row is already journaled.
+"""
+from __future__ import annotations
+
+import os
+import re
+import json
+import time
+import uuid
+import atexit
+import sqlite3
+import logging
+import threading
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Any, Callable, Optional
+
+logger = logging.getLogger("sheets.writer")
+
+_ON_SERVERLESS = bool(os.getenv("VERCEL"))
+
+SHEETS_WRITE_BEHIND = os.getenv("SHEETS_WRITE_BEHIND", "0" if _ON_SERVERLESS else "1") == "1"
+SHEETS_BATCH_SIZE = int(os.getenv("SHEETS_BATCH_SIZE", "20"))
+SHEETS_FLUSH_INTERVAL_SECONDS = float(os.getenv("SHEETS_FLUSH_INTERVAL_SECONDS", "5"))
+SHEETS_JOURNAL_DB = os.getenv(
+    "SHEETS_JOURNAL_DB", "/tmp/sheets_journal.db" if _ON_SERVERLESS else "sheets_journal.db"
+)
+# Web waitlist/contact submissions: a retained journal that is the local system of record
+SUBMISSIONS_DB = os.getenv(
+    "SUBMISSIONS_DB", "/tmp/submissions.db" if _ON_SERVERLESS else "submissions.db"
+)
+
+# Max rows sent in a single append_rows call
+MAX_ROWS_PER_APPEND = 500
+
+# How long a flusher's claim on a batch holds before another process may take it
+# over; well beyond one append_rows call, so it only expires for a dead process
+SHEETS_CLAIM_TIMEOUT_SECONDS = float(os.getenv("SHEETS_CLAIM_TIMEOUT_SECONDS", "300"))
+
+# Ceiling for the background flusher's retry delay after consecutive failures
+MAX_RETRY_DELAY_SECONDS = 300
+
+
+def appended_first_row(response: Optional[dict]) -> Optional[int]:
+    """1-based sheet row of the first appended row, from an append response's updatedRange ('Sheet'!A12:J14)."""
+    updated_range = ((response or {}).get("updates") or {}).get("updatedRange", "")
+    match = re.search(r"![A-Z]+(\d+)", updated_range)
+    return int(match.group(1)) if match else None
+
+
+@dataclass
+class WorksheetSpec:
+    """How to create and prepare a worksheet before its first append in this process."""
+    title: str
+    headers: list[str]
+    rows: int = 1000
+    cols: int = 20
+    text_columns: list[str] = field(default_factory=list)  # e.g. ["D:D"] — stop phone numbers turning into numbers
+
+
+class SheetsWriter:
+    """Journaled, batched row appender for the worksheets registered on it."""
+
+    def __init__(
+        self,
+        get_spreadsheet: Callable[[], Any],
+        journal_path: str = SHEETS_JOURNAL_DB,
+        batch_size: int = SHEETS_BATCH_SIZE,
+        flush_interval: float = SHEETS_FLUSH_INTERVAL_SECONDS,
+        write_behind: bool = SHEETS_WRITE_BEHIND,
+        retain: bool = False,
+        claim_timeout: float = SHEETS_CLAIM_TIMEOUT_SECONDS,
+    ):
+        self._get_spreadsheet = get_spreadsheet
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.write_behind = write_behind
+        self.retain = retain
+        self.claim_timeout = claim_timeout
+        self._claim_id = f"{os.getpid()}-{uuid.uuid4().hex[:8]}"  # this writer, among all sharing the journal
+        self._specs: dict[str, WorksheetSpec] = {}
+        self._worksheets: dict[str, Any] = {}  # title -> worksheet whose headers are verified
+        self._listeners: dict[str, list[Callable]] = {}
+
+        self._db_lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._conn = sqlite3.connect(journal_path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=FULL")
+        self._conn.executescript("""
+            CREATE TABLE IF NOT EXISTS sheet_rows (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                worksheet TEXT NOT NULL,
+                row TEXT NOT NULL,
+                created_at REAL NOT NULL,
+                replicated_at REAL,
+                claimed_by TEXT,
+                claimed_at REAL
+            );
+            CREATE INDEX IF NOT EXISTS idx_sheet_rows_worksheet ON sheet_rows (worksheet, id);
+        """)
+        columns = {c[1] for c in self._conn.execute("PRAGMA table_info(sheet_rows)")}
+        if "replicated_at" not in columns:  # journals created before rows could be retained
+            self._conn.execute("ALTER TABLE sheet_rows ADD COLUMN replicated_at REAL")
+        if "claimed_by" not in columns:  # journals created before flushes claimed their rows
+            self._conn.execute("ALTER TABLE sheet_rows ADD COLUMN claimed_by TEXT")
+            self._conn.execute("ALTER TABLE sheet_rows ADD COLUMN claimed_at REAL")
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_sheet_rows_pending ON sheet_rows (worksheet, id) "
+            "WHERE replicated_at IS NULL"
+        )
+
+        self._wake = threading.Event()
+        self._stopped = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def register(self, spec: WorksheetSpec):
+        self._specs[spec.title] = spec
+
+    def on_append(self, worksheet: str, listener: Callable[[list[list], Optional[int]], None]):
+        """Call listener(rows, first_row_number) after each successful batch append to `worksheet`."""
+        self._listeners.setdefault(worksheet, []).append(listener)
+
+    # ──────────────────────────────────────────────
+    # JOURNAL
+    # ──────────────────────────────────────────────
+    def enqueue(self, worksheet: str, row: list) -> int:
+        """Journal one row for `worksheet`; returns the number of rows now pending for it."""
+        if worksheet not in self._specs:
+            raise KeyError(f"Worksheet '{worksheet}' is not registered with this writer")
+        with self._db_lock:
+            self._conn.execute(
+                "INSERT INTO sheet_rows (worksheet, row, created_at) VALUES (?, ?, ?)",
+                (worksheet, json.dumps(row), time.time()),
+            )
+            pending = self._conn.execute(
+                "SELECT COUNT(*) FROM sheet_rows WHERE worksheet = ? AND replicated_at IS NULL", (worksheet,)
+            ).fetchone()[0]
+
+        if not self.write_behind:
+            try:
+                pending -= self.flush(worksheet)
+            except Exception as e:
+                logger.warning(f"Sheets flush failed, '{worksheet}' row stays journaled for the next attempt: {e}")
+        else:
+            self._ensure_thread()
+            if pending >= self.batch_size:
+                self._wake.set()
+        return pending
+
+    def pending(self, worksheet: str) -> list[list]:
+        """Rows journaled for `worksheet` but not yet confirmed written, oldest first."""
+        with self._db_lock:
+            rows = self._conn.execute(
+                "SELECT row FROM sheet_rows WHERE worksheet = ? AND replicated_at IS NULL ORDER BY id",
+                (worksheet,),
+            ).fetchall()
+        return [json.loads(r[0]) for r in rows]
+
+    def rows(self, worksheet: str) -> list[tuple[int, list, Optional[float]]]:
+        """Every journaled row for `worksheet` as (id, row, replicated_at), oldest first."""
+        with self._db_lock:
+            rows = self._conn.execute(
+                "SELECT id, row, replicated_at FROM sheet_rows WHERE worksheet = ? ORDER BY id",
+                (worksheet,),
+            ).fetchall()
+        return [(r[0], json.loads(r[1]), r[2]) for r in rows]
+
+    def requeue(self, ids: list[int]):
+        """Mark retained rows as not yet replicated so the next flush appends them again."""
+        with self._db_lock, self._transaction():
+            self._conn.executemany(
+                "UPDATE sheet_rows SET replicated_at = NULL, claimed_by = NULL WHERE id = ?", [(i,) for i in ids]
+            )
+
+    @contextmanager
+    def _transaction(self):
+        """One commit (one fsync) for a multi-row statement; caller holds _db_lock."""
+        self._conn.execute("BEGIN IMMEDIATE")
+        try:
+            yield
+        except Exception:
+            self._conn.execute("ROLLBACK")
+            raise
+        self._conn.execute("COMMIT")
+
+    # ──────────────────────────────────────────────
+    # FLUSHING
+    # ──────────────────────────────────────────────
+    def worksheet(self, title: str):
+        """Open (or create) the worksheet and verify headers — once per process."""
+        worksheet = self._worksheets.get(title)
+        if worksheet is not None:
+            return worksheet
+
+        import gspread
+
+        spec = self._specs[title]
+        spreadsheet = self._get_spreadsheet()
+        if spreadsheet is None:
+            raise RuntimeError("Google Sheets is not configured")
+        try:
+            worksheet = spreadsheet.worksheet(title)
+        except gspread.WorksheetNotFound:
+            worksheet = spreadsheet.add_worksheet(title=title, rows=spec.rows, cols=spec.cols)
+
+        try:
+            existing = worksheet.row_values(1)
+            if not existing or existing != spec.headers:
+                worksheet.update("A1", [spec.headers])
+        except Exception:
+            worksheet.update("A1", [spec.headers])
+        for column_range in spec.text_columns:
+            try:
+                worksheet.format(column_range, {"numberFormat": {"type": "TEXT"}})
+            except Exception as e:
+                logger.warning(f"Could not format {title}!{column_range} as text: {e}")
+
+        self._worksheets[title] = worksheet
+        return worksheet
+
+    @contextmanager
+    def paused(self):
+        """Hold off flushes (e.g. while rebuilding state derived from the sheet's current rows)."""
+        with self._flush_lock:
+            yield
+
+    def flush(self, worksheet: Optional[str] = None) -> int:
+        """Append all pending rows (for one worksheet, or all registered ones). Returns rows written."""
+        titles = [worksheet] if worksheet else list(self._specs)
+        written = 0
+        with self._flush_lock:
+            for title in titles:
+                written += self._flush_worksheet(title)
+        return written
+
+    def _claim(self, title: str) -> list[tuple[int, str]]:
+        """Claim the next batch of unclaimed (or expired-claim) pending rows for this writer.
+
+        BEGIN IMMEDIATE takes SQLite's write lock, so two processes can't claim the same row.
+        """
+        now = time.time()
+        with self._db_lock, self._transaction():
+            self._conn.execute(
+                "UPDATE sheet_rows SET claimed_by = ?, claimed_at = ? WHERE id IN ("
+                "  SELECT id FROM sheet_rows WHERE worksheet = ? AND replicated_at IS NULL"
+                "  AND (claimed_by IS NULL OR claimed_by = ? OR claimed_at < ?)"
+                "  ORDER BY id LIMIT ?)",
+                (self._claim_id, now, title, self._claim_id, now - self.claim_timeout, MAX_ROWS_PER_APPEND),
+            )
+            return self._conn.execute(
+                "SELECT id, row FROM sheet_rows WHERE worksheet = ? AND replicated_at IS NULL "
+                "AND claimed_by = ? ORDER BY id",
+                (title, self._claim_id),
+            ).fetchall()
+
+    def _release(self, ids: list[tuple[int]]):
+        """Give up a claim after a failed append so any process can retry the rows."""
+        with self._db_lock, self._transaction():
+            self._conn.executemany(
+                "UPDATE sheet_rows SET claimed_by = NULL WHERE id = ? AND claimed_by = ?",
+                [(i, self._claim_id) for (i,) in ids],
+            )
+
+    def _flush_worksheet(self, title: str) -> int:
+        written = 0
+        while True:
+            batch = self._claim(title)
+            if not batch:
+                return written
+
+            rows = [json.loads(r[1]) for r in batch]
+            ids = [(r[0],) for r in batch]
+            try:
+                ws = self.worksheet(title)
+                response = ws.append_rows(rows, value_input_option="USER_ENTERED")
+            except Exception:
+                # Drop the cached handle so the next attempt re-opens and re-checks the sheet
+                self._worksheets.pop(title, None)
+                try:
+                    self._release(ids)
+                except Exception as e:
+                    logger.warning(f"Could not release claimed '{title}' rows, they wait out the claim: {e}")
+                raise
+
+            with self._db_lock, self._transaction():
+                if self.retain:
+                    now = time.time()
+                    self._conn.executemany(
+                        "UPDATE sheet_rows SET replicated_at = ?, claimed_by = NULL WHERE id = ?",
+                        [(now, i) for (i,) in ids],
+                    )
+                else:
+                    self._conn.executemany("DELETE FROM sheet_rows WHERE id = ?", ids)
+            written += len(rows)
+            logger.info(f"Flushed {len(rows)} rows to '{title}' in one append")
+
+            first_row = appended_first_row(response)
+            for listener in self._listeners.get(title, []):
+                try:
+                    listener(rows, first_row)
+                except Exception as e:
+                    logger.warning(f"Append listener for '{title}' failed: {e}")
+
+    # ──────────────────────────────────────────────
+    # BACKGROUND FLUSHER
+    # ──────────────────────────────────────────────
+    def _ensure_thread(self):
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stopped.clear()
+        self._thread = threading.Thread(target=self._run, name="sheets-writer", daemon=True)
+        self._thread.start()
+
+    def _run(self):
+        delay = self.flush_interval
+        while not self._stopped.is_set():
+            self._wake.wait(timeout=delay)
+            self._wake.clear()
+            try:
+                self.flush()
+                delay = self.flush_interval
+            except Exception as e:
+                delay = min(delay * 2, MAX_RETRY_DELAY_SECONDS)
+                logger.warning(f"Sheets flush failed, rows stay journaled; retrying in {delay:.0f}s: {e}")
+
+    def start(self):
+        """Start the background flusher; the first pass writes rows left over from a previous run."""
+        if self.write_behind:
+            self._ensure_thread()
+            self._wake.set()
+
+    def close(self):
+        """Stop the flusher and make a final attempt to write everything pending."""
+        self._stopped.set()
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join(timeout=self.flush_interval + 1)
+            self._thread = None
+        try:
+            self.flush()
+        except Exception as e:
+            logger.warning(f"Final Sheets flush failed, rows stay journaled: {e}")
+
+
+_writers: list[SheetsWriter] = []
+
+
+def create_writer(get_spreadsheet: Callable[[], Any], *specs: WorksheetSpec, **kwargs) -> SheetsWriter:
+    """Build a writer for `specs`; it is flushed at interpreter exit."""
+    writer = SheetsWriter(get_spreadsheet, **kwargs)
+    for spec in specs:
+        writer.register(spec)
+    _writers.append(writer)
+    return writer
+
+
+def start_writers():
+    for writer in _writers:
+        writer.start()
+
+
+def close_writers():
+    for writer in _writers:
+        writer.close()
+
+
+atexit.register(close_writers)
@@ -0,0 +1,96 @@
+"""
+Step Timing — per-step latency histograms for multi-step request handlers
+
+submit_to_waitlist fans out to Cal.com, the Sheets journal and SMTP; a single
+end-to-end number doesn't say which one a slow call was waiting on. Each step is
+recorded into a fixed-bucket histogram and the histograms are logged every
+STEP_TIMING_LOG_EVERY samples of a step (and on shutdown via log_histograms()).
+"""
+from __future__ import annotations
+
+import os
+import time
+import bisect
+import logging
+import threading
+from typing import Awaitable, TypeVar
+
+logger = logging.getLogger("timing")
+
+STEP_TIMING_LOG_EVERY = int(os.getenv("STEP_TIMING_LOG_EVERY", "50"))
+
+# Upper bounds in ms; the last bucket catches everything slower
+BUCKET_BOUNDS_MS = (50, 100, 250, 500, 1000, 2500, 5000, 10000, 20000)
+
+T = TypeVar("T")
+
+
+class StepHistogram:
+    def __init__(self):
+        self.counts = [0] * (len(BUCKET_BOUNDS_MS) + 1)
+        self.samples = 0
+        self.errors = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+
+    def add(self, ms: float, ok: bool = True):
+        self.counts[bisect.bisect_left(BUCKET_BOUNDS_MS, ms)] += 1
+        self.samples += 1
+        self.errors += 0 if ok else 1
+        self.total_ms += ms
+        self.max_ms = max(self.max_ms, ms)
+
+    def percentile(self, p: float) -> str:
+        """Bucket that `p` (0-1) of samples fall into, e.g. '<=250ms'."""
+        target = p * self.samples
+        seen = 0
+        for i, count in enumerate(self.counts):
+            seen += count
+            if count and seen >= target:
+                return _bucket_label(i)
+        return "-"
+
+    def summary(self) -> str:
+        buckets = " ".join(f"{_bucket_label(i)}:{c}" for i, c in enumerate(self.counts) if c)
+        mean = self.total_ms / self.samples if self.samples else 0.0
+        return (
+            f"n={self.samples} err={self.errors} mean={mean:.0f}ms p50{self.percentile(0.5)} "
+            f"p95{self.percentile(0.95)} max={self.max_ms:.0f}ms [{buckets}]"
+        )
+
+
+def _bucket_label(i: int) -> str:
+    return f"<={BUCKET_BOUNDS_MS[i]}ms" if i < len(BUCKET_BOUNDS_MS) else f">{BUCKET_BOUNDS_MS[-1]}ms"
+
+
+_histograms: dict[str, StepHistogram] = {}
+_lock = threading.Lock()
+
+
+def record(step: str, seconds: float, ok: bool = True):
+    with _lock:
+        histogram = _histograms.setdefault(step, StepHistogram())
+        histogram.add(seconds * 1000, ok)
+        due = STEP_TIMING_LOG_EVERY > 0 and histogram.samples % STEP_TIMING_LOG_EVERY == 0
+        line = histogram.summary() if due else ""
+    if line:
+        logger.info(f"{step}: {line}")
+
+
+async def timed(step: str, awaitable: Awaitable[T]) -> T:
+    """Await `awaitable`, recording its duration (failures included) under `step`."""
+    started = time.perf_counter()
+    ok = False
+    try:
+        result = await awaitable
+        ok = True
+        return result
+    finally:
+        record(step, time.perf_counter() - started, ok)
+
+
+def log_histograms():
+    with _lock:
+        lines = [f"{step}: {h.summary()}" for step, h in sorted(_histograms.items())]
+    for line in lines:
+        logger.info(line)
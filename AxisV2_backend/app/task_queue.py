@@ -0,0 +1,137 @@
+"""
+Background Task Queue — follow-up work that shouldn't hold up the caller
+
+Confirmation emails (and anything else whose result nobody is waiting on) are
+submitted here instead of being awaited inside the request. A few asyncio workers
+run them — blocking callables through the blocking I/O pool, coroutines directly —
+each with its own timeout, retrying failures with exponential backoff up to
+TASK_MAX_ATTEMPTS.
+
+A blocking task that outlives its timeout is not retried: its thread can't be
+stopped and may still complete (an email that was sent after all), so a retry
+could repeat the side effect. Give such tasks a timeout that covers the whole
+call, not just one socket operation.
+
+The queue is in-memory: tasks still queued at shutdown get TASK_DRAIN_SECONDS to
+finish. Anything that must survive a crash belongs in a journal (see
+app.sheets_writer), not here.
+"""
+from __future__ import annotations
+
+import os
+import time
+import asyncio
+import logging
+from dataclasses import dataclass, field
+from typing import Any, Callable, Optional
+
+from app.blocking_io import BlockingCallTimeout, run_blocking
+from app.step_timing import record
+
+logger = logging.getLogger("tasks")
+
+TASK_QUEUE_WORKERS = int(os.getenv("TASK_QUEUE_WORKERS", "4"))
+TASK_MAX_ATTEMPTS = int(os.getenv("TASK_MAX_ATTEMPTS", "3"))
+TASK_RETRY_BASE_SECONDS = float(os.getenv("TASK_RETRY_BASE_SECONDS", "2"))
+TASK_DRAIN_SECONDS = float(os.getenv("TASK_DRAIN_SECONDS", "10"))
+
+
+@dataclass
+class _Task:
+    name: str
+    fn: Callable
+    args: tuple
+    kwargs: dict
+    timeout: Optional[float]
+    max_attempts: int
+    attempt: int = field(default=0)
+
+
+class TaskQueue:
+    def __init__(self, workers: int = TASK_QUEUE_WORKERS):
+        self.workers = workers
+        self._queue: Optional[asyncio.Queue] = None
+        self._tasks: list[asyncio.Task] = []
+        self._retries: set[asyncio.TimerHandle] = set()
+
+    def submit(
+        self,
+        name: str,
+        fn: Callable,
+        *args: Any,
+        timeout: Optional[float] = None,
+        max_attempts: int = TASK_MAX_ATTEMPTS,
+        **kwargs: Any,
+    ):
+        """Queue fn(*args, **kwargs); must be called from the event loop."""
+        self.start()
+        self._queue.put_nowait(_Task(name, fn, args, kwargs, timeout, max_attempts))
+
+    def start(self):
+        if self._tasks and not all(t.done() for t in self._tasks):
+            return
+        self._queue = self._queue or asyncio.Queue()
+        self._tasks = [asyncio.create_task(self._worker()) for _ in range(self.workers)]
+
+    async def _run(self, task: _Task):
+        if asyncio.iscoroutinefunction(task.fn):
+            await asyncio.wait_for(task.fn(*task.args, **task.kwargs), timeout=task.timeout)
+        else:
+            await run_blocking(task.fn, *task.args, timeout=task.timeout, **task.kwargs)
+
+    async def _worker(self):
+        while True:
+            task = await self._queue.get()
+            task.attempt += 1
+            started = time.perf_counter()
+            try:
+                await self._run(task)
+                record(task.name, time.perf_counter() - started)
+            except asyncio.CancelledError:
+                raise
+            except BlockingCallTimeout as e:
+                record(task.name, time.perf_counter() - started, ok=False)
+                logger.error(f"Task {task.name} abandoned, not retrying in case it still completes: {e}")
+            except Exception as e:
+                record(task.name, time.perf_counter() - started, ok=False)
+                if task.attempt >= task.max_attempts:
+                    logger.error(f"Task {task.name} failed after {task.attempt} attempts: {e}")
+                else:
+                    delay = TASK_RETRY_BASE_SECONDS * 2 ** (task.attempt - 1)
+                    logger.warning(f"Task {task.name} failed (attempt {task.attempt}), retrying in {delay:.1f}s: {e}")
+                    self._schedule_retry(task, delay)
+            finally:
+                self._queue.task_done()
+
+    def _schedule_retry(self, task: _Task, delay: float):
+        def requeue():
+            self._retries.discard(handle)
+            self._queue.put_nowait(task)
+
+        handle = asyncio.get_running_loop().call_later(delay, requeue)
+        self._retries.add(handle)
+
+    async def stop(self, drain_timeout: float = TASK_DRAIN_SECONDS):
+        """Give queued tasks drain_timeout to finish, then cancel the workers."""
+        if self._queue is not None and self._tasks:
+            try:
+                await asyncio.wait_for(self._queue.join(), timeout=drain_timeout)
+            except asyncio.TimeoutError:
+                logger.warning(f"{self._queue.qsize()} background tasks still queued at shutdown")
+        for handle in self._retries:
+            handle.cancel()
+        self._retries.clear()
+        for t in self._tasks:
+            t.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+
+_task_queue: Optional[TaskQueue] = None
+
+
+def get_task_queue() -> TaskQueue:
+    global _task_queue
+    if _task_queue is None:
+        _task_queue = TaskQueue()
+    return _task_queue
@@ -19,7 +19,9 @@ Endpoints:
 """
 
 import os
+import asyncio
 import logging
+from contextlib import asynccontextmanager
 from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
 from dotenv import load_dotenv
@@ -33,8 +35,37 @@ logging.basicConfig(
 )
 logger = logging.getLogger("ava_server")
 
+# ── Lifespan ─────────────────────────────────
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    from app.ava.booked_slots import start_refresher, stop_refresher
+    from app.ava.waitlist_submit import get_sheets_writer
+    from app.blocking_io import shutdown_blocking_pool
+    from app.http_clients import UPSTREAMS, close_http_clients, get_http_client
+    from app.sheets_writer import close_writers
+    from app.step_timing import log_histograms
+    from app.task_queue import get_task_queue
+
+    # Pre-warm the booked-slots cache so the first inbound call never waits on Sheets
+    start_refresher()
+    # Start the write-behind flusher; its first pass replays rows journaled before a crash
+    get_sheets_writer().start()
+    # Workers for confirmation emails and other follow-up work
+    get_task_queue().start()
+    # Pooled clients for ElevenLabs and Cal.com, shared by every request
+    for name in UPSTREAMS:
+        get_http_client(name)
+    yield
+    await stop_refresher()
+    await get_task_queue().stop()
+    await close_http_clients()
+    await asyncio.to_thread(close_writers)
+    shutdown_blocking_pool()
+    log_histograms()
+
+
 # ── App ──────────────────────────────────────
-app = FastAPI(title="Ava AI Server (ElevenLabs)", version="3.0.0")
+app = FastAPI(title="Ava AI Server (ElevenLabs)", version="3.0.0", lifespan=lifespan)
 
 app.add_middleware(
     CORSMiddleware,
@@ -8,7 +8,8 @@ from fastapi.responses import JSONResponse
 from dotenv import load_dotenv
 import os
 import json
-from datetime import datetime
+
+from app.ingestion import Ingestion, SheetsSink
 
 # Load environment variables from .env file
 load_dotenv()
@@ -104,160 +105,8 @@ async def waitlist(request: Request):
         client = gspread.authorize(credentials)
         spreadsheet = client.open_by_key(spreadsheet_id)
 
-        try:
-            worksheet = spreadsheet.worksheet("Waitlist")
-        except gspread.WorksheetNotFound:
-            worksheet = spreadsheet.add_worksheet(title="Waitlist", rows=1000, cols=20)
-
-        # Ensure headers
-        headers = [
-            "Timestamp",
-            "Full Name",
-            "Email",
-            "Phone",
-            "Role",
-            "Owner Email",
-            "Clinic Name",
-            "Clinic Type",
-            "Other Clinic Type",
-            "Clinic Size",
-            "Number of Doctors",
-            "Number of Locations",
-            "Doctor Emails",
-            "Location Addresses",
-            "Pain Points",
-            "Current Setup",
-            "Impact Level",
-            "Willingness to Pay",
-            "Price Range",
-            "Solution Wins",
-            "Other Wish"
-        ]
-        try:
-            existing = worksheet.row_values(1)
-            if not existing or existing != headers:
-                worksheet.update('A1', [headers])
-        except Exception as e:
-            print(f"Warning: Could not update headers: {e}")
-            worksheet.update('A1', [headers])
-
-        timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-
-        # Format phone with single quote prefix to force text format
-        phone_value = data.get('phone', '')
-        if phone_value:
-            phone_value = f"'{phone_value}"
-
-        # Convert lists to readable strings
-        pain_points = data.get('painPoints', [])
-        if isinstance(pain_points, list):
-            pain_labels = {
-                'no-shows': 'No-shows or last-minute cancellations',
-                'phone-calls': 'Too many phone calls',
-                'manual-scheduling': 'Manual scheduling or rescheduling',
-                'intake-forms': 'Chasing intake forms',
-                'admin-burnout': 'Admin burnout',
-                'doctor-admin': 'Doctors spending time on admin work',
-                'follow-ups': 'Follow-ups slipping through the cracks'
-            }
-            pain_points = ", ".join([pain_labels.get(p, p) for p in pain_points])
-
-        solution_wins = data.get('solutionWins', [])
-        if isinstance(solution_wins, list):
-            solution_labels = {
-                'fewer-no-shows': 'Fewer no-shows',
-                'less-admin': 'Less admin work for staff',
-                'prepared-visits': 'Doctors starting visits more prepared',
-                'better-followups': 'Better follow-ups',
-                'fewer-missed-calls': 'Fewer missed calls',
-                'visibility': 'Clear visibility into clinic performance'
-            }
-            solution_wins = ", ".join([solution_labels.get(s, s) for s in solution_wins])
-
-        # Convert clinic type to label
-        clinic_type = data.get('clinicType', '')
-        clinic_type_labels = {
-            'primary-care': 'Primary care',
-            'specialty': 'Specialty clinic',
-            'dental': 'Dental',
-            'physical-therapy': 'Physical therapy',
-            'mental-health': 'Mental health',
-            'other': 'Other'
-        }
-        clinic_type_label = clinic_type_labels.get(clinic_type, clinic_type)
-
-        # Convert clinic size to label
-        clinic_size = data.get('clinicSize', '')
-        clinic_size_labels = {
-            'solo': 'Solo provider',
-            '2-5': '2 to 5',
-            '6-10': '6 to 10',
-            '10plus': '10+'
-        }
-        clinic_size_label = clinic_size_labels.get(clinic_size, clinic_size)
-
-        # Convert role to label
-        role = data.get('role', '')
-        role_labels = {
-            'owner': 'Clinic Owner',
-            'admin': 'Administrative Assistant',
-            'practice-manager': 'Practice Manager',
-            'operations-manager': 'Operations Manager',
-            'cto': 'CTO / IT Director'
-        }
-        role_label = role_labels.get(role, role)
-
-        # Convert other fields to labels
-        current_setup_labels = {
-            'front-desk': 'Front desk + phone calls',
-            'simple-tool': 'Simple scheduling tool',
-            'ehr': 'EHR scheduling',
-            'mix': 'Mix of tools',
-            'messy': 'Not sure / messy setup'
-        }
-        current_setup_label = current_setup_labels.get(data.get('currentSetup', ''), data.get('currentSetup', ''))
-
-        impact_level_labels = {
-            'not-big': 'Not a big issue',
-            'somewhat': 'Somewhat painful',
-            'frustrating': 'Actively frustrating',
-            'hurting': 'Hurting revenue or staff morale'
-        }
-        impact_level_label = impact_level_labels.get(data.get('impactLevel', ''), data.get('impactLevel', ''))
-
-        willingness_labels = {
-            'yes': 'Yes, definitely',
-            'possibly': 'Possibly, depending on price',
-            'not-now': 'Not right now',
-            'exploring': 'Just exploring'
-        }
-        willingness_label = willingness_labels.get(data.get('willingnessToPay', ''), data.get('willingnessToPay', ''))
-
-        row_data = [
-            timestamp,
-            data.get('fullName', ''),
-            data.get('email', ''),
-            phone_value,
-            role_label,
-            data.get('ownerEmail', ''),
-            data.get('clinicName', ''),
-            clinic_type_label,
-            data.get('otherClinicType', ''),
-            clinic_size_label,
-            data.get('numberOfDoctors', ''),
-            data.get('numberOfLocations', ''),
-            data.get('doctorEmails', ''),
-            data.get('locationAddresses', ''),
-            pain_points,
-            current_setup_label,
-            impact_level_label,
-            willingness_label,
-            data.get('priceRange', ''),
-            solution_wins,
-            data.get('otherWish', '')
-        ]
-
-        worksheet.append_row(row_data, value_input_option='USER_ENTERED')
+        # Same labels, header row and phone quoting as app/ and api/index.py
+        Ingestion(SheetsSink(lambda: spreadsheet)).submit_waitlist(data)
 
         print(f"Successfully added waitlist submission for: {data.get('email', 'unknown')}")
         return {"success": True, "message": "Successfully added to waitlist"}
@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+"""
+Cold- and warm-start timings for the Vercel handler in api/index.py.
+
+Each run starts a fresh interpreter (a cold instance), imports the handler module,
+serves one GET and one OPTIONS, then a first POST /api/waitlist (cold: imports
+gspread, authorizes, opens the spreadsheet, checks headers) followed by --warm
+POSTs on the same instance (warm: cached client and worksheet, just the append).
+
+With GOOGLE_* set, POSTs append real rows to the Waitlist sheet — point
+GOOGLE_SHEETS_SPREADSHEET_ID at a scratch spreadsheet. Without them the POST
+returns "config missing" and only the cold-start numbers are meaningful.
+
+Run from AxisV2_backend:
+  python scripts/api_handler_timing.py                                  # this backend
+  python scripts/api_handler_timing.py --handler ../waitlist_backend/api/index.py
+"""
+
+import io
+import os
+import sys
+import json
+import time
+import argparse
+import subprocess
+import importlib.util
+from email.message import Message
+
+DEFAULT_HANDLER = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "api", "index.py")
+
+SAMPLE_SUBMISSION = {
+    "fullName": "Timing Check",
+    "email": "",  # no welcome email
+    "phone": "5550000000",
+    "role": "owner",
+    "clinicName": "Timing Clinic",
+    "clinicType": "other",
+    "clinicSize": "solo",
+    "painPoints": [],
+    "solutionWins": [],
+}
+
+
+def _request(handler_cls, method: str, path: str, body: bytes = b"") -> tuple[int, bytes]:
+    """Drive the BaseHTTPRequestHandler subclass without a socket."""
+    h = handler_cls.__new__(handler_cls)
+    h.command, h.path, h.request_version = method, path, "HTTP/1.1"
+    h.requestline = f"{method} {path} HTTP/1.1"
+    h.client_address = ("127.0.0.1", 0)
+    h.headers = Message()
+    h.headers["Content-Length"] = str(len(body))
+    h.rfile, h.wfile = io.BytesIO(body), io.BytesIO()
+    h.log_message = lambda *args: None
+    getattr(h, f"do_{method}")()
+    raw = h.wfile.getvalue()
+    status = int(raw.split(b" ", 2)[1]) if raw.startswith(b"HTTP/") else 0
+    return status, raw.split(b"\r\n\r\n", 1)[-1]
+
+
+def _ms(started: float) -> float:
+    return (time.perf_counter() - started) * 1000
+
+
+def child(handler_path: str, warm: int):
+    timings = {}
+    started = time.perf_counter()
+    spec = importlib.util.spec_from_file_location("vercel_index", handler_path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    timings["import"] = _ms(started)
+    timings["gspread_loaded_after_import"] = "gspread" in sys.modules
+
+    for method, path in (("GET", "/api/health"), ("OPTIONS", "/api/waitlist")):
+        started = time.perf_counter()
+        _request(module.handler, method, path)
+        timings[f"first {method}"] = _ms(started)
+    timings["gspread_loaded_after_get"] = "gspread" in sys.modules
+
+    body = json.dumps(SAMPLE_SUBMISSION).encode()
+    started = time.perf_counter()
+    status, response = _request(module.handler, "POST", "/api/waitlist", body)
+    timings["cold POST"] = _ms(started)
+    timings["cold POST response"] = f"{status} {response.decode()[:80]}"
+
+    warm_times = []
+    for _ in range(warm):
+        started = time.perf_counter()
+        _request(module.handler, "POST", "/api/waitlist", body)
+        warm_times.append(_ms(started))
+    timings["warm POST avg"] = sum(warm_times) / len(warm_times) if warm_times else 0.0
+    print(json.dumps(timings))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--handler", default=DEFAULT_HANDLER, help="path to a Vercel api/index.py")
+    parser.add_argument("--runs", type=int, default=3, help="cold instances to start")
+    parser.add_argument("--warm", type=int, default=5, help="warm POSTs per instance")
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    handler_path = os.path.abspath(args.handler)
+    if args.child:
+        child(handler_path, args.warm)
+        return
+
+    print(f"Handler: {handler_path}\n")
+    for run in range(1, args.runs + 1):
+        out = subprocess.run(
+            [sys.executable, os.path.abspath(__file__), "--child", "--handler", handler_path, "--warm", str(args.warm)],
+            capture_output=True, text=True,
+        )
+        if out.returncode != 0:
+            print(out.stderr)
+            sys.exit(out.returncode)
+        t = json.loads(out.stdout.strip().splitlines()[-1])
+        print(
+            f"run {run}: import {t['import']:.1f}ms | GET {t['first GET']:.1f}ms | OPTIONS {t['first OPTIONS']:.1f}ms "
+            f"| cold POST {t['cold POST']:.1f}ms | warm POST avg {t['warm POST avg']:.1f}ms "
+            f"| gspread loaded by GET: {t['gspread_loaded_after_get']}"
+        )
+        print(f"        POST -> {t['cold POST response']}")
+
+
+if __name__ == "__main__":
+    main()
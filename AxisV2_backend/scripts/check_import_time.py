@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+Cold-start import budget for the serverless waitlist entry points.
+
+Imports each entry point in a fresh interpreter under `python -X importtime`,
+sums the cumulative time of its top-level imports (best of --runs) — excluding
+modules the platform runtime has already loaded, like http.server for the Vercel
+handler — and fails if
+  - the total is over the entry point's budget, or
+  - a heavy module (gspread, google-auth, httpx, smtplib) was loaded at import —
+    those belong behind the first POST, never on the health-check/preflight path.
+
+Run from AxisV2_backend (exit status 1 on any failure, for CI):
+  python scripts/check_import_time.py
+  python scripts/check_import_time.py --root ../waitlist_backend
+  python scripts/check_import_time.py --scale 2        # slower CI machines
+"""
+
+import os
+import re
+import sys
+import json
+import argparse
+import subprocess
+
+DEFAULT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Must not be imported until a submission actually needs them
+HEAVY_MODULES = ["gspread", "google.auth", "google.oauth2", "httpx", "smtplib"]
+
+# (label, modules the runtime loads before us, import statement run from the backend root, budget in ms)
+ENTRY_POINTS = [
+    (
+        "api/index.py (Vercel handler)",
+        "import http.server, importlib.util",
+        "s = importlib.util.spec_from_file_location('vercel_index', 'api/index.py'); "
+        "s.loader.exec_module(importlib.util.module_from_spec(s))",
+        15,
+    ),
+    ("app.main (FastAPI)", "", "import app.main", 1200),
+]
+
+MARKER = "--- entry point ---"
+
+IMPORTTIME_LINE = re.compile(r"^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|( *)(\S+)")
+
+
+def measure(root: str, preload: str, statement: str) -> tuple[float, list[str]]:
+    """Cumulative top-level import time in ms, and which heavy modules got loaded."""
+    probe = (
+        f"import sys, json\n{preload}\n"
+        f"sys.stderr.write({MARKER!r} + '\\n')\n"
+        f"{statement}\n"
+        f"print(json.dumps([m for m in {HEAVY_MODULES!r} if m in sys.modules]))\n"
+    )
+    out = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", probe],
+        cwd=root, capture_output=True, text=True,
+        env={**os.environ, "PYTHONDONTWRITEBYTECODE": "1"},
+    )
+    if out.returncode != 0:
+        raise RuntimeError(out.stderr.strip().splitlines()[-1] if out.stderr.strip() else "import failed")
+
+    total_us = 0
+    entry_lines = out.stderr.split(MARKER, 1)[-1]
+    for line in entry_lines.splitlines():
+        match = IMPORTTIME_LINE.match(line)
+        if match and len(match.group(3)) == 1:  # nested imports are indented further
+            total_us += int(match.group(2))
+    return total_us / 1000, json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--root", default=DEFAULT_ROOT, help="backend directory (AxisV2_backend or waitlist_backend)")
+    parser.add_argument("--runs", type=int, default=3, help="fresh interpreters per entry point (best is kept)")
+    parser.add_argument("--scale", type=float, default=1.0, help="multiply every budget")
+    args = parser.parse_args()
+
+    root = os.path.abspath(args.root)
+    print(f"Import budget check for {root}\n")
+    failed = False
+    for label, preload, statement, budget_ms in ENTRY_POINTS:
+        budget = budget_ms * args.scale
+        try:
+            results = [measure(root, preload, statement) for _ in range(args.runs)]
+        except RuntimeError as e:
+            print(f"FAIL  {label}: could not import — {e}")
+            failed = True
+            continue
+        best = min(ms for ms, _ in results)
+        heavy = sorted({m for _, loaded in results for m in loaded})
+        ok = best <= budget and not heavy
+        failed |= not ok
+        print(f"{'ok  ' if ok else 'FAIL'}  {label}: {best:.1f}ms (budget {budget:.0f}ms)")
+        if heavy:
+            print(f"      loaded at import: {', '.join(heavy)}")
+
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,169 @@
+#!/usr/bin/env python3
+"""
+Per-call httpx.AsyncClient against the shared clients from app/http_clients.py.
+
+Starts a local HTTPS stand-in (self-signed cert from the openssl CLI, keep-alive
+HTTP/1.1 server in a thread) and sends the same requests two ways:
+
+  per-call — `async with httpx.AsyncClient()` around every request, as
+             _create_cal_booking did: a new TCP + TLS handshake each time
+  shared   — get_http_client() from the registry: one pool, warm connections
+
+Both runs report mean/p95 latency and how many TCP connections the server
+accepted. Loopback handshakes are cheap; --rtt-ms adds that many milliseconds per
+round trip to each new connection (TCP + TLS 1.3 ≈ 2 round trips) to approximate
+a real upstream. The stand-in only speaks HTTP/1.1, so this measures keep-alive,
+not HTTP/2 multiplexing.
+
+Run from AxisV2_backend:
+  python scripts/http_client_benchmark.py
+  python scripts/http_client_benchmark.py --n 300 --concurrency 10 --rtt-ms 30
+"""
+
+import os
+import ssl
+import sys
+import time
+import asyncio
+import argparse
+import tempfile
+import threading
+import subprocess
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        body = b'{"id": 1, "uid": "bench"}'
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+class StandIn(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, cert: str, key: str, rtt_ms: float):
+        super().__init__(("127.0.0.1", 0), _Handler)
+        self.connections = 0
+        self.rtt_ms = rtt_ms
+        self._context = ssl.SSLContext(ssl.PROTOCOL_TLS_SERVER)
+        self._context.load_cert_chain(cert, key)
+
+    def get_request(self):
+        sock, addr = self.socket.accept()
+        self.connections += 1
+        return sock, addr
+
+    def process_request_thread(self, request, client_address):
+        # The handshake happens here, off the accept loop, so concurrent connections don't queue
+        try:
+            time.sleep(2 * self.rtt_ms / 1000)
+            request = self._context.wrap_socket(request, server_side=True)
+        except (OSError, ssl.SSLError):
+            self.shutdown_request(request)
+            return
+        super().process_request_thread(request, client_address)
+
+
+def _self_signed_cert(directory: str) -> tuple[str, str]:
+    cert, key = os.path.join(directory, "cert.pem"), os.path.join(directory, "key.pem")
+    try:
+        subprocess.run(
+            [
+                "openssl", "req", "-x509", "-newkey", "rsa:2048", "-nodes", "-days", "1",
+                "-subj", "/CN=127.0.0.1", "-addext", "subjectAltName=IP:127.0.0.1",
+                "-keyout", key, "-out", cert,
+            ],
+            check=True, capture_output=True,
+        )
+    except (OSError, subprocess.CalledProcessError) as e:
+        sys.exit(f"Could not create a self-signed certificate with openssl: {e}")
+    return cert, key
+
+
+def _summary(label: str, latencies: list[float], elapsed: float, connections: int) -> str:
+    latencies = sorted(latencies)
+    mean = sum(latencies) / len(latencies) * 1000
+    p95 = latencies[int(0.95 * (len(latencies) - 1))] * 1000
+    return (
+        f"{label:<9} mean {mean:6.2f}ms | p95 {p95:6.2f}ms | {len(latencies) / elapsed:7.0f} req/s "
+        f"| {connections} connections"
+    )
+
+
+async def _run(send, n: int, concurrency: int) -> tuple[list[float], float]:
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies = []
+
+    async def one():
+        async with semaphore:
+            started = time.perf_counter()
+            resp = await send()
+            resp.raise_for_status()
+            latencies.append(time.perf_counter() - started)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(one() for _ in range(n)))
+    return latencies, time.perf_counter() - started
+
+
+async def bench(server: StandIn, n: int, concurrency: int):
+    import httpx
+    from app import http_clients
+
+    base_url = f"https://127.0.0.1:{server.server_address[1]}"
+    http_clients.UPSTREAMS["standin"] = http_clients.Upstream(base_url, 10.0)
+    payload = {"eventTypeId": 1, "start": "2026-01-01T15:00:00Z"}
+
+    async def per_call():
+        async with httpx.AsyncClient(timeout=10.0) as client:
+            return await client.post(f"{base_url}/v1/bookings", json=payload)
+
+    async def shared():
+        return await http_clients.get_http_client("standin").post("/v1/bookings", json=payload)
+
+    try:
+        for label, send in (("per-call", per_call), ("shared", shared)):
+            await send()  # warm-up, not counted
+            server.connections = 0
+            latencies, elapsed = await _run(send, n, concurrency)
+            print(_summary(label, latencies, elapsed, server.connections))
+    finally:
+        await http_clients.close_http_clients()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--n", type=int, default=200, help="requests per client mode")
+    parser.add_argument("--concurrency", type=int, default=1, help="requests in flight at once")
+    parser.add_argument("--rtt-ms", type=float, default=0.0, help="simulated round trip added per new connection")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        cert, key = _self_signed_cert(tmp)
+        # httpx reads SSL_CERT_FILE, so both modes trust the stand-in without code changes
+        os.environ["SSL_CERT_FILE"] = cert
+        server = StandIn(cert, key, args.rtt_ms)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        try:
+            print(f"n={args.n} concurrency={args.concurrency} rtt={args.rtt_ms:g}ms")
+            asyncio.run(bench(server, args.n, args.concurrency))
+        finally:
+            server.shutdown()
+            server.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,169 @@
+#!/usr/bin/env python3
+"""
+Row-building and sink throughput for app/ingestion.py.
+
+  rows   — the old per-request code path (label dicts rebuilt inside the handler on
+           every submission, as api/index.py and main.py did) against waitlist_row()
+           with its import-time lookup tables; also checks both produce the same row.
+  sqlite — SQLiteSink fed one row per write (batch_size=1) against batched writes
+           (--batch rows per executemany) into a scratch database.
+
+Sheets sinks are not exercised (no network); api_handler_timing.py covers the
+Vercel handler end to end.
+
+Run from AxisV2_backend:
+  python scripts/ingestion_benchmark.py
+  python scripts/ingestion_benchmark.py --n 50000 --batch 100
+"""
+
+import os
+import sys
+import time
+import argparse
+import tempfile
+from datetime import datetime
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.ingestion import Ingestion, SQLiteSink, waitlist_row  # noqa: E402
+
+SAMPLE = {
+    "fullName": "Benchmark Person",
+    "email": "bench@example.com",
+    "phone": "5551234567",
+    "role": "practice-manager",
+    "ownerEmail": "owner@example.com",
+    "clinicName": "Bench Clinic",
+    "clinicType": "dental",
+    "clinicSize": "6-10",
+    "numberOfDoctors": "7",
+    "numberOfLocations": "2",
+    "painPoints": ["no-shows", "phone-calls", "admin-burnout"],
+    "currentSetup": "ehr",
+    "impactLevel": "frustrating",
+    "willingnessToPay": "possibly",
+    "priceRange": "$200-500",
+    "solutionWins": ["fewer-no-shows", "less-admin"],
+    "otherWish": "",
+}
+
+
+def legacy_row(data: dict, timestamp: str) -> list:
+    """The pre-ingestion handler body: every label dict literal built per call."""
+    phone_value = data.get('phone', '')
+    if phone_value:
+        phone_value = f"'{phone_value}"
+    pain_labels = {
+        'no-shows': 'No-shows or last-minute cancellations',
+        'phone-calls': 'Too many phone calls',
+        'manual-scheduling': 'Manual scheduling or rescheduling',
+        'intake-forms': 'Chasing intake forms',
+        'admin-burnout': 'Admin burnout',
+        'doctor-admin': 'Doctors spending time on admin work',
+        'follow-ups': 'Follow-ups slipping through the cracks'
+    }
+    pain_points = ", ".join([pain_labels.get(p, p) for p in data.get('painPoints', [])])
+    solution_labels = {
+        'fewer-no-shows': 'Fewer no-shows',
+        'less-admin': 'Less admin work for staff',
+        'prepared-visits': 'Doctors starting visits more prepared',
+        'better-followups': 'Better follow-ups',
+        'fewer-missed-calls': 'Fewer missed calls',
+        'visibility': 'Clear visibility into clinic performance'
+    }
+    solution_wins = ", ".join([solution_labels.get(s, s) for s in data.get('solutionWins', [])])
+    clinic_type_labels = {
+        'primary-care': 'Primary care', 'specialty': 'Specialty clinic', 'dental': 'Dental',
+        'physical-therapy': 'Physical therapy', 'mental-health': 'Mental health', 'other': 'Other'
+    }
+    clinic_size_labels = {'solo': 'Solo provider', '2-5': '2 to 5', '6-10': '6 to 10', '10plus': '10+'}
+    role_labels = {
+        'owner': 'Clinic Owner', 'admin': 'Administrative Assistant', 'practice-manager': 'Practice Manager',
+        'operations-manager': 'Operations Manager', 'cto': 'CTO / IT Director'
+    }
+    current_setup_labels = {
+        'front-desk': 'Front desk + phone calls', 'simple-tool': 'Simple scheduling tool',
+        'ehr': 'EHR scheduling', 'mix': 'Mix of tools', 'messy': 'Not sure / messy setup'
+    }
+    impact_level_labels = {
+        'not-big': 'Not a big issue', 'somewhat': 'Somewhat painful',
+        'frustrating': 'Actively frustrating', 'hurting': 'Hurting revenue or staff morale'
+    }
+    willingness_labels = {
+        'yes': 'Yes, definitely', 'possibly': 'Possibly, depending on price',
+        'not-now': 'Not right now', 'exploring': 'Just exploring'
+    }
+    return [
+        timestamp,
+        data.get('fullName', ''),
+        data.get('email', ''),
+        phone_value,
+        role_labels.get(data.get('role', ''), data.get('role', '')),
+        data.get('ownerEmail', ''),
+        data.get('clinicName', ''),
+        clinic_type_labels.get(data.get('clinicType', ''), data.get('clinicType', '')),
+        data.get('otherClinicType', ''),
+        clinic_size_labels.get(data.get('clinicSize', ''), data.get('clinicSize', '')),
+        data.get('numberOfDoctors', ''),
+        data.get('numberOfLocations', ''),
+        data.get('doctorEmails', ''),
+        data.get('locationAddresses', ''),
+        pain_points,
+        current_setup_labels.get(data.get('currentSetup', ''), data.get('currentSetup', '')),
+        impact_level_labels.get(data.get('impactLevel', ''), data.get('impactLevel', '')),
+        willingness_labels.get(data.get('willingnessToPay', ''), data.get('willingnessToPay', '')),
+        data.get('priceRange', ''),
+        solution_wins,
+        data.get('otherWish', ''),
+    ]
+
+
+def _us_per_op(started: float, n: int) -> float:
+    return (time.perf_counter() - started) / n * 1e6
+
+
+def bench_rows(n: int):
+    timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    if legacy_row(SAMPLE, timestamp) != waitlist_row(SAMPLE, timestamp):
+        sys.exit("waitlist_row() output differs from the legacy handler row")
+
+    started = time.perf_counter()
+    for _ in range(n):
+        legacy_row(SAMPLE, timestamp)
+    legacy = _us_per_op(started, n)
+
+    started = time.perf_counter()
+    for _ in range(n):
+        waitlist_row(SAMPLE, timestamp)
+    shared = _us_per_op(started, n)
+    print(f"rows    legacy {legacy:.2f}us/row | waitlist_row {shared:.2f}us/row | {legacy / shared:.1f}x")
+
+
+def bench_sqlite(n: int, batch: int):
+    results = {}
+    for size in (1, batch):
+        with tempfile.TemporaryDirectory() as tmp:
+            ingestion = Ingestion(SQLiteSink(os.path.join(tmp, "submissions.db")), batch_size=size)
+            started = time.perf_counter()
+            for _ in range(n):
+                ingestion.submit_waitlist(SAMPLE)
+            ingestion.flush()
+            results[size] = _us_per_op(started, n)
+    print(
+        f"sqlite  batch_size=1 {results[1]:.1f}us/row | batch_size={batch} {results[batch]:.1f}us/row "
+        f"| {results[1] / results[batch]:.1f}x"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--n", type=int, default=20000, help="rows per measurement")
+    parser.add_argument("--batch", type=int, default=50, help="batch size for the batched sink run")
+    args = parser.parse_args()
+
+    bench_rows(args.n)
+    bench_sqlite(min(args.n, 5000), args.batch)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+Diff the local submissions store (SUBMISSIONS_DB) against the Waitlist and Contact sheets.
+
+For each sheet, rows are matched on (Timestamp, Email) and reported as:
+  pending     — stored, not yet replicated (the background writer will retry them)
+  missing     — marked replicated but not in the sheet (deleted by hand, lost append)
+  sheet only  — in the sheet but not in the store (rows from before the store existed,
+                manual entries)
+
+  --repair    requeue the missing rows and flush everything pending now
+  --flush     just flush pending rows now
+
+Run from AxisV2_backend with the usual .env (GOOGLE_* and SUBMISSIONS_DB):
+  python scripts/reconcile_submissions.py
+  python scripts/reconcile_submissions.py --repair
+"""
+
+import os
+import sys
+import argparse
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.ingestion import CONTACT_SHEET, WAITLIST_SHEET  # noqa: E402
+from app.services.google_sheets import get_google_sheets_service  # noqa: E402
+
+
+def _key(row: list) -> tuple[str, str]:
+    """(timestamp, email) as the sheet displays them — the ' text prefix is not shown."""
+    cells = [str(c).lstrip("'").strip() for c in row[:3]] + ["", "", ""]
+    return cells[0], cells[2].lower()
+
+
+def reconcile(writer, worksheet, title: str, show: int) -> list[int]:
+    """Print the diff for one sheet; returns the store ids of rows missing from it."""
+    stored = writer.rows(title)
+    in_sheet = {_key(r) for r in worksheet.get_all_values()[1:]}
+    in_store = {_key(row) for _, row, _ in stored}
+
+    pending = [(i, row) for i, row, replicated_at in stored if replicated_at is None]
+    missing = [(i, row) for i, row, replicated_at in stored if replicated_at is not None and _key(row) not in in_sheet]
+    sheet_only = in_sheet - in_store
+
+    print(f"{title}: {len(stored)} stored | {len(pending)} pending | {len(missing)} missing | {len(sheet_only)} sheet only")
+    for label, rows in (("pending", pending), ("missing", missing)):
+        for _, row in rows[:show]:
+            print(f"  {label:<8} {row[0]}  {row[2] if len(row) > 2 else ''}")
+    for timestamp, email in sorted(sheet_only)[:show]:
+        print(f"  {'sheet':<8} {timestamp}  {email}")
+    return [i for i, _ in missing]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repair", action="store_true", help="requeue missing rows and flush")
+    parser.add_argument("--flush", action="store_true", help="flush pending rows")
+    parser.add_argument("--show", type=int, default=10, help="example rows to print per category")
+    args = parser.parse_args()
+
+    service = get_google_sheets_service()
+    if service.get_spreadsheet() is None:
+        sys.exit("Google Sheets is not configured or unreachable")
+    writer = service.writer
+
+    requeue = []
+    # Hold off the background flusher so replicated_at doesn't change mid-diff
+    with writer.paused():
+        for title in (WAITLIST_SHEET, CONTACT_SHEET):
+            requeue += reconcile(writer, writer.worksheet(title), title, args.show)
+        if args.repair and requeue:
+            writer.requeue(requeue)
+            print(f"\nRequeued {len(requeue)} missing rows")
+
+    if args.repair or args.flush:
+        written = writer.flush()
+        print(f"Flushed {written} rows to Sheets")
+
+
+if __name__ == "__main__":
+    main()
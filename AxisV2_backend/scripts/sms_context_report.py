@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+Replay recorded SMS conversations and report per-turn prompt tokens:
+  naive     — system prompt + last MAX_HISTORY_MESSAGES raw messages (old behaviour)
+  compacted — system prompt + rolling summary + budgeted history (context_builder)
+
+Summaries are produced with the extractive fallback, so no OpenAI calls are made;
+real LLM summaries are shorter, so the reported savings are a lower bound.
+
+Run from AxisV2_backend:
+  python scripts/sms_context_report.py --jsonl conversations.jsonl   # {"messages": [...]} per line
+  python scripts/sms_context_report.py --db ava_conversations.db     # conversation store export
+"""
+
+import os
+import sys
+import json
+import sqlite3
+import argparse
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.ava.prompts import SMS_SYSTEM_PROMPT
+from app.ava.context_builder import (
+    CONTEXT_TOKEN_BUDGET, build_prompt_history, count_tokens, fallback_summary,
+    make_summary_message, plan_compaction, prompt_tokens,
+)
+
+# Mirrors sms_handler without importing its OpenAI/Twilio dependencies
+MAX_HISTORY_MESSAGES = 30
+COMPACT_AT_MESSAGES = MAX_HISTORY_MESSAGES - 6
+
+
+def load_jsonl(path: str) -> list[list[dict]]:
+    with open(path) as f:
+        return [json.loads(line)["messages"] for line in f if line.strip()]
+
+
+def load_db(path: str) -> list[list[dict]]:
+    conn = sqlite3.connect(path)
+    rows = conn.execute("SELECT phone, body FROM sms_messages ORDER BY phone, seq").fetchall()
+    conversations: dict[str, list[dict]] = {}
+    for phone, body in rows:
+        conversations.setdefault(phone, []).append(json.loads(body))
+    return list(conversations.values())
+
+
+def replay(messages: list[dict], budget: int) -> tuple[list[int], list[int]]:
+    system_tokens = count_tokens(SMS_SYSTEM_PROMPT)
+    raw: list[dict] = []
+    stored: list[dict] = []
+    naive, compacted = [], []
+
+    for msg in messages:
+        raw.append(msg)
+        stored.append(msg)
+        if msg.get("role") != "user":
+            continue
+
+        naive.append(system_tokens + prompt_tokens(raw[-MAX_HISTORY_MESSAGES:]))
+
+        plan = plan_compaction(stored, budget, max_messages=COMPACT_AT_MESSAGES)
+        if plan is not None:
+            summary = fallback_summary(plan.previous_summary, plan.evicted)
+            stored = [make_summary_message(summary)] + stored[plan.drop_first:]
+        compacted.append(system_tokens + prompt_tokens(build_prompt_history(stored, budget)))
+
+    return naive, compacted
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument("--jsonl", help="recorded conversations, one {\"messages\": [...]} per line")
+    source.add_argument("--db", help="SQLite conversation store file")
+    parser.add_argument("--budget", type=int, default=CONTEXT_TOKEN_BUDGET)
+    args = parser.parse_args()
+
+    conversations = load_jsonl(args.jsonl) if args.jsonl else load_db(args.db)
+    if not conversations:
+        print("No conversations found.")
+        return
+
+    total_naive = total_compacted = turns = 0
+    peak_naive = peak_compacted = 0
+    print(f"{'conv':>4} {'turns':>5} {'naive avg':>10} {'compact avg':>12} {'naive max':>10} {'compact max':>12}")
+    for i, messages in enumerate(conversations, 1):
+        naive, compacted = replay(messages, args.budget)
+        if not naive:
+            continue
+        turns += len(naive)
+        total_naive += sum(naive)
+        total_compacted += sum(compacted)
+        peak_naive = max(peak_naive, max(naive))
+        peak_compacted = max(peak_compacted, max(compacted))
+        print(
+            f"{i:>4} {len(naive):>5} {sum(naive) / len(naive):>10.0f} "
+            f"{sum(compacted) / len(compacted):>12.0f} {max(naive):>10} {max(compacted):>12}"
+        )
+
+    if not turns:
+        print("No user turns found.")
+        return
+    saved = total_naive - total_compacted
+    print(f"\nTurns replayed:       {turns}")
+    print(f"Prompt tokens naive:  {total_naive} (peak {peak_naive}/turn)")
+    print(f"Prompt tokens budget: {total_compacted} (peak {peak_compacted}/turn)")
+    print(f"Saved:                {saved} tokens ({saved / total_naive:.1%})")
+
+
+if __name__ == "__main__":
+    main()
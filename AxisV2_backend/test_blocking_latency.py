@@ -0,0 +1,188 @@
+#!/usr/bin/env python3
+"""
+Checks that slow Google Sheets / SMTP calls don't stall the event loop.
+Run: python test_blocking_latency.py   (or: pytest test_blocking_latency.py)
+
+The gspread spreadsheet and smtplib.SMTP_SSL are replaced with stand-ins that
+sleep on every call, like an upstream taking its time to answer. A 10ms ticker on
+the same loop stands in for every other webhook the worker is serving while
+submit_to_waitlist and save_transcript run (the confirmation email included).
+"""
+import asyncio
+import os
+import tempfile
+import time
+from types import SimpleNamespace
+
+from app import task_queue
+from app.ava import waitlist_submit
+from app.ava.row_index import PhoneRowIndex
+from app.sheets_writer import SheetsWriter, WorksheetSpec
+
+UPSTREAM_DELAY = 0.3
+TICK_SECONDS = 0.01
+MAX_LOOP_STALL = 0.1  # well under one upstream call
+
+SUBMISSION = {
+    "fullName": "Latency Check",
+    "email": "latency@example.com",
+    "role": "owner",
+    "clinicName": "Test Clinic",
+    "preferredTime": "declined",
+}
+
+
+class SlowWorksheet:
+    """gspread Worksheet stand-in; every API call takes UPSTREAM_DELAY"""
+
+    col_count = 11
+
+    def __init__(self, calls):
+        self.calls = calls
+        self.rows = []
+
+    def _call(self, name):
+        self.calls.append(name)
+        time.sleep(UPSTREAM_DELAY)
+
+    def append_rows(self, rows, value_input_option=None):
+        self._call("append_rows")
+        self.rows.extend(rows)
+        return {"updates": {"updatedRange": f"'Ava Calls'!A{len(self.rows) + 1}:J{len(self.rows) + 1}"}}
+
+    def append_row(self, row, value_input_option=None):
+        return self.append_rows([row], value_input_option)
+
+    def col_values(self, col):
+        self._call("col_values")
+        return [""] + [row[col - 1] if len(row) >= col else "" for row in self.rows]
+
+    def cell(self, row, col):
+        self._call("cell")
+        value = self.rows[row - 2][col - 1] if 0 <= row - 2 < len(self.rows) else ""
+        return SimpleNamespace(value=value)
+
+    def update_cell(self, row, col, value):
+        self._call("update_cell")
+
+
+class SlowSpreadsheet:
+    def __init__(self, worksheet):
+        self._worksheet = worksheet
+
+    def worksheet(self, title):
+        self._worksheet._call("worksheet")
+        return self._worksheet
+
+
+class SlowSMTP:
+    """smtplib.SMTP_SSL stand-in; connecting, login and sending each take UPSTREAM_DELAY"""
+
+    calls = []
+
+    def __init__(self, *args, **kwargs):
+        self.calls.append("connect")
+        time.sleep(UPSTREAM_DELAY)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def login(self, *args):
+        self.calls.append("login")
+        time.sleep(UPSTREAM_DELAY)
+
+    def sendmail(self, *args):
+        self.calls.append("sendmail")
+        time.sleep(UPSTREAM_DELAY)
+
+
+class SlowWriter(SheetsWriter):
+    def __init__(self, journal, worksheet):
+        super().__init__(lambda: None, journal_path=journal, write_behind=False)
+        self.register(WorksheetSpec(title=waitlist_submit.AVA_CALLS_SHEET, headers=waitlist_submit.WAITLIST_HEADERS))
+        self._sheet = worksheet
+
+    def worksheet(self, title):
+        return self._sheet
+
+
+async def _ticker(stop, stalls):
+    while not stop.is_set():
+        started = time.perf_counter()
+        await asyncio.sleep(TICK_SECONDS)
+        stalls.append(time.perf_counter() - started - TICK_SECONDS)
+
+
+async def _submit_and_save(queue):
+    stop = asyncio.Event()
+    stalls = []
+    ticker = asyncio.create_task(_ticker(stop, stalls))
+    await asyncio.sleep(0)  # let the ticker start before the submission runs
+
+    submitted = await waitlist_submit.submit_to_waitlist(SUBMISSION, phone="+15550000000")
+    saved = await waitlist_submit.save_transcript("+15550000000", "Agent: Hi!\nCaller: Hello.")
+    await queue.stop()  # wait for the confirmation email to go out
+
+    stop.set()
+    await ticker
+    return submitted, saved, stalls
+
+
+def test_slow_sheets_and_smtp_do_not_stall_the_loop():
+    with tempfile.TemporaryDirectory() as tmp:
+        sheet_calls = []
+        worksheet = SlowWorksheet(sheet_calls)
+
+        def slow_client():
+            sheet_calls.append("authorize")
+            time.sleep(UPSTREAM_DELAY)
+            return object(), SlowSpreadsheet(worksheet)
+
+        saved_env = {k: os.environ.get(k) for k in ("CAL_API_KEY", "SMTP_EMAIL", "SMTP_PASSWORD")}
+        saved = (
+            waitlist_submit._get_sheets_client, waitlist_submit._sheets_writer, waitlist_submit._row_index,
+            waitlist_submit.smtplib.SMTP_SSL, task_queue._task_queue,
+        )
+        os.environ.pop("CAL_API_KEY", None)  # keep Cal.com out of the measurement
+        os.environ["SMTP_EMAIL"], os.environ["SMTP_PASSWORD"] = "ava@example.com", "secret"
+        waitlist_submit._get_sheets_client = slow_client
+        waitlist_submit._sheets_writer = SlowWriter(os.path.join(tmp, "journal.db"), worksheet)
+        waitlist_submit._row_index = PhoneRowIndex(os.path.join(tmp, "rows.db"))
+        waitlist_submit.smtplib.SMTP_SSL = SlowSMTP
+        SlowSMTP.calls = []
+        queue = task_queue._task_queue = task_queue.TaskQueue(workers=1)
+        try:
+            submitted, transcript_saved, stalls = asyncio.run(_submit_and_save(queue))
+        finally:
+            (
+                waitlist_submit._get_sheets_client, waitlist_submit._sheets_writer, waitlist_submit._row_index,
+                waitlist_submit.smtplib.SMTP_SSL, task_queue._task_queue,
+            ) = saved
+            for key, value in saved_env.items():
+                if value is None:
+                    os.environ.pop(key, None)
+                else:
+                    os.environ[key] = value
+
+        assert submitted and transcript_saved, "the stand-ins should have accepted the row and transcript"
+        assert "append_rows" in sheet_calls and "update_cell" in sheet_calls, f"Sheets not exercised: {sheet_calls}"
+        assert SlowSMTP.calls == ["connect", "login", "sendmail"], f"SMTP not exercised: {SlowSMTP.calls}"
+        worst = max(stalls)
+        assert worst < MAX_LOOP_STALL, f"event loop stalled {worst * 1000:.0f}ms behind a slow upstream call"
+
+
+if __name__ == "__main__":
+    tests = [(name, fn) for name, fn in sorted(globals().items()) if name.startswith("test_") and callable(fn)]
+    failed = 0
+    for name, fn in tests:
+        try:
+            fn()
+            print(f"[OK] {name}")
+        except AssertionError as e:
+            failed += 1
+            print(f"[X] {name}: {e}")
+    print(f"\n{len(tests) - failed}/{len(tests)} passed")
+    raise SystemExit(1 if failed else 0)
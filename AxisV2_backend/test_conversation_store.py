@@ -0,0 +1,162 @@
+#!/usr/bin/env python3
+"""
+Checks for the SMS conversation store (app/ava/conversation_store.py).
+Run: python test_conversation_store.py   (or: pytest test_conversation_store.py)
+
+Uses the SQLite backend; two store objects on one file stand in for two uvicorn
+workers. Set REDIS_URL to also run the compaction checks against Redis.
+"""
+import os
+import tempfile
+import time
+import uuid
+
+from app.ava import conversation_store
+from app.ava.context_builder import make_summary_message, plan_compaction
+from app.ava.conversation_store import RedisConversationStore, SQLiteConversationStore
+
+PHONE = "+15555550123"
+
+
+def _msg(n):
+    return {"role": "user" if n % 2 == 0 else "assistant", "content": f"m{n}"}
+
+
+def _stores(tmp, **options):
+    path = os.path.join(tmp, "conversations.db")
+    return SQLiteConversationStore(path, **options), SQLiteConversationStore(path, **options)
+
+
+def test_append_trims_to_max_messages():
+    with tempfile.TemporaryDirectory() as tmp:
+        store, other = _stores(tmp, max_messages=5)
+        store.append(PHONE, *[_msg(n) for n in range(4)])
+        history = store.append(PHONE, _msg(4), _msg(5), _msg(6))
+        assert history == [_msg(n) for n in range(2, 7)], f"unexpected history: {history}"
+        assert other.get(PHONE) == history
+
+
+def test_ttl_expires_each_conversation_separately():
+    with tempfile.TemporaryDirectory() as tmp:
+        store, other = _stores(tmp, ttl_seconds=1)
+        store.append(PHONE, _msg(0))
+        time.sleep(0.6)
+        store.append("+15555550199", _msg(1))
+        time.sleep(0.6)
+        # Only the first conversation has been idle for longer than the TTL
+        assert store.get(PHONE) == [] and other.get(PHONE) == []
+        assert store.get("+15555550199") == [_msg(1)]
+        assert other.get("+15555550199") == [_msg(1)]
+
+
+def test_front_cache_drops_entry_bumped_by_another_writer():
+    with tempfile.TemporaryDirectory() as tmp:
+        store, other = _stores(tmp)
+        store.append(PHONE, _msg(0))
+        assert store.get(PHONE) == [_msg(0)]  # now cached at this version
+        other.append(PHONE, _msg(1))
+        assert store.get(PHONE) == [_msg(0), _msg(1)], "served a stale cached history"
+        other.clear(PHONE)
+        assert store.get(PHONE) == []
+
+
+def test_unreachable_redis_falls_back_to_sqlite():
+    with tempfile.TemporaryDirectory() as tmp:
+        saved = {k: os.environ.get(k) for k in ("REDIS_URL", "SMS_CONVERSATION_DB")}
+        os.environ["REDIS_URL"] = "redis://127.0.0.1:1/0"
+        os.environ["SMS_CONVERSATION_DB"] = os.path.join(tmp, "fallback.db")
+        conversation_store._store = None
+        try:
+            store = conversation_store.get_conversation_store()
+            assert isinstance(store, SQLiteConversationStore)
+            assert store.append(PHONE, _msg(0)) == [_msg(0)]
+        finally:
+            conversation_store._store = None
+            for key, value in saved.items():
+                if value is None:
+                    os.environ.pop(key, None)
+                else:
+                    os.environ[key] = value
+
+
+def _check_append_during_summary(store, other, phone):
+    store.append(phone, *[_msg(n) for n in range(6)])
+    history = store.get(phone)
+    replaced = history[:4]  # the plan folds m0..m3 into the summary and keeps m4, m5
+
+    # m6 arrives on another worker while the summary is being written
+    other.append(phone, _msg(6))
+
+    head = make_summary_message("m0..m3")
+    compacted = store.compact(phone, head, replaced)
+    assert compacted == [head, _msg(4), _msg(5), _msg(6)], f"unexpected history: {compacted}"
+    assert other.get(phone) == compacted
+
+
+def _check_stale_plan_is_skipped(store, other, phone):
+    store.append(phone, *[_msg(n) for n in range(6)])
+    replaced = store.get(phone)[:4]
+
+    # Another worker compacted first: the front is no longer what the plan summarized
+    other.compact(phone, make_summary_message("m0..m1"), replaced[:2])
+    before = other.get(phone)
+    assert store.compact(phone, make_summary_message("m0..m3"), replaced) is None
+    assert store.get(phone) == before
+
+
+def test_compaction_keeps_messages_appended_during_summary():
+    with tempfile.TemporaryDirectory() as tmp:
+        _check_append_during_summary(*_stores(tmp), PHONE)
+
+
+def test_compaction_keeps_tool_pairs_together():
+    with tempfile.TemporaryDirectory() as tmp:
+        store, other = _stores(tmp)
+        call = {
+            "role": "assistant",
+            "content": None,
+            "tool_calls": [{"id": "c1", "type": "function", "function": {"name": "lookup", "arguments": "{}"}}],
+        }
+        result = {"role": "tool", "tool_call_id": "c1", "content": "ok"}
+        store.append(PHONE, _msg(0), _msg(1), _msg(2), call, result, _msg(5))
+        history = store.get(PHONE)
+        plan = plan_compaction(history, max_messages=4)
+        assert plan is not None and plan.drop_first <= 3, "the tool pair must not be split"
+
+        other.append(PHONE, _msg(6))
+        compacted = store.compact(PHONE, make_summary_message("summary"), history[:plan.drop_first])
+        assert compacted[1:] == history[plan.drop_first:] + [_msg(6)]
+        calls = [i for i, m in enumerate(compacted) if m.get("tool_calls")]
+        assert all(compacted[i + 1].get("role") == "tool" for i in calls)
+
+
+def test_stale_compaction_plan_is_skipped():
+    with tempfile.TemporaryDirectory() as tmp:
+        _check_stale_plan_is_skipped(*_stores(tmp), PHONE)
+
+
+def test_redis_compaction():
+    redis_url = os.getenv("REDIS_URL")
+    if not redis_url:
+        return  # no server to check against
+    store, other = RedisConversationStore(redis_url), RedisConversationStore(redis_url)
+    for check in (_check_append_during_summary, _check_stale_plan_is_skipped):
+        phone = f"+1555{uuid.uuid4().hex[:8]}"
+        try:
+            check(store, other, phone)
+        finally:
+            store.clear(phone)
+
+
+if __name__ == "__main__":
+    tests = [(name, fn) for name, fn in sorted(globals().items()) if name.startswith("test_") and callable(fn)]
+    failed = 0
+    for name, fn in tests:
+        try:
+            fn()
+            print(f"[OK] {name}")
+        except AssertionError as e:
+            failed += 1
+            print(f"[X] {name}: {e}")
+    print(f"\n{len(tests) - failed}/{len(tests)} passed")
+    raise SystemExit(1 if failed else 0)
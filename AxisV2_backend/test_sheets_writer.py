@@ -0,0 +1,161 @@
+#!/usr/bin/env python3
+"""
+Checks for the Sheets write-behind journal (app/sheets_writer.py).
+Run: python test_sheets_writer.py   (or: pytest test_sheets_writer.py)
+
+No Google credentials needed: the worksheet is a stand-in that records appended
+rows to a file, so writers in separate processes (like ava_server's uvicorn
+workers) can share one journal and one "sheet".
+"""
+import json
+import multiprocessing
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+
+from app.sheets_writer import SheetsWriter, WorksheetSpec
+
+SHEET = "Checks"
+SPEC = WorksheetSpec(title=SHEET, headers=["Name", "Phone"])
+
+
+class FileWorksheet:
+    """Appends each row as a JSON line; O_APPEND keeps concurrent writers' lines whole"""
+
+    def __init__(self, path, delay=0.0, fail=False):
+        self.path = path
+        self.delay = delay
+        self.fail = fail
+
+    def append_rows(self, rows, value_input_option=None):
+        time.sleep(self.delay)  # widen the window between claiming and confirming
+        if self.fail:
+            raise RuntimeError("quota exceeded")
+        with open(self.path, "a") as f:
+            f.write("".join(json.dumps(row) + "\n" for row in rows))
+        return {}
+
+
+class CheckWriter(SheetsWriter):
+    def __init__(self, journal, sheet_path, delay=0.0, fail=False, **kwargs):
+        super().__init__(lambda: None, journal_path=journal, write_behind=False, **kwargs)
+        self.register(SPEC)
+        self._sheet = FileWorksheet(sheet_path, delay, fail)
+
+    def worksheet(self, title):
+        return self._sheet
+
+
+def _appended(sheet_path):
+    if not os.path.exists(sheet_path):
+        return []
+    with open(sheet_path) as f:
+        return [json.loads(line) for line in f]
+
+
+def _flush_worker(journal, sheet_path, start):
+    writer = CheckWriter(journal, sheet_path, delay=0.05)
+    start.wait()
+    for _ in range(5):
+        writer.flush()
+
+
+def _journal_rows(journal, count):
+    writer = CheckWriter(journal, os.devnull)
+    # Journal without flushing, as if the rows were left over from a previous run
+    for n in range(count):
+        with writer._db_lock:
+            writer._conn.execute(
+                "INSERT INTO sheet_rows (worksheet, row, created_at) VALUES (?, ?, ?)",
+                (SHEET, json.dumps([f"caller-{n}", str(n)]), time.time()),
+            )
+    return writer
+
+
+def test_two_processes_append_each_row_once():
+    with tempfile.TemporaryDirectory() as tmp:
+        journal, sheet_path = os.path.join(tmp, "journal.db"), os.path.join(tmp, "sheet.jsonl")
+        # Close the seeding connection first: a forked worker that inherited it and
+        # closed it on garbage collection would drop its own SQLite locks on the journal
+        _journal_rows(journal, 40)._conn.close()
+
+        start = multiprocessing.Event()
+        workers = [
+            multiprocessing.Process(target=_flush_worker, args=(journal, sheet_path, start))
+            for _ in range(2)
+        ]
+        for worker in workers:
+            worker.start()
+        start.set()
+        for worker in workers:
+            worker.join(timeout=30)
+            assert worker.exitcode == 0
+
+        appended = [row[0] for row in _appended(sheet_path)]
+        assert sorted(appended) == sorted(f"caller-{n}" for n in range(40)), "rows lost or appended twice"
+        assert CheckWriter(journal, sheet_path).pending(SHEET) == []
+
+
+def test_concurrent_writers_with_new_rows():
+    # Both writers enqueue and flush immediately (the serverless path) at the same time
+    with tempfile.TemporaryDirectory() as tmp:
+        journal, sheet_path = os.path.join(tmp, "journal.db"), os.path.join(tmp, "sheet.jsonl")
+        writers = [CheckWriter(journal, sheet_path, delay=0.01) for _ in range(2)]
+
+        def submit(writer, prefix):
+            for n in range(15):
+                writer.enqueue(SHEET, [f"{prefix}-{n}", str(n)])
+
+        threads = [threading.Thread(target=submit, args=(w, f"w{i}")) for i, w in enumerate(writers)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        appended = [row[0] for row in _appended(sheet_path)]
+        assert len(appended) == len(set(appended)) == 30
+
+
+def test_failed_append_releases_claim():
+    with tempfile.TemporaryDirectory() as tmp:
+        journal, sheet_path = os.path.join(tmp, "journal.db"), os.path.join(tmp, "sheet.jsonl")
+        _journal_rows(journal, 3)
+        try:
+            CheckWriter(journal, sheet_path, fail=True).flush()
+            assert False, "the failed append should raise"
+        except RuntimeError:
+            pass
+        # Another process can retry straight away instead of waiting out the claim
+        assert CheckWriter(journal, sheet_path).flush() == 3
+        assert len(_appended(sheet_path)) == 3
+
+
+def test_expired_claim_is_taken_over():
+    with tempfile.TemporaryDirectory() as tmp:
+        journal, sheet_path = os.path.join(tmp, "journal.db"), os.path.join(tmp, "sheet.jsonl")
+        _journal_rows(journal, 2)
+        # A process that died between claiming and appending
+        conn = sqlite3.connect(journal)
+        conn.execute("UPDATE sheet_rows SET claimed_by = 'dead', claimed_at = ?", (time.time(),))
+        conn.commit()
+        conn.close()
+
+        assert CheckWriter(journal, sheet_path, claim_timeout=60).flush() == 0
+        assert CheckWriter(journal, sheet_path, claim_timeout=0).flush() == 2
+        assert len(_appended(sheet_path)) == 2
+
+
+if __name__ == "__main__":
+    tests = [(name, fn) for name, fn in sorted(globals().items()) if name.startswith("test_") and callable(fn)]
+    failed = 0
+    for name, fn in tests:
+        try:
+            fn()
+            print(f"[OK] {name}")
+        except AssertionError as e:
+            failed += 1
+            print(f"[X] {name}: {e}")
+    print(f"\n{len(tests) - failed}/{len(tests)} passed")
+    raise SystemExit(1 if failed else 0)
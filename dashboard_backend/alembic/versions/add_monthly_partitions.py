@@ -0,0 +1,162 @@
+"""Partition voice_ai_logs and automation_executions by month
+
+Revision ID: add_monthly_partitions
+Revises: add_query_indexes
+Create Date: 2026-10-18
+
+Both tables are rebuilt as RANGE-partitioned parents (created_at /
+triggered_at), with one partition per month from the oldest row through three
+months ahead, plus a DEFAULT partition. Existing rows are
+copied across, so the tables are locked for the length of the copy: run it in
+a maintenance window on large databases. From then on app.tasks.maintenance
+creates new months and detaches expired ones.
+
+The partition key has to be part of the primary key, which becomes (id, key);
+the key column becomes NOT NULL (rows missing it are given created_at, or now()).
+"""
+from datetime import date
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision = 'add_monthly_partitions'
+down_revision = 'add_query_indexes'
+branch_labels = None
+depends_on = None
+
+MONTHS_AHEAD = 3
+
+
+def _voice_ai_log_columns():
+    return [
+        sa.Column('id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('clinic_id', postgresql.UUID(as_uuid=True), sa.ForeignKey('clinics.id'), nullable=False),
+        sa.Column('appointment_id', postgresql.UUID(as_uuid=True), sa.ForeignKey('appointments.id'), nullable=True),
+        sa.Column('patient_id', postgresql.UUID(as_uuid=True), sa.ForeignKey('patients.id'), nullable=True),
+        sa.Column('call_sid', sa.String(100), nullable=True),
+        sa.Column('call_type', sa.String(50), nullable=False),
+        sa.Column('direction', sa.String(20)),
+        sa.Column('status', sa.String(50)),
+        sa.Column('outcome', sa.String(50), nullable=True),
+        sa.Column('initiated_at', sa.DateTime(timezone=True), nullable=True),
+        sa.Column('answered_at', sa.DateTime(timezone=True), nullable=True),
+        sa.Column('ended_at', sa.DateTime(timezone=True), nullable=True),
+        sa.Column('duration_seconds', sa.Integer()),
+        sa.Column('transcript', sa.Text(), nullable=True),
+        sa.Column('ai_response', sa.Text(), nullable=True),
+        sa.Column('patient_response', sa.Text(), nullable=True),
+        sa.Column('escalated', sa.Boolean()),
+        sa.Column('escalation_reason', sa.String(255), nullable=True),
+        sa.Column('from_number', sa.String(20), nullable=True),
+        sa.Column('to_number', sa.String(20), nullable=True),
+        sa.Column('call_metadata', postgresql.JSONB()),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.func.now()),
+    ]
+
+
+def _automation_execution_columns():
+    return [
+        sa.Column('id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('clinic_id', postgresql.UUID(as_uuid=True), sa.ForeignKey('clinics.id'), nullable=False),
+        sa.Column('rule_id', postgresql.UUID(as_uuid=True), sa.ForeignKey('automation_rules.id'), nullable=False),
+        sa.Column('appointment_id', postgresql.UUID(as_uuid=True), sa.ForeignKey('appointments.id'), nullable=True),
+        sa.Column('patient_id', postgresql.UUID(as_uuid=True), sa.ForeignKey('patients.id'), nullable=True),
+        sa.Column('status', sa.String(50)),
+        sa.Column('result', postgresql.JSONB()),
+        sa.Column('error_message', sa.Text(), nullable=True),
+        sa.Column('triggered_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+        sa.Column('completed_at', sa.DateTime(timezone=True), nullable=True),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now()),
+    ]
+
+
+# table -> (partition key, columns, value copied into the key when it is NULL)
+TABLES = {
+    'voice_ai_logs': ('created_at', _voice_ai_log_columns, 'now()'),
+    'automation_executions': ('triggered_at', _automation_execution_columns, 'COALESCE(created_at, now())'),
+}
+
+# Indexes from add_query_indexes; on a partitioned parent they cascade to every partition
+INDEXES = [
+    ('idx_voice_ai_logs_clinic_created', 'voice_ai_logs', ['clinic_id', sa.text('created_at DESC')], None),
+    ('idx_voice_ai_logs_appointment', 'voice_ai_logs', ['appointment_id'], None),
+    ('idx_automation_executions_clinic_triggered', 'automation_executions',
+     ['clinic_id', sa.text('triggered_at DESC')], None),
+    ('idx_automation_executions_rule_triggered', 'automation_executions',
+     ['rule_id', sa.text('triggered_at DESC')], None),
+    ('idx_automation_executions_clinic_success', 'automation_executions',
+     ['clinic_id', sa.text('triggered_at DESC')], sa.text("status = 'success'")),
+]
+
+
+def _add_months(month, months):
+    index = month.year * 12 + month.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def _create_indexes(table):
+    for name, index_table, columns, where in INDEXES:
+        if index_table == table:
+            op.create_index(name, table, columns, postgresql_where=where)
+
+
+def _set_aside(table, suffix):
+    """Rename a table out of the way, freeing its primary key and foreign key
+    names for the rebuilt table; it is only read from and dropped afterwards"""
+    bind = op.get_bind()
+    renamed = f'{table}_{suffix}'
+    op.rename_table(table, renamed)
+    op.execute(f'ALTER INDEX {table}_pkey RENAME TO {renamed}_pkey')
+    foreign_keys = bind.execute(sa.text(
+        "SELECT conname FROM pg_constraint WHERE conrelid = to_regclass(:table) AND contype = 'f'"
+    ), {'table': renamed}).scalars().all()
+    for name in foreign_keys:
+        op.drop_constraint(name, renamed, type_='foreignkey')
+    return renamed
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    current = date.today().replace(day=1)
+    for table, (key, columns, fallback) in TABLES.items():
+        old = _set_aside(table, 'unpartitioned')
+        op.create_table(
+            table, *columns(), sa.PrimaryKeyConstraint('id', key, name=f'{table}_pkey'),
+            postgresql_partition_by=f'RANGE ({key})'
+        )
+        op.execute(f'CREATE TABLE {table}_default PARTITION OF {table} DEFAULT')
+
+        # One partition per month that has rows, through MONTHS_AHEAD months from now
+        first = bind.execute(sa.text(
+            f"SELECT date_trunc('month', min(COALESCE({key}, {fallback})) AT TIME ZONE 'UTC')::date FROM {old}"
+        )).scalar()
+        month = min(first or current, current)
+        while month <= _add_months(current, MONTHS_AHEAD):
+            upper = _add_months(month, 1)
+            op.execute(
+                f"CREATE TABLE {table}_p{month:%Y_%m} PARTITION OF {table} "
+                f"FOR VALUES FROM ('{month} 00:00:00+00') TO ('{upper} 00:00:00+00')"
+            )
+            month = upper
+
+        names = [column.name for column in columns()]
+        selected = [f'COALESCE({name}, {fallback})' if name == key else name for name in names]
+        op.execute(f"INSERT INTO {table} ({', '.join(names)}) SELECT {', '.join(selected)} FROM {old}")
+        op.drop_table(old)
+        _create_indexes(table)
+        op.execute(f'ANALYZE {table}')
+
+
+def downgrade() -> None:
+    for table, (key, columns, _) in TABLES.items():
+        partitioned = _set_aside(table, 'partitioned')
+        op.create_table(table, *columns(), sa.PrimaryKeyConstraint('id', name=f'{table}_pkey'))
+        op.alter_column(table, key, nullable=True)
+        names = ', '.join(column.name for column in columns())
+        op.execute(f'INSERT INTO {table} ({names}) SELECT {names} FROM {partitioned}')
+        # Drops the parent with its attached partitions; detached (archived) months are left alone
+        op.drop_table(partitioned)
+        _create_indexes(table)
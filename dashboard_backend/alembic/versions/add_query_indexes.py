@@ -0,0 +1,72 @@
+"""Add composite and partial indexes for the dashboard query patterns
+
+Revision ID: add_query_indexes
+Revises: add_invites_table
+Create Date: 2026-10-18
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = 'add_query_indexes'
+down_revision = 'add_invites_table'
+branch_labels = None
+depends_on = None
+
+ACTIVE = sa.text("status <> 'cancelled'")
+
+# (name, table, columns, partial-index predicate)
+INDEXES = [
+    # Day views, needs-attention, analytics and reminders: clinic + date, cancelled excluded
+    ('idx_appointments_clinic_date_active', 'appointments', ['clinic_id', 'date'], ACTIVE),
+    # Schedule day view and slot validation: doctor + date, ordered by start time
+    ('idx_appointments_doctor_date_active', 'appointments', ['doctor_id', 'date', 'start_time'], ACTIVE),
+    # Intake reminders: upcoming appointments still missing intake
+    ('idx_appointments_clinic_date_intake_missing', 'appointments', ['clinic_id', 'date'],
+     sa.text("intake_status = 'missing' AND status <> 'cancelled'")),
+    # Call log lists, voice stats and owner analytics: clinic + created_at range, newest first
+    ('idx_voice_ai_logs_clinic_created', 'voice_ai_logs', ['clinic_id', sa.text('created_at DESC')], None),
+    # Execution history, newest first, per clinic and per rule
+    ('idx_automation_executions_clinic_triggered', 'automation_executions',
+     ['clinic_id', sa.text('triggered_at DESC')], None),
+    ('idx_automation_executions_rule_triggered', 'automation_executions',
+     ['rule_id', sa.text('triggered_at DESC')], None),
+    # Dashboard recent activity: latest successful executions
+    ('idx_automation_executions_clinic_success', 'automation_executions',
+     ['clinic_id', sa.text('triggered_at DESC')], sa.text("status = 'success'")),
+    # Rule lookup on every appointment event (AutomationEngine.get_active_rules)
+    ('idx_automation_rules_clinic_event_enabled', 'automation_rules',
+     ['clinic_id', 'trigger_event', sa.text('priority DESC')], sa.text('enabled')),
+    ('idx_intake_forms_appointment', 'intake_forms', ['appointment_id'], None),
+    ('idx_intake_forms_clinic_submitted', 'intake_forms', ['clinic_id', 'submitted_at'], None),
+    ('idx_ai_intake_summaries_appointment', 'ai_intake_summaries', ['appointment_id'], None),
+    ('idx_ai_intake_summaries_intake_form', 'ai_intake_summaries', ['intake_form_id'], None),
+    # Invite lists and pending counts
+    ('idx_invites_clinic_status', 'invites', ['clinic_id', 'status', 'role'], None),
+]
+
+# Single-column indexes that are now a prefix of a composite above
+SUPERSEDED = [
+    ('idx_voice_ai_logs_clinic', 'voice_ai_logs', ['clinic_id']),
+    ('idx_automation_executions_clinic', 'automation_executions', ['clinic_id']),
+    ('idx_automation_executions_rule', 'automation_executions', ['rule_id']),
+    ('ix_invites_clinic_id', 'invites', ['clinic_id']),
+]
+
+
+def upgrade() -> None:
+    # CONCURRENTLY so large tables stay writable; it can't run inside a transaction
+    with op.get_context().autocommit_block():
+        for name, table, columns, where in INDEXES:
+            op.create_index(name, table, columns, postgresql_where=where, postgresql_concurrently=True)
+        for name, table, _ in SUPERSEDED:
+            op.drop_index(name, table_name=table, postgresql_concurrently=True)
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, table, columns in SUPERSEDED:
+            op.create_index(name, table, columns, postgresql_concurrently=True)
+        for name, table, _, _ in reversed(INDEXES):
+            op.drop_index(name, table_name=table, postgresql_concurrently=True)
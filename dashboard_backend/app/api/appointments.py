@@ -1,5 +1,6 @@
 from fastapi import APIRouter, Depends, HTTPException, status, Query
 from sqlalchemy.orm import Session, joinedload
+from sqlalchemy import func
 from typing import List, Optional
 from uuid import UUID
 from datetime import date, datetime
@@ -13,14 +14,69 @@ from app.schemas.appointment import (
     AppointmentCreate, AppointmentUpdate, AppointmentResponse, AppointmentList,
     AppointmentConfirm, AppointmentCancel, AppointmentArrive
 )
-from app.api.deps import get_current_user, require_admin, require_admin_or_doctor, require_owner_or_admin
+from app.api.deps import get_current_user, require_admin, require_admin_or_doctor, require_owner_or_admin, get_read_db
+from app.api.sparse import Computed, FastJSONResponse, FieldSet
 from app.models.user import User
 from app.services.scheduling_service import validate_appointment_creation
+from app.services.live_updates import publish_event, appointment_delta
 
 router = APIRouter(prefix="/api/appointments", tags=["appointments"])
 
 
-@router.get("", response_model=AppointmentList)
+APPOINTMENT_FIELDS = FieldSet(
+    columns={
+        "id": Appointment.id,
+        "clinic_id": Appointment.clinic_id,
+        "doctor_id": Appointment.doctor_id,
+        "patient_id": Appointment.patient_id,
+        "date": Appointment.date,
+        "start_time": Appointment.start_time,
+        "end_time": Appointment.end_time,
+        "duration": Appointment.duration,
+        "visit_type": Appointment.visit_type,
+        "visit_category": Appointment.visit_category,
+        "status": Appointment.status,
+        "intake_status": Appointment.intake_status,
+        "arrived": Appointment.arrived,
+        "arrived_at": Appointment.arrived_at,
+        "meeting_link": Appointment.meeting_link,
+        "created_at": Appointment.created_at,
+        "updated_at": Appointment.updated_at,
+    },
+    groups={
+        "doctor": {
+            "id": Doctor.id,
+            "clinic_id": Doctor.clinic_id,
+            "name": Doctor.name,
+            "initials": Doctor.initials,
+            "specialty": Doctor.specialty,
+            "color": Doctor.color,
+            "created_at": Doctor.created_at,
+        },
+        "patient": {
+            "id": Patient.id,
+            "clinic_id": Patient.clinic_id,
+            "first_name": Patient.first_name,
+            "last_name": Patient.last_name,
+            "full_name": Computed(lambda p: f"{p['first_name']} {p['last_name']}"),
+            "email": Patient.email,
+            "phone": Patient.phone,
+            "date_of_birth": Patient.date_of_birth,
+            "created_at": Patient.created_at,
+            "updated_at": Patient.updated_at,
+        },
+    }
+)
+
+
+@router.get(
+    "",
+    response_model=None,
+    responses={200: {
+        "model": AppointmentList,
+        "description": "Appointments with only the requested `fields` (every field by default)",
+    }},
+)
 def list_appointments(
     skip: int = 0,
     limit: int = 100,
@@ -28,38 +84,44 @@ def list_appointments(
     doctor_id: Optional[UUID] = None,
     status_filter: Optional[str] = Query(None, alias="status"),
     intake_status: Optional[str] = None,
+    fields: Optional[str] = Query(None, description="Comma-separated fields, e.g. id,date,start_time,status,patient"),
     current_user: User = Depends(require_admin_or_doctor),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_read_db)
 ):
     """List appointments with filters and role-based access"""
-    query = db.query(Appointment).options(
-        joinedload(Appointment.doctor),
-        joinedload(Appointment.patient)
-    ).filter(
-        Appointment.clinic_id == current_user.clinic_id
-    )
+    selected = APPOINTMENT_FIELDS.parse(fields)
+    filters = [Appointment.clinic_id == current_user.clinic_id]
     
     # Role-based filtering
     if current_user.role == "doctor":
-        query = query.filter(Appointment.doctor_id == current_user.doctor_id)
+        filters.append(Appointment.doctor_id == current_user.doctor_id)
     
     # Apply filters
     if date:
-        query = query.filter(Appointment.date == date)
+        filters.append(Appointment.date == date)
     if doctor_id:
-        query = query.filter(Appointment.doctor_id == doctor_id)
+        filters.append(Appointment.doctor_id == doctor_id)
     if status_filter:
-        query = query.filter(Appointment.status == status_filter)
+        filters.append(Appointment.status == status_filter)
     if intake_status:
-        query = query.filter(Appointment.intake_status == intake_status)
+        filters.append(Appointment.intake_status == intake_status)
     
-    appointments = query.order_by(Appointment.date, Appointment.start_time).offset(skip).limit(limit).all()
-    total = query.count()
+    total = db.query(func.count(Appointment.id)).filter(*filters).scalar()
     
-    return AppointmentList(
-        items=[AppointmentResponse.model_validate(apt) for apt in appointments],
-        total=total
-    )
+    # Column-only select: rows are tuples, no ORM objects or per-row pydantic models
+    query = db.query(*APPOINTMENT_FIELDS.select(selected)).select_from(Appointment)
+    if "doctor" in selected:
+        query = query.outerjoin(Doctor, Doctor.id == Appointment.doctor_id)
+    if "patient" in selected:
+        query = query.outerjoin(Patient, Patient.id == Appointment.patient_id)
+    rows = query.filter(*filters).order_by(
+        Appointment.date, Appointment.start_time
+    ).offset(skip).limit(limit).all()
+    
+    return FastJSONResponse({
+        "items": APPOINTMENT_FIELDS.to_dicts(rows, selected),
+        "total": total
+    })
 
 
 @router.get("/{appointment_id}", response_model=AppointmentResponse)
@@ -146,6 +208,8 @@ def create_appointment(
         joinedload(Appointment.clinic)
     ).filter(Appointment.id == appointment.id).first()
     
+    publish_event(appointment.clinic_id, "appointment.created", appointment_delta(appointment))
+    
     # Trigger automation rules for appointment_created (respects clinic settings)
     if settings.AUTOMATION_ENABLED:
         from app.services.automation_service import AutomationService
@@ -171,6 +235,7 @@ def update_appointment(
     if not appointment:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Appointment not found")
     
+    previous_date = appointment.date
     update_data = appointment_data.model_dump(exclude_unset=True)
     for field, value in update_data.items():
         setattr(appointment, field, value)
@@ -184,6 +249,11 @@ def update_appointment(
         joinedload(Appointment.patient)
     ).filter(Appointment.id == appointment.id).first()
     
+    publish_event(
+        appointment.clinic_id, "appointment.updated",
+        {**appointment_delta(appointment), "previous_date": previous_date}
+    )
+    
     return AppointmentResponse.model_validate(appointment)
 
 
@@ -212,6 +282,8 @@ def confirm_appointment(
         joinedload(Appointment.patient)
     ).filter(Appointment.id == appointment.id).first()
     
+    publish_event(appointment.clinic_id, "appointment.confirmed", appointment_delta(appointment))
+    
     return AppointmentResponse.model_validate(appointment)
 
 
@@ -253,6 +325,8 @@ def cancel_appointment(
         joinedload(Appointment.patient)
     ).filter(Appointment.id == appointment.id).first()
     
+    publish_event(appointment.clinic_id, "appointment.cancelled", appointment_delta(appointment))
+    
     return AppointmentResponse.model_validate(appointment)
 
 
@@ -282,5 +356,7 @@ def mark_arrived(
         joinedload(Appointment.patient)
     ).filter(Appointment.id == appointment.id).first()
     
+    publish_event(appointment.clinic_id, "appointment.arrived", appointment_delta(appointment))
+    
     return AppointmentResponse.model_validate(appointment)
 
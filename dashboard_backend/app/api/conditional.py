@@ -0,0 +1,44 @@
+from fastapi import HTTPException, Request, Response, status
+from typing import List, Optional
+from datetime import date
+import hashlib
+import time
+from app.config import settings
+from app.models.user import User
+from app.services.change_versions import CLINIC_SETTINGS, get_versions
+
+
+def check_not_modified(
+    request: Request,
+    response: Response,
+    current_user: User,
+    days: Optional[List[date]] = None,
+    kinds: Optional[List[str]] = None
+) -> None:
+    """
+    Set a weak ETag from the clinic's change versions and answer a matching
+    If-None-Match with 304 before the endpoint runs its queries.
+
+    Pass the appointment dates a day view depends on as `days`; range and
+    analytics views (days=None) use the clinic-wide version. A day view that
+    also shows other data (e.g. voice-log alerts) names its version kinds in
+    `kinds`, so any write of those kinds changes the tag. Every tag includes
+    the clinic-settings version (time/date formats). The tag also covers
+    the path, query string, user (role-based filtering), today's date and a
+    staleness bucket (see app/services/change_versions.py).
+    """
+    versions = get_versions(current_user.clinic_id, days, kinds=[CLINIC_SETTINGS, *(kinds or [])])
+    if versions is None:
+        return
+    
+    bucket = int(time.time() // settings.ETAG_MAX_STALENESS_SECONDS)
+    query = "&".join(f"{k}={v}" for k, v in sorted(request.query_params.multi_items()))
+    raw = f"{request.url.path}?{query}|{current_user.id}|{date.today()}|{versions}|{bucket}"
+    etag = f'W/"{hashlib.sha1(raw.encode()).hexdigest()[:24]}"'
+    headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+    
+    if_none_match = request.headers.get("If-None-Match", "")
+    if if_none_match.strip() == "*" or etag in [t.strip() for t in if_none_match.split(",")]:
+        raise HTTPException(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    
+    response.headers.update(headers)
@@ -1,4 +1,4 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Request, Response
 from sqlalchemy.orm import Session, joinedload
 from sqlalchemy import func, and_, or_
 from typing import Optional, List, Dict, Any
@@ -9,13 +9,19 @@ from app.models.doctor import Doctor
 from app.models.patient import Patient
 from app.models.intake import AIIntakeSummary
 from app.models.owner import ClinicSettings, VoiceAILog, AutomationExecution
-from app.api.deps import get_current_user, require_admin, require_doctor
+from app.api.deps import get_current_user, require_admin, require_doctor, get_read_db
+from app.api.conditional import check_not_modified
+from app.services.change_versions import VOICE_LOGS
 from app.models.user import User
 from app.utils.date_format import format_time
 from pydantic import BaseModel
 
 router = APIRouter(prefix="/api/dashboard", tags=["dashboard"])
 
+# Recent activity only looks this far back, so the log queries prune to the
+# latest monthly partitions instead of probing every month
+RECENT_ACTIVITY_DAYS = 30
+
 
 # Response Models
 class Stats(BaseModel):
@@ -126,14 +132,19 @@ class AdminDashboardAnalyticsResponse(BaseModel):
 
 @router.get("/admin", response_model=AdminDashboardResponse)
 def get_admin_dashboard(
+    request: Request,
+    response: Response,
     date_param: Optional[date] = Query(None, alias="date"),
     current_user: User = Depends(require_admin),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_read_db)
 ):
     """Get admin dashboard stats"""
     if date_param is None:
         date_param = date.today()
     
+    # voice_ai_alerts counts the last 24h of calls, whatever day is shown
+    check_not_modified(request, response, current_user, days=[date_param], kinds=[VOICE_LOGS])
+    
     # Get clinic settings for formatting
     clinic_settings = db.query(ClinicSettings).filter(
         ClinicSettings.clinic_id == current_user.clinic_id
@@ -223,14 +234,18 @@ def get_admin_dashboard(
 
 @router.get("/doctor", response_model=DoctorDashboardResponse)
 def get_doctor_dashboard(
+    request: Request,
+    response: Response,
     date_param: Optional[date] = Query(None, alias="date"),
     current_user: User = Depends(require_doctor),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_read_db)
 ):
     """Get doctor dashboard stats"""
     if date_param is None:
         date_param = date.today()
     
+    check_not_modified(request, response, current_user, days=[date_param])
+    
     # Get clinic settings for formatting
     clinic_settings = db.query(ClinicSettings).filter(
         ClinicSettings.clinic_id == current_user.clinic_id
@@ -311,13 +326,17 @@ def get_doctor_dashboard(
 
 @router.get("/needs-attention", response_model=NeedsAttentionResponse)
 def get_needs_attention(
+    request: Request,
+    response: Response,
     filter_type: Optional[str] = Query("all", alias="filter"),
     current_user: User = Depends(require_admin),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_read_db)
 ):
     """Get items needing attention"""
     today = date.today()
     
+    check_not_modified(request, response, current_user, days=[today])
+    
     # Get clinic settings for formatting
     clinic_settings = db.query(ClinicSettings).filter(
         ClinicSettings.clinic_id == current_user.clinic_id
@@ -386,11 +405,15 @@ def get_needs_attention(
 
 @router.get("/admin/analytics", response_model=AdminDashboardAnalyticsResponse)
 def get_admin_dashboard_analytics(
+    request: Request,
+    response: Response,
     current_user: User = Depends(require_admin),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_read_db)
 ):
     """Get analytics data for admin dashboard (charts and recent activity)"""
     
+    check_not_modified(request, response, current_user, days=None)
+    
     # Get clinic settings for formatting
     clinic_settings = db.query(ClinicSettings).filter(
         ClinicSettings.clinic_id == current_user.clinic_id
@@ -439,6 +462,7 @@ def get_admin_dashboard_analytics(
     
     # Get recent activity (last 20 items from AutomationExecution and VoiceAILog)
     recent_activity_items = []
+    recent_since = datetime.now() - timedelta(days=RECENT_ACTIVITY_DAYS)
     
     # Get recent automation executions
     automation_executions = db.query(AutomationExecution).options(
@@ -447,7 +471,8 @@ def get_admin_dashboard_analytics(
         joinedload(AutomationExecution.rule)
     ).filter(
         AutomationExecution.clinic_id == current_user.clinic_id,
-        AutomationExecution.status == "success"
+        AutomationExecution.status == "success",
+        AutomationExecution.triggered_at >= recent_since
     ).order_by(AutomationExecution.triggered_at.desc()).limit(10).all()
     
     for exec in automation_executions:
@@ -485,7 +510,8 @@ def get_admin_dashboard_analytics(
         joinedload(VoiceAILog.appointment)
     ).filter(
         VoiceAILog.clinic_id == current_user.clinic_id,
-        VoiceAILog.status.in_(["completed", "failed", "escalated"])
+        VoiceAILog.status.in_(["completed", "failed", "escalated"]),
+        VoiceAILog.created_at >= recent_since
     ).order_by(VoiceAILog.created_at.desc()).limit(10).all()
     
     for call in voice_calls:
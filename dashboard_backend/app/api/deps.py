@@ -1,9 +1,10 @@
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
-from sqlalchemy.orm import Session
-from app.database import get_db
+from sqlalchemy.orm import Session, sessionmaker
+from app.database import get_db, engine, read_engine, SessionLocal, ReadSessionLocal
 from app.models.user import User
 from app.core.security import decode_access_token
+from app.services.read_routing import is_pinned_to_primary
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="api/auth/login")
 
@@ -92,3 +93,32 @@ def require_owner_admin_or_doctor(current_user: User = Depends(get_current_user)
             detail="Owner, Admin, or Doctor access required"
         )
     return current_user
+
+
+def get_read_session_factory(current_user: User = Depends(get_current_user)) -> sessionmaker:
+    """Read replica sessions, or the primary's when there is no replica or the
+    caller (or their clinic) wrote within READ_AFTER_WRITE_PRIMARY_SECONDS"""
+    if read_engine is engine or is_pinned_to_primary(current_user.id, current_user.clinic_id):
+        return SessionLocal
+    return ReadSessionLocal
+
+
+def get_read_db(
+    session_factory: sessionmaker = Depends(get_read_session_factory),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """Database session for read-only endpoints (see get_read_session_factory).
+    Reads on the primary reuse the request's get_db session. Reads on the
+    replica first close that session, so the request holds one connection, and
+    move current_user into the replica session for its lazy loads."""
+    if session_factory is SessionLocal:
+        yield db
+        return
+    db.close()
+    replica = session_factory()
+    replica.add(current_user)
+    try:
+        yield replica
+    finally:
+        replica.close()
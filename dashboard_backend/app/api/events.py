@@ -0,0 +1,101 @@
+from fastapi import APIRouter, HTTPException, Query, Request, status
+from fastapi.responses import StreamingResponse
+from starlette.concurrency import run_in_threadpool
+from typing import Optional
+import asyncio
+import json
+from app.config import settings
+from app.core.security import decode_access_token
+from app.database import SessionLocal
+from app.models.user import User
+from app.services.live_updates import broker
+
+router = APIRouter(prefix="/api/events", tags=["events"])
+
+
+def _authenticate(request: Request, access_token: Optional[str]) -> User:
+    """Bearer header, or ?access_token= for EventSource (which can't set headers)"""
+    auth_header = request.headers.get("Authorization", "")
+    token = auth_header[7:] if auth_header.lower().startswith("bearer ") else access_token
+    credentials_exception = HTTPException(
+        status_code=status.HTTP_401_UNAUTHORIZED,
+        detail="Could not validate credentials",
+        headers={"WWW-Authenticate": "Bearer"},
+    )
+    if not token:
+        raise credentials_exception
+    try:
+        user_id = decode_access_token(token).get("sub")
+    except ValueError:
+        raise credentials_exception
+    if user_id is None:
+        raise credentials_exception
+
+    # Short-lived session: a stream can stay open for hours and must not hold a connection
+    db = SessionLocal()
+    try:
+        user = db.query(User).filter(User.id == user_id).first()
+        if user is None:
+            raise credentials_exception
+        db.expunge(user)
+        return user
+    finally:
+        db.close()
+
+
+def _visible_to(user: User, event: dict) -> bool:
+    """Doctors only receive deltas for their own appointments"""
+    if user.role != "doctor":
+        return True
+    doctor_id = event.get("data", {}).get("doctor_id")
+    return doctor_id is None or doctor_id == str(user.doctor_id)
+
+
+def _format(event: dict, event_id: int) -> str:
+    return f"id: {event_id}\nevent: {event['type']}\ndata: {json.dumps(event['data'])}\n\n"
+
+
+@router.get("/stream")
+async def stream_events(
+    request: Request,
+    access_token: Optional[str] = Query(None)
+):
+    """
+    Server-sent events with compact deltas for the user's clinic
+
+    Each (re)connect starts with a `ready` event: load the dashboard / day
+    schedule then, and apply these deltas afterwards: appointment.created,
+    appointment.updated, appointment.confirmed, appointment.cancelled,
+    appointment.arrived, intake.submitted, automation.executed,
+    voice_log.updated. A `resync` event means deltas were dropped; reload.
+    """
+    user = await run_in_threadpool(_authenticate, request, access_token)
+    if user.role not in ["owner", "admin", "doctor"]:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Not enough permissions")
+    if not settings.LIVE_UPDATES_ENABLED:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Live updates are disabled")
+
+    async def event_stream():
+        queue = broker.subscribe(user.clinic_id)
+        event_id = 0
+        try:
+            yield "retry: 3000\nevent: ready\ndata: {}\n\n"
+            while True:
+                try:
+                    event = await asyncio.wait_for(queue.get(), timeout=settings.LIVE_UPDATES_HEARTBEAT_SECONDS)
+                except asyncio.TimeoutError:
+                    if await request.is_disconnected():
+                        break
+                    yield ": ping\n\n"
+                    continue
+                if _visible_to(user, event):
+                    event_id += 1
+                    yield _format(event, event_id)
+        finally:
+            broker.unsubscribe(user.clinic_id, queue)
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
@@ -0,0 +1,209 @@
+from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi.responses import StreamingResponse
+from sqlalchemy.orm import Session, sessionmaker
+from typing import Optional
+from uuid import UUID
+from datetime import date, datetime
+from app.models.appointment import Appointment
+from app.models.doctor import Doctor
+from app.models.patient import Patient
+from app.models.owner import VoiceAILog, AutomationExecution, AutomationRule
+from app.api.deps import require_admin_or_doctor, require_owner_or_admin, get_read_session_factory
+from app.models.user import User
+from app.services.export_service import (
+    STR, UUID_, INT, BOOL, DATE, TIME, DATETIME, JSON, export_stream, parquet_available
+)
+
+router = APIRouter(prefix="/api/exports", tags=["exports"])
+
+FORMAT_PATTERN = "^(csv|parquet)$"
+MEDIA_TYPES = {"csv": "text/csv", "parquet": "application/vnd.apache.parquet"}
+
+
+def _export_response(
+    name: str, columns, build_query, export_format: str, session_factory: sessionmaker
+) -> StreamingResponse:
+    if export_format == "parquet" and not parquet_available():
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Parquet export is not available on this server (pyarrow not installed)"
+        )
+    filename = f"{name}-{date.today().isoformat()}.{export_format}"
+    return StreamingResponse(
+        export_stream(columns, build_query, export_format, session_factory),
+        media_type=MEDIA_TYPES[export_format],
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'}
+    )
+
+
+APPOINTMENT_COLUMNS = [
+    ("id", Appointment.id, UUID_),
+    ("date", Appointment.date, DATE),
+    ("start_time", Appointment.start_time, TIME),
+    ("end_time", Appointment.end_time, TIME),
+    ("duration", Appointment.duration, INT),
+    ("doctor_id", Appointment.doctor_id, UUID_),
+    ("doctor_name", Doctor.name, STR),
+    ("patient_id", Appointment.patient_id, UUID_),
+    ("patient_first_name", Patient.first_name, STR),
+    ("patient_last_name", Patient.last_name, STR),
+    ("visit_type", Appointment.visit_type, STR),
+    ("visit_category", Appointment.visit_category, STR),
+    ("status", Appointment.status, STR),
+    ("intake_status", Appointment.intake_status, STR),
+    ("arrived", Appointment.arrived, BOOL),
+    ("arrived_at", Appointment.arrived_at, DATETIME),
+    ("created_at", Appointment.created_at, DATETIME),
+]
+
+
+@router.get("/appointments")
+def export_appointments(
+    export_format: str = Query("csv", alias="format", pattern=FORMAT_PATTERN),
+    date: Optional[date] = None,
+    date_from: Optional[date] = None,
+    date_to: Optional[date] = None,
+    doctor_id: Optional[UUID] = None,
+    status_filter: Optional[str] = Query(None, alias="status"),
+    intake_status: Optional[str] = None,
+    current_user: User = Depends(require_admin_or_doctor),
+    session_factory: sessionmaker = Depends(get_read_session_factory)
+):
+    """Stream appointments as CSV or Parquet - same filters as /api/appointments, plus a date range"""
+    clinic_id = current_user.clinic_id
+    is_doctor = current_user.role == "doctor"
+    own_doctor_id = current_user.doctor_id
+
+    def build_query(db: Session):
+        query = db.query(*[column for _, column, _ in APPOINTMENT_COLUMNS]).join(
+            Doctor, Doctor.id == Appointment.doctor_id
+        ).join(
+            Patient, Patient.id == Appointment.patient_id
+        ).filter(
+            Appointment.clinic_id == clinic_id
+        )
+
+        # Doctors only export their own appointments
+        if is_doctor:
+            query = query.filter(Appointment.doctor_id == own_doctor_id)
+
+        if date:
+            query = query.filter(Appointment.date == date)
+        if date_from:
+            query = query.filter(Appointment.date >= date_from)
+        if date_to:
+            query = query.filter(Appointment.date <= date_to)
+        if doctor_id:
+            query = query.filter(Appointment.doctor_id == doctor_id)
+        if status_filter:
+            query = query.filter(Appointment.status == status_filter)
+        if intake_status:
+            query = query.filter(Appointment.intake_status == intake_status)
+
+        return query.order_by(Appointment.date, Appointment.start_time, Appointment.id)
+
+    return _export_response("appointments", APPOINTMENT_COLUMNS, build_query, export_format, session_factory)
+
+
+VOICE_LOG_COLUMNS = [
+    ("id", VoiceAILog.id, UUID_),
+    ("appointment_id", VoiceAILog.appointment_id, UUID_),
+    ("patient_id", VoiceAILog.patient_id, UUID_),
+    ("call_sid", VoiceAILog.call_sid, STR),
+    ("call_type", VoiceAILog.call_type, STR),
+    ("direction", VoiceAILog.direction, STR),
+    ("status", VoiceAILog.status, STR),
+    ("outcome", VoiceAILog.outcome, STR),
+    ("initiated_at", VoiceAILog.initiated_at, DATETIME),
+    ("answered_at", VoiceAILog.answered_at, DATETIME),
+    ("ended_at", VoiceAILog.ended_at, DATETIME),
+    ("duration_seconds", VoiceAILog.duration_seconds, INT),
+    ("escalated", VoiceAILog.escalated, BOOL),
+    ("escalation_reason", VoiceAILog.escalation_reason, STR),
+    ("from_number", VoiceAILog.from_number, STR),
+    ("to_number", VoiceAILog.to_number, STR),
+    ("created_at", VoiceAILog.created_at, DATETIME),
+]
+
+
+@router.get("/voice-logs")
+def export_voice_logs(
+    export_format: str = Query("csv", alias="format", pattern=FORMAT_PATTERN),
+    status_filter: Optional[str] = Query(None, alias="status"),
+    call_type: Optional[str] = None,
+    date_from: Optional[date] = None,
+    date_to: Optional[date] = None,
+    include_transcript: bool = False,
+    current_user: User = Depends(require_owner_or_admin),
+    session_factory: sessionmaker = Depends(get_read_session_factory)
+):
+    """Stream voice AI call logs - same filters as /api/owner/voice-ai/logs; transcripts on request"""
+    clinic_id = current_user.clinic_id
+    columns = VOICE_LOG_COLUMNS + ([("transcript", VoiceAILog.transcript, STR)] if include_transcript else [])
+
+    def build_query(db: Session):
+        query = db.query(*[column for _, column, _ in columns]).filter(
+            VoiceAILog.clinic_id == clinic_id
+        )
+
+        if status_filter:
+            query = query.filter(VoiceAILog.status == status_filter)
+        if call_type:
+            query = query.filter(VoiceAILog.call_type == call_type)
+        if date_from:
+            query = query.filter(VoiceAILog.created_at >= datetime.combine(date_from, datetime.min.time()))
+        if date_to:
+            query = query.filter(VoiceAILog.created_at <= datetime.combine(date_to, datetime.max.time()))
+
+        return query.order_by(VoiceAILog.created_at.desc(), VoiceAILog.id)
+
+    return _export_response("voice-logs", columns, build_query, export_format, session_factory)
+
+
+EXECUTION_COLUMNS = [
+    ("id", AutomationExecution.id, UUID_),
+    ("rule_id", AutomationExecution.rule_id, UUID_),
+    ("rule_name", AutomationRule.name, STR),
+    ("action_type", AutomationRule.action_type, STR),
+    ("appointment_id", AutomationExecution.appointment_id, UUID_),
+    ("patient_id", AutomationExecution.patient_id, UUID_),
+    ("status", AutomationExecution.status, STR),
+    ("result", AutomationExecution.result, JSON),
+    ("error_message", AutomationExecution.error_message, STR),
+    ("triggered_at", AutomationExecution.triggered_at, DATETIME),
+    ("completed_at", AutomationExecution.completed_at, DATETIME),
+]
+
+
+@router.get("/automation-executions")
+def export_automation_executions(
+    export_format: str = Query("csv", alias="format", pattern=FORMAT_PATTERN),
+    rule_id: Optional[UUID] = None,
+    status_filter: Optional[str] = Query(None, alias="status"),
+    date_from: Optional[date] = None,
+    date_to: Optional[date] = None,
+    current_user: User = Depends(require_owner_or_admin),
+    session_factory: sessionmaker = Depends(get_read_session_factory)
+):
+    """Stream automation execution history - same filters as /api/owner/automation/executions, plus a date range"""
+    clinic_id = current_user.clinic_id
+
+    def build_query(db: Session):
+        query = db.query(*[column for _, column, _ in EXECUTION_COLUMNS]).join(
+            AutomationRule, AutomationRule.id == AutomationExecution.rule_id
+        ).filter(
+            AutomationExecution.clinic_id == clinic_id
+        )
+
+        if rule_id:
+            query = query.filter(AutomationExecution.rule_id == rule_id)
+        if status_filter:
+            query = query.filter(AutomationExecution.status == status_filter)
+        if date_from:
+            query = query.filter(AutomationExecution.triggered_at >= datetime.combine(date_from, datetime.min.time()))
+        if date_to:
+            query = query.filter(AutomationExecution.triggered_at <= datetime.combine(date_to, datetime.max.time()))
+
+        return query.order_by(AutomationExecution.triggered_at.desc(), AutomationExecution.id)
+
+    return _export_response("automation-executions", EXECUTION_COLUMNS, build_query, export_format, session_factory)
@@ -1,5 +1,5 @@
 from fastapi import APIRouter, Depends, HTTPException, status, Query
-from sqlalchemy.orm import Session, joinedload
+from sqlalchemy.orm import Session, joinedload, undefer
 from typing import List, Optional
 from uuid import UUID
 from datetime import datetime, date
@@ -10,9 +10,10 @@ from app.schemas.intake import (
     IntakeFormCreate, IntakeFormResponse, AIIntakeSummaryResponse, IntakeMarkComplete
 )
 from app.schemas.intake_list import IntakeFormList
-from app.api.deps import get_current_user, require_admin_or_doctor, require_admin
+from app.api.deps import get_current_user, require_admin_or_doctor, require_admin, get_read_db
 from app.models.user import User
 from app.services.ai_service import generate_intake_summary
+from app.services.live_updates import publish_event, appointment_delta
 
 router = APIRouter(prefix="/api/intake", tags=["intake"])
 
@@ -25,10 +26,11 @@ def list_intake_forms(
     submitted_after: Optional[date] = Query(None, description="Filter by submission date (after)"),
     submitted_before: Optional[date] = Query(None, description="Filter by submission date (before)"),
     current_user: User = Depends(require_admin_or_doctor),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_read_db)
 ):
     """List intake forms with role-based filtering, status, and date filters"""
     query = db.query(IntakeForm).options(
+        undefer(IntakeForm.raw_answers),
         joinedload(IntakeForm.ai_summary)
     ).filter(
         IntakeForm.clinic_id == current_user.clinic_id
@@ -91,6 +93,7 @@ def get_intake_form(
 ):
     """Get single intake form"""
     query = db.query(IntakeForm).options(
+        undefer(IntakeForm.raw_answers),
         joinedload(IntakeForm.ai_summary)
     ).filter(
         IntakeForm.id == form_id,
@@ -165,6 +168,12 @@ def submit_intake_form(
         # Log error but don't fail the request
         print(f"Failed to generate AI summary: {e}")
     
+    # Published after the summary so a refetch triggered by the event includes it
+    publish_event(
+        intake_form.clinic_id, "intake.submitted",
+        {**appointment_delta(appointment), "intake_form_id": intake_form.id}
+    )
+    
     # Load AI summary if exists
     ai_summary = db.query(AIIntakeSummary).filter(
         AIIntakeSummary.intake_form_id == intake_form.id
@@ -208,6 +217,7 @@ def mark_intake_complete(
         intake_form.submitted_at = datetime.utcnow()
     
     # Update appointment if exists
+    appointment = None
     if intake_form.appointment_id:
         appointment = db.query(Appointment).filter(
             Appointment.id == intake_form.appointment_id
@@ -218,6 +228,12 @@ def mark_intake_complete(
     db.commit()
     db.refresh(intake_form)
     
+    if appointment:
+        publish_event(
+            intake_form.clinic_id, "intake.submitted",
+            {**appointment_delta(appointment), "intake_form_id": intake_form.id}
+        )
+    
     # Load AI summary
     ai_summary = db.query(AIIntakeSummary).filter(
         AIIntakeSummary.intake_form_id == intake_form.id
@@ -19,7 +19,7 @@ from app.schemas.invite import (
     BulkInviteCreate,
     BulkInviteResponse
 )
-from app.api.deps import get_current_user, require_owner, require_owner_or_admin
+from app.api.deps import get_current_user, require_owner, require_owner_or_admin, get_read_db
 from app.services.email_service import send_invite_email
 from passlib.context import CryptContext
 
@@ -74,7 +74,7 @@ async def list_invites(
     role_filter: Optional[str] = None,
     skip: int = 0,
     limit: int = 50,
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     current_user: User = Depends(require_owner_or_admin)
 ):
     """List all invites for the clinic"""
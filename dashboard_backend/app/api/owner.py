@@ -1,4 +1,4 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Request, Response
 from sqlalchemy.orm import Session, joinedload
 from sqlalchemy import func, and_, extract
 from typing import Optional, List
@@ -12,8 +12,13 @@ from app.models.owner import (
     OwnerMetrics, VoiceAILog, AutomationRule, 
     AutomationExecution, ClinicSettings, DoctorCapacity
 )
-from app.api.deps import get_current_user, require_owner, require_owner_admin_or_doctor
+from app.api.deps import get_current_user, require_owner, require_owner_admin_or_doctor, get_read_db
+from app.api.conditional import check_not_modified
+from app.api.sparse import FastJSONResponse, FieldSet
 from app.models.user import User
+from app.services.change_versions import CLINIC_SETTINGS, VOICE_LOGS, bump_versions, get_kind_version, get_range_version
+from app.services.response_cache import cache_key, get_or_compute
+from app.services.live_updates import publish_event, voice_log_delta
 from app.schemas.owner import (
     OwnerDashboardResponse, HeroMetric, NoShowByDoctor, NoShowByVisitType,
     NoShowByDayOfWeek, FollowUpData, AdminEfficiency, DoctorCapacitySummary,
@@ -26,6 +31,8 @@ import uuid
 
 router = APIRouter(prefix="/api/owner", tags=["owner"])
 
+PERIOD_DAYS = {"week": 7, "month": 30, "quarter": 90}
+
 
 def require_owner_or_admin(current_user: User = Depends(get_current_user)):
     """Allow owner or admin access"""
@@ -39,15 +46,49 @@ def require_owner_or_admin(current_user: User = Depends(get_current_user)):
 
 @router.get("/dashboard", response_model=OwnerDashboardResponse)
 def get_owner_dashboard(
+    request: Request,
+    response: Response,
     date_param: Optional[date] = Query(None, alias="date"),
     period: str = Query("week", description="week, month, quarter"),
     current_user: User = Depends(require_owner_or_admin),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_read_db)
 ):
     """Get owner dashboard with comprehensive metrics"""
     if date_param is None:
         date_param = date.today()
     
+    check_not_modified(request, response, current_user, days=None)
+    
+    def compute():
+        return _build_owner_dashboard(date_param, period, current_user, db)
+    
+    # The cache entry is versioned by every appointment / voice-log day the dashboard
+    # reads: the previous period, the 6-week trend and the 90-day baseline
+    period_days = PERIOD_DAYS.get(period, 7)
+    appointments_version = get_range_version(
+        current_user.clinic_id, date_param - timedelta(days=max(2 * period_days, 90)), date_param
+    )
+    voice_version = get_range_version(
+        current_user.clinic_id, date_param - timedelta(days=max(2 * period_days, 42)), date_param, VOICE_LOGS
+    )
+    if appointments_version is None or voice_version is None:
+        return compute()
+    
+    key = cache_key(
+        current_user.clinic_id, "owner_dashboard",
+        {"date": date_param, "period": period},
+        f"{appointments_version}:{voice_version}"
+    )
+    return get_or_compute(key, OwnerDashboardResponse, compute)
+
+
+def _build_owner_dashboard(
+    date_param: date,
+    period: str,
+    current_user: User,
+    db: Session
+) -> OwnerDashboardResponse:
+    """Compute the owner dashboard from the database (uncached)"""
     # Calculate date range based on period
     if period == "week":
         start_date = date_param - timedelta(days=7)
@@ -372,7 +413,41 @@ def get_owner_dashboard(
 
 
 # Voice AI Endpoints
-@router.get("/voice-ai/logs", response_model=List[VoiceAILogResponse])
+VOICE_LOG_FIELDS = FieldSet(
+    columns={
+        "id": VoiceAILog.id,
+        "clinic_id": VoiceAILog.clinic_id,
+        "appointment_id": VoiceAILog.appointment_id,
+        "patient_id": VoiceAILog.patient_id,
+        "call_sid": VoiceAILog.call_sid,
+        "call_type": VoiceAILog.call_type,
+        "direction": VoiceAILog.direction,
+        "status": VoiceAILog.status,
+        "outcome": VoiceAILog.outcome,
+        "initiated_at": VoiceAILog.initiated_at,
+        "answered_at": VoiceAILog.answered_at,
+        "ended_at": VoiceAILog.ended_at,
+        "duration_seconds": VoiceAILog.duration_seconds,
+        "transcript": VoiceAILog.transcript,
+        "escalated": VoiceAILog.escalated,
+        "escalation_reason": VoiceAILog.escalation_reason,
+        "from_number": VoiceAILog.from_number,
+        "to_number": VoiceAILog.to_number,
+        "created_at": VoiceAILog.created_at,
+    },
+    # Transcripts can run to many KB per call - list views only return them on request
+    optional=["transcript"]
+)
+
+
+@router.get(
+    "/voice-ai/logs",
+    response_model=None,
+    responses={200: {
+        "model": List[VoiceAILogResponse],
+        "description": "Call logs with only the requested `fields` (transcript only when listed)",
+    }},
+)
 def get_voice_ai_logs(
     skip: int = Query(0, ge=0),
     limit: int = Query(50, ge=1, le=100),
@@ -380,11 +455,13 @@ def get_voice_ai_logs(
     call_type: Optional[str] = None,
     date_from: Optional[date] = None,
     date_to: Optional[date] = None,
+    fields: Optional[str] = Query(None, description="Comma-separated fields; transcript is only returned when listed"),
     current_user: User = Depends(require_owner_or_admin),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_read_db)
 ):
     """Get voice AI call logs"""
-    query = db.query(VoiceAILog).filter(
+    selected = VOICE_LOG_FIELDS.parse(fields)
+    query = db.query(*VOICE_LOG_FIELDS.select(selected)).filter(
         VoiceAILog.clinic_id == current_user.clinic_id
     )
     
@@ -397,29 +474,9 @@ def get_voice_ai_logs(
     if date_to:
         query = query.filter(VoiceAILog.created_at <= datetime.combine(date_to, datetime.max.time()))
     
-    logs = query.order_by(VoiceAILog.created_at.desc()).offset(skip).limit(limit).all()
+    rows = query.order_by(VoiceAILog.created_at.desc()).offset(skip).limit(limit).all()
     
-    return [VoiceAILogResponse(
-        id=str(log.id),
-        clinic_id=str(log.clinic_id),
-        appointment_id=str(log.appointment_id) if log.appointment_id else None,
-        patient_id=str(log.patient_id) if log.patient_id else None,
-        call_sid=log.call_sid,
-        call_type=log.call_type,
-        direction=log.direction,
-        status=log.status,
-        outcome=log.outcome,
-        initiated_at=log.initiated_at,
-        answered_at=log.answered_at,
-        ended_at=log.ended_at,
-        duration_seconds=log.duration_seconds,
-        transcript=log.transcript,
-        escalated=log.escalated,
-        escalation_reason=log.escalation_reason,
-        from_number=log.from_number,
-        to_number=log.to_number,
-        created_at=log.created_at
-    ) for log in logs]
+    return FastJSONResponse(VOICE_LOG_FIELDS.to_dicts(rows, selected))
 
 
 @router.get("/voice-ai/stats", response_model=VoiceAIStatsResponse)
@@ -427,7 +484,7 @@ def get_voice_ai_stats(
     date_from: Optional[date] = None,
     date_to: Optional[date] = None,
     current_user: User = Depends(require_owner_or_admin),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_read_db)
 ):
     """Get voice AI statistics"""
     if date_from is None:
@@ -435,6 +492,28 @@ def get_voice_ai_stats(
     if date_to is None:
         date_to = date.today()
     
+    def compute():
+        return _build_voice_ai_stats(date_from, date_to, current_user, db)
+    
+    # recent_calls lists the latest calls of any day, so any voice-log write invalidates
+    voice_version = get_kind_version(current_user.clinic_id, VOICE_LOGS)
+    if voice_version is None:
+        return compute()
+    
+    key = cache_key(
+        current_user.clinic_id, "voice_ai_stats",
+        {"from": date_from, "to": date_to}, str(voice_version)
+    )
+    return get_or_compute(key, VoiceAIStatsResponse, compute)
+
+
+def _build_voice_ai_stats(
+    date_from: date,
+    date_to: date,
+    current_user: User,
+    db: Session
+) -> VoiceAIStatsResponse:
+    """Compute voice AI statistics from the database (uncached)"""
     logs = db.query(VoiceAILog).filter(
         VoiceAILog.clinic_id == current_user.clinic_id,
         VoiceAILog.created_at >= datetime.combine(date_from, datetime.min.time()),
@@ -465,6 +544,7 @@ def get_voice_ai_stats(
             confirmations_achieved=confirmations,
             success_rate=round(success_rate, 1)
         ),
+        # Transcripts are left out of list views; /voice-ai/logs?fields=...,transcript has them
         recent_calls=[VoiceAILogResponse(
             id=str(log.id),
             clinic_id=str(log.clinic_id),
@@ -479,7 +559,6 @@ def get_voice_ai_stats(
             answered_at=log.answered_at,
             ended_at=log.ended_at,
             duration_seconds=log.duration_seconds,
-            transcript=log.transcript,
             escalated=log.escalated,
             escalation_reason=log.escalation_reason,
             from_number=log.from_number,
@@ -510,6 +589,8 @@ def create_voice_ai_log(
     db.commit()
     db.refresh(log)
     
+    publish_event(log.clinic_id, "voice_log.updated", voice_log_delta(log), version_kind=VOICE_LOGS)
+    
     return VoiceAILogResponse(
         id=str(log.id),
         clinic_id=str(log.clinic_id),
@@ -556,6 +637,8 @@ def update_voice_ai_log(
     db.commit()
     db.refresh(log)
     
+    publish_event(log.clinic_id, "voice_log.updated", voice_log_delta(log), version_kind=VOICE_LOGS)
+    
     return VoiceAILogResponse(
         id=str(log.id),
         clinic_id=str(log.clinic_id),
@@ -771,7 +854,7 @@ def get_automation_executions(
     skip: int = Query(0, ge=0),
     limit: int = Query(50, ge=1, le=100),
     current_user: User = Depends(require_owner_or_admin),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_read_db)
 ):
     """Get automation execution history"""
     query = db.query(AutomationExecution).filter(
@@ -889,6 +972,9 @@ def update_clinic_settings(
     db.commit()
     db.refresh(settings)
     
+    # Time/date formats change every rendered dashboard and day view
+    bump_versions(current_user.clinic_id, kind=CLINIC_SETTINGS)
+    
     logger.info(f"Settings updated successfully. General: timezone={settings.timezone}, time_format={settings.time_format}, date_format={settings.date_format}")
     
     return ClinicSettingsResponse(
@@ -926,7 +1012,7 @@ def get_owner_metrics(
     date_from: Optional[date] = None,
     date_to: Optional[date] = None,
     current_user: User = Depends(require_owner_or_admin),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_read_db)
 ):
     """Get historical owner metrics"""
     if date_from is None:
@@ -965,7 +1051,7 @@ def get_doctor_capacity(
     date_param: Optional[date] = Query(None, alias="date"),
     doctor_id: Optional[str] = None,
     current_user: User = Depends(require_owner_or_admin),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_read_db)
 ):
     """Get doctor capacity data"""
     if date_param is None:
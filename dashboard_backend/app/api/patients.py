@@ -8,7 +8,7 @@ from app.models.patient import Patient
 from app.models.appointment import Appointment
 from app.schemas.patient import PatientCreate, PatientUpdate, PatientResponse, PatientList
 from app.schemas.appointment import AppointmentResponse
-from app.api.deps import get_current_user, require_admin_or_doctor, require_admin
+from app.api.deps import get_current_user, require_admin_or_doctor, require_admin, get_read_db
 from app.models.user import User
 
 router = APIRouter(prefix="/api/patients", tags=["patients"])
@@ -22,7 +22,7 @@ def list_patients(
     created_after: Optional[date] = Query(None, description="Filter by creation date (after)"),
     created_before: Optional[date] = Query(None, description="Filter by creation date (before)"),
     current_user: User = Depends(require_admin_or_doctor),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_read_db)
 ):
     """List patients - role-based filtering with search and date filters"""
     # Build base query based on role
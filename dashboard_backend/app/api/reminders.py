@@ -66,42 +66,56 @@ def trigger_intake_reminders(
         )
 
 
+def _task_state(task) -> Dict[str, Any]:
+    """Celery task state in the shape the status endpoint returns"""
+    if task.state == "PENDING":
+        return {
+            "state": task.state,
+            "status": "Task is waiting to be processed"
+        }
+    elif task.state == "PROGRESS":
+        return {
+            "state": task.state,
+            "current": task.info.get("current", 0),
+            "total": task.info.get("total", 1),
+            "status": task.info.get("status", "")
+        }
+    elif task.state == "SUCCESS":
+        return {
+            "state": task.state,
+            "result": task.result,
+            "status": "Task completed successfully"
+        }
+    return {
+        "state": task.state,
+        "status": str(task.info)
+    }
+
+
 @router.get("/status/{task_id}", response_model=Dict[str, Any])
 def get_task_status(
     task_id: str,
     current_user: User = Depends(require_owner_or_admin)
 ):
     """
-    Get the status of a reminder task
+    Get the status of a reminder task.
+    The send-* tasks only fan the work out to per-clinic tasks, so once one has
+    run this reports on the chord callback that totals them (its aggregate_task_id),
+    with the dispatch summary under "dispatch".
     """
     try:
         from app.celery_app import celery_app
         task = celery_app.AsyncResult(task_id)
-        
-        if task.state == "PENDING":
-            response = {
-                "state": task.state,
-                "status": "Task is waiting to be processed"
-            }
-        elif task.state == "PROGRESS":
-            response = {
-                "state": task.state,
-                "current": task.info.get("current", 0),
-                "total": task.info.get("total", 1),
-                "status": task.info.get("status", "")
-            }
-        elif task.state == "SUCCESS":
-            response = {
-                "state": task.state,
-                "result": task.result,
-                "status": "Task completed successfully"
-            }
-        else:
-            response = {
-                "state": task.state,
-                "status": str(task.info)
-            }
-        
+        response = _task_state(task)
+
+        dispatch = task.result if task.state == "SUCCESS" else None
+        if isinstance(dispatch, dict) and dispatch.get("aggregate_task_id"):
+            aggregate = celery_app.AsyncResult(dispatch["aggregate_task_id"])
+            response = _task_state(aggregate)
+            if aggregate.state == "PENDING":
+                response["status"] = "Reminders dispatched, waiting for the clinic tasks to finish"
+            response["dispatch"] = dispatch
+
         return response
     except Exception as e:
         logger.error(f"Error getting task status: {e}")
@@ -109,4 +123,3 @@ def get_task_status(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Failed to get task status: {str(e)}"
         )
-
@@ -1,4 +1,4 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Request, Response
 from sqlalchemy.orm import Session, joinedload
 from typing import Optional
 from uuid import UUID
@@ -10,6 +10,7 @@ from app.models.patient import Patient
 from app.models.owner import ClinicSettings
 from app.api.deps import get_current_user, require_admin, require_admin_or_doctor, require_owner_or_admin, require_owner_admin_or_doctor
 from app.models.user import User
+from app.api.conditional import check_not_modified
 from app.services.scheduling_service import get_available_slots
 from app.utils.date_format import format_time
 from pydantic import BaseModel
@@ -52,6 +53,8 @@ class AvailableSlotsResponse(BaseModel):
 
 @router.get("/day", response_model=DayScheduleResponse)
 def get_day_schedule(
+    request: Request,
+    response: Response,
     date_param: Optional[date] = Query(None, alias="date"),
     current_user: User = Depends(require_owner_admin_or_doctor),
     db: Session = Depends(get_db)
@@ -60,6 +63,8 @@ def get_day_schedule(
     if date_param is None:
         date_param = date.today()
     
+    check_not_modified(request, response, current_user, days=[date_param])
+    
     # Get clinic settings for formatting
     clinic_settings = db.query(ClinicSettings).filter(
         ClinicSettings.clinic_id == current_user.clinic_id
@@ -121,6 +126,8 @@ def get_day_schedule(
 
 @router.get("/day/{doctor_id}", response_model=DayScheduleResponse)
 def get_doctor_day_schedule(
+    request: Request,
+    response: Response,
     doctor_id: UUID,
     date_param: Optional[date] = Query(None, alias="date"),
     current_user: User = Depends(require_admin_or_doctor),
@@ -130,6 +137,8 @@ def get_doctor_day_schedule(
     if date_param is None:
         date_param = date.today()
     
+    check_not_modified(request, response, current_user, days=[date_param])
+    
     # Verify doctor exists and user has access
     doctor = db.query(Doctor).filter(
         Doctor.id == doctor_id,
@@ -0,0 +1,100 @@
+"""Sparse fieldsets and the Row-tuple fast path for list endpoints
+
+List endpoints take `fields=id,date,status` and select only those columns
+(plus joined groups such as `doctor` / `patient` when asked for) instead of
+loading ORM objects with their relationships. Rows come back as plain tuples,
+are folded into dicts by position, and are encoded with orjson, so no pydantic
+model is built per row. Output matches the model the endpoint documents under
+`responses=` field for field (OPT_UTC_Z keeps datetimes identical to pydantic's
+"Z" form); the route itself sets response_model=None, since FastAPI would not
+validate or filter a Response returned directly anyway.
+"""
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+import orjson
+from fastapi import HTTPException, status
+from fastapi.responses import ORJSONResponse
+
+
+class Computed:
+    """A nested-group field derived from the group's column values, e.g. patient.full_name"""
+
+    def __init__(self, compute: Callable[[Dict[str, Any]], Any]):
+        self.compute = compute
+
+
+class FieldSet:
+    """
+    API field name -> SQL column for one list endpoint.
+
+    `columns` are top-level fields; `groups` are nested objects from joined tables,
+    returned whole (their first column must be the joined row's primary key, used
+    to emit null when an outer join found nothing). A request without `fields=`
+    gets everything except `optional` fields (expensive ones such as transcripts).
+    """
+
+    def __init__(
+        self,
+        columns: Dict[str, Any],
+        groups: Optional[Dict[str, Dict[str, Any]]] = None,
+        optional: Iterable[str] = ()
+    ):
+        self.columns = columns
+        self.groups = groups or {}
+        self.available = list(columns) + list(self.groups)
+        optional = set(optional)
+        self.default = [f for f in self.available if f not in optional]
+
+    def parse(self, fields: Optional[str]) -> List[str]:
+        """Selected field names in declaration order; 400 on unknown names"""
+        if not fields:
+            return self.default
+        requested = {f.strip() for f in fields.split(",") if f.strip()}
+        unknown = sorted(requested - set(self.available))
+        if unknown:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Unknown fields: {', '.join(unknown)}. Available: {', '.join(self.available)}"
+            )
+        return [f for f in self.available if f in requested]
+
+    def select(self, selected: List[str]) -> List[Any]:
+        """Column expressions to pass to db.query(*...) for the selected fields"""
+        exprs = [self.columns[f] for f in selected if f in self.columns]
+        for group in selected:
+            if group in self.groups:
+                exprs.extend(c for c in self.groups[group].values() if not isinstance(c, Computed))
+        return exprs
+
+    def to_dicts(self, rows: Iterable[tuple], selected: List[str]) -> List[Dict[str, Any]]:
+        """Fold rows from select(selected) into response dicts"""
+        flat = [f for f in selected if f in self.columns]
+        groups = []
+        position = len(flat)
+        for group in selected:
+            if group in self.groups:
+                names = [n for n, c in self.groups[group].items() if not isinstance(c, Computed)]
+                computed = [(n, c.compute) for n, c in self.groups[group].items() if isinstance(c, Computed)]
+                groups.append((group, names, computed, position, position + len(names)))
+                position += len(names)
+
+        items = []
+        for row in rows:
+            item = dict(zip(flat, row))
+            for group, names, computed, start, end in groups:
+                if row[start] is None:
+                    item[group] = None
+                    continue
+                nested = dict(zip(names, row[start:end]))
+                for name, compute in computed:
+                    nested[name] = compute(nested)
+                item[group] = nested
+            items.append(item)
+        return items
+
+
+class FastJSONResponse(ORJSONResponse):
+    """orjson response whose datetimes serialize like pydantic's"""
+
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(content, option=orjson.OPT_UTC_Z | orjson.OPT_NON_STR_KEYS)
@@ -1,4 +1,5 @@
 from celery import Celery
+from kombu import Exchange, Queue
 import sys
 from app.config import settings
 
@@ -7,7 +8,7 @@ celery_app = Celery(
     "clinicflow",
     broker=settings.REDIS_URL,
     backend=settings.REDIS_URL,
-    include=["app.tasks.reminders"]
+    include=["app.tasks.reminders", "app.tasks.maintenance"]
 )
 
 # Determine pool type based on OS
@@ -27,6 +28,18 @@ celery_app.conf.update(
     worker_pool=worker_pool,
     worker_concurrency=1 if worker_pool == "solo" else 4,  # Solo is single-threaded
     broker_connection_retry_on_startup=True,  # Fix deprecation warning
+    # Per-clinic reminder sub-tasks go to their own queue, routed by kind
+    # (reminders.confirmation / reminders.intake) so a deployment can bind
+    # dedicated workers to either; workers consume both queues by default
+    task_default_queue="celery",
+    task_queues=(
+        Queue("celery", Exchange("celery"), routing_key="celery"),
+        Queue("reminders", Exchange("reminders", type="topic"), routing_key="reminders.#"),
+    ),
+    task_routes={
+        "app.tasks.reminders.*_for_clinics": {"queue": "reminders", "exchange": "reminders"},
+    },
+    worker_prefetch_multiplier=1,  # Clinics take uneven time; hand them out one at a time
     beat_schedule={
         "send-confirmation-reminders": {
             "task": "app.tasks.reminders.send_confirmation_reminders",
@@ -36,6 +49,10 @@ celery_app.conf.update(
             "task": "app.tasks.reminders.send_intake_reminders",
             "schedule": 3600.0,  # Run every hour
         },
+        "maintain-log-partitions": {
+            "task": "app.tasks.maintenance.maintain_partitions",
+            "schedule": 86400.0,  # Run daily
+        },
     },
 )
 
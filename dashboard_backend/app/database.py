@@ -11,6 +11,15 @@ engine = create_engine(
 
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# Optional read replica; without one, reads share the primary engine
+read_engine = create_engine(
+    settings.DATABASE_READ_URL,
+    pool_pre_ping=True,
+    echo=settings.DEBUG
+) if settings.DATABASE_READ_URL else engine
+
+ReadSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=read_engine)
+
 Base = declarative_base()
 
 
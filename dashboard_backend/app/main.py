@@ -1,11 +1,27 @@
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from app.config import settings
+from app.services.http_clients import UPSTREAMS, close_http_clients, get_http_client
+from app.services.live_updates import broker
+from app.services.read_routing import PrimaryPinMiddleware
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Open the shared outbound HTTP clients on startup; on shutdown close them and the live-update subscription"""
+    for name in UPSTREAMS:
+        get_http_client(name)
+    yield
+    await broker.stop()
+    await close_http_clients()
+
 
 app = FastAPI(
     title="ClinicFlow API",
     description="Backend API for ClinicFlow medical clinic management system",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan
 )
 
 
@@ -18,6 +34,9 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Read-your-writes for replica-backed endpoints
+app.add_middleware(PrimaryPinMiddleware)
+
 
 @app.get("/health")
 async def health_check():
@@ -26,7 +45,7 @@ async def health_check():
 
 
 # Import and mount routers
-from app.api import auth, doctors, patients, appointments, schedule, intake, dashboard, owner, invites, reminders
+from app.api import auth, doctors, patients, appointments, schedule, intake, dashboard, owner, invites, reminders, events, exports
 
 # Mount routers - order matters for route resolution
 app.include_router(auth.router)
@@ -39,6 +58,8 @@ app.include_router(dashboard.router)
 app.include_router(owner.router)
 app.include_router(invites.router)
 app.include_router(reminders.router)
+app.include_router(events.router)
+app.include_router(exports.router)
 
 
 
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, Date, Time, Integer, Boolean, DateTime, ForeignKey, CheckConstraint, Index, func
+from sqlalchemy import Column, String, Date, Time, Integer, Boolean, DateTime, ForeignKey, CheckConstraint, Index, func, text
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 import uuid
@@ -48,5 +48,11 @@ class Appointment(Base):
         Index("idx_appointments_clinic_date", "clinic_id", "date"),
         Index("idx_appointments_doctor_date", "doctor_id", "date"),
         Index("idx_appointments_patient", "patient_id"),
+        Index("idx_appointments_clinic_date_active", "clinic_id", "date",
+              postgresql_where=text("status <> 'cancelled'")),
+        Index("idx_appointments_doctor_date_active", "doctor_id", "date", "start_time",
+              postgresql_where=text("status <> 'cancelled'")),
+        Index("idx_appointments_clinic_date_intake_missing", "clinic_id", "date",
+              postgresql_where=text("intake_status = 'missing' AND status <> 'cancelled'")),
     )
 
@@ -1,6 +1,6 @@
-from sqlalchemy import Column, String, DateTime, ForeignKey, CheckConstraint, func, Text
+from sqlalchemy import Column, String, DateTime, ForeignKey, CheckConstraint, Index, func, Text
 from sqlalchemy.dialects.postgresql import UUID, JSONB, ARRAY
-from sqlalchemy.orm import relationship
+from sqlalchemy.orm import relationship, deferred
 import uuid
 from app.database import Base
 
@@ -13,7 +13,7 @@ class IntakeForm(Base):
     patient_id = Column(UUID(as_uuid=True), ForeignKey("patients.id"), nullable=False)
     appointment_id = Column(UUID(as_uuid=True), ForeignKey("appointments.id"), nullable=True)
     
-    raw_answers = Column(JSONB, nullable=False)
+    raw_answers = deferred(Column(JSONB, nullable=False))  # Load with undefer() where displayed
     status = Column(String(20), default="pending")
     submitted_at = Column(DateTime(timezone=True), nullable=True)
     
@@ -26,6 +26,8 @@ class IntakeForm(Base):
 
     __table_args__ = (
         CheckConstraint("status IN ('pending', 'submitted', 'reviewed')", name="check_intake_status"),
+        Index("idx_intake_forms_appointment", "appointment_id"),
+        Index("idx_intake_forms_clinic_submitted", "clinic_id", "submitted_at"),
     )
 
 
@@ -57,5 +59,7 @@ class AIIntakeSummary(Base):
 
     __table_args__ = (
         CheckConstraint("status IN ('generating', 'generated', 'failed', 'edited')", name="check_ai_summary_status"),
+        Index("idx_ai_intake_summaries_appointment", "appointment_id"),
+        Index("idx_ai_intake_summaries_intake_form", "intake_form_id"),
     )
 
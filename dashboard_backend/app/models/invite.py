@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, DateTime, ForeignKey, Boolean, func
+from sqlalchemy import Column, String, DateTime, ForeignKey, Boolean, Index, func
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 import uuid
@@ -22,3 +22,7 @@ class Invite(Base):
     # Relationships
     clinic = relationship("Clinic", backref="invites")
     inviter = relationship("User", foreign_keys=[invited_by], backref="sent_invites")
+
+    __table_args__ = (
+        Index("idx_invites_clinic_status", "clinic_id", "status", "role"),
+    )
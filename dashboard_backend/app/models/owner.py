@@ -1,6 +1,6 @@
-from sqlalchemy import Column, String, Date, DateTime, Integer, Float, Boolean, ForeignKey, Text, func
+from sqlalchemy import Column, String, Date, DateTime, Integer, Float, Boolean, ForeignKey, Text, Index, DDL, event, func, text
 from sqlalchemy.dialects.postgresql import UUID, JSONB
-from sqlalchemy.orm import relationship
+from sqlalchemy.orm import relationship, deferred
 import uuid
 from app.database import Base
 
@@ -40,6 +40,15 @@ class OwnerMetrics(Base):
     clinic = relationship("Clinic", backref="owner_metrics")
 
 
+CALL_CONTENT = "call_content"
+
+# voice_ai_logs and automation_executions are range-partitioned by month on
+# their timestamp (see app.services.partitions). Postgres needs the partition
+# key in the primary key, so it is (id, timestamp) in the table while the
+# mapper keeps identifying rows by id alone.
+_DEFAULT_PARTITION = DDL("CREATE TABLE %(table)s_default PARTITION OF %(table)s DEFAULT")
+
+
 class VoiceAILog(Base):
     """Voice AI call logs and interactions"""
     __tablename__ = "voice_ai_logs"
@@ -64,10 +73,10 @@ class VoiceAILog(Base):
     ended_at = Column(DateTime(timezone=True), nullable=True)
     duration_seconds = Column(Integer, default=0)
     
-    # Content
-    transcript = Column(Text, nullable=True)
-    ai_response = Column(Text, nullable=True)
-    patient_response = Column(Text, nullable=True)
+    # Content - deferred (several KB per call); load with undefer_group(CALL_CONTENT) where displayed
+    transcript = deferred(Column(Text, nullable=True), group=CALL_CONTENT)
+    ai_response = deferred(Column(Text, nullable=True), group=CALL_CONTENT)
+    patient_response = deferred(Column(Text, nullable=True), group=CALL_CONTENT)
     
     # Escalation
     escalated = Column(Boolean, default=False)
@@ -78,9 +87,9 @@ class VoiceAILog(Base):
     to_number = Column(String(20), nullable=True)
     
     # Call Metadata
-    call_metadata = Column(JSONB, default=dict)
+    call_metadata = deferred(Column(JSONB, default=dict), group=CALL_CONTENT)
     
-    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    created_at = Column(DateTime(timezone=True), primary_key=True, server_default=func.now())  # Partition key
     updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
 
     # Relationships
@@ -88,6 +97,13 @@ class VoiceAILog(Base):
     appointment = relationship("Appointment", backref="voice_ai_logs")
     patient = relationship("Patient", backref="voice_ai_logs")
 
+    __table_args__ = (
+        Index("idx_voice_ai_logs_clinic_created", "clinic_id", created_at.desc()),
+        Index("idx_voice_ai_logs_appointment", "appointment_id"),
+        {"postgresql_partition_by": "RANGE (created_at)"},
+    )
+    __mapper_args__ = {"primary_key": [id]}
+
 
 class AutomationRule(Base):
     """Automation rules for the clinic"""
@@ -125,6 +141,12 @@ class AutomationRule(Base):
     # Relationships
     clinic = relationship("Clinic", backref="automation_rules")
 
+    __table_args__ = (
+        Index("idx_automation_rules_clinic", "clinic_id"),
+        Index("idx_automation_rules_clinic_event_enabled", "clinic_id", "trigger_event", priority.desc(),
+              postgresql_where=text("enabled")),
+    )
+
 
 class AutomationExecution(Base):
     """Log of automation rule executions"""
@@ -142,7 +164,7 @@ class AutomationExecution(Base):
     error_message = Column(Text, nullable=True)
     
     # Timing
-    triggered_at = Column(DateTime(timezone=True), server_default=func.now())
+    triggered_at = Column(DateTime(timezone=True), primary_key=True, server_default=func.now())  # Partition key
     completed_at = Column(DateTime(timezone=True), nullable=True)
     
     created_at = Column(DateTime(timezone=True), server_default=func.now())
@@ -153,6 +175,19 @@ class AutomationExecution(Base):
     appointment = relationship("Appointment", backref="automation_executions")
     patient = relationship("Patient", backref="automation_executions")
 
+    __table_args__ = (
+        Index("idx_automation_executions_clinic_triggered", "clinic_id", triggered_at.desc()),
+        Index("idx_automation_executions_rule_triggered", "rule_id", triggered_at.desc()),
+        Index("idx_automation_executions_clinic_success", "clinic_id", triggered_at.desc(),
+              postgresql_where=text("status = 'success'")),
+        {"postgresql_partition_by": "RANGE (triggered_at)"},
+    )
+    __mapper_args__ = {"primary_key": [id]}
+
+
+event.listen(VoiceAILog.__table__, "after_create", _DEFAULT_PARTITION.execute_if(dialect="postgresql"))
+event.listen(AutomationExecution.__table__, "after_create", _DEFAULT_PARTITION.execute_if(dialect="postgresql"))
+
 
 class ClinicSettings(Base):
     """Clinic settings and configuration"""
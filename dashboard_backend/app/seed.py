@@ -12,12 +12,17 @@ from app.models import (
     VoiceAILog, AutomationRule, AutomationExecution, ClinicSettings, DoctorCapacity, OwnerMetrics, Invite
 )
 from app.core.security import hash_password
+from app.services.partitions import ensure_partitions
 from datetime import date, time, timedelta, datetime
 import random
 
 # Create all tables
 Base.metadata.create_all(bind=engine)
 
+# Monthly log partitions for the seeded window (app.tasks.maintenance keeps them ahead afterwards)
+with engine.begin() as conn:
+    ensure_partitions(conn, months_back=2)
+
 db: Session = SessionLocal()
 
 
@@ -1,5 +1,5 @@
 import json
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, undefer
 from app.models.intake import IntakeForm, AIIntakeSummary
 from app.config import settings
 from openai import OpenAI
@@ -31,7 +31,9 @@ def generate_intake_summary(intake_form_id, db: Session) -> AIIntakeSummary:
         raise ValueError("OpenAI API key not configured")
     
     # Get intake form
-    intake_form = db.query(IntakeForm).filter(IntakeForm.id == intake_form_id).first()
+    intake_form = db.query(IntakeForm).options(
+        undefer(IntakeForm.raw_answers)
+    ).filter(IntakeForm.id == intake_form_id).first()
     if not intake_form:
         raise ValueError("Intake form not found")
     
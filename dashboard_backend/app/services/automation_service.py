@@ -9,6 +9,10 @@ from app.models.appointment import Appointment
 from app.models.patient import Patient
 from app.models.doctor import Doctor
 from app.models.owner import AutomationRule, AutomationExecution, VoiceAILog
+from app.services.change_versions import VOICE_LOGS
+from app.services.live_updates import (
+    publish_event, automation_execution_delta, voice_log_delta
+)
 from app.services.twilio_service import (
     send_appointment_confirmation_sms,
     send_appointment_reminder_sms,
@@ -77,6 +81,8 @@ class AutomationService:
             rule.failure_count += 1
             self.db.commit()
         
+        publish_event(self.clinic_id, "automation.executed", automation_execution_delta(execution, rule))
+        
         return execution
     
     def _perform_action(
@@ -217,6 +223,8 @@ class AutomationService:
         
         self.db.commit()
         
+        publish_event(self.clinic_id, "voice_log.updated", voice_log_delta(voice_log), version_kind=VOICE_LOGS)
+        
         return result
     
     def _send_email_action(
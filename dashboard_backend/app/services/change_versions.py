@@ -0,0 +1,97 @@
+"""Per-clinic change versions for conditional GETs and cached analytics
+
+Every appointment, intake or voice-log write bumps Redis counters: one for the
+clinic as a whole, one for the kind of data (appointments, keyed by appointment
+date; voice logs, keyed by the day the call was logged) and one for the day it
+touched. Readers build their ETag or cache key from the counters they depend on
+(a day view from that day's counter, an analytics range from the counters of
+every day in it), so an If-None-Match from a client polling an idle clinic is
+answered with one MGET instead of the full set of dashboard queries, and a
+write only invalidates the cached ranges that contain its day. Every ETag also
+includes the clinic-settings counter, since a time/date format change alters
+every rendered view.
+
+ETags also carry a time bucket of ETAG_MAX_STALENESS_SECONDS, which bounds how
+long a response can be reused when a change doesn't go through bump_versions
+(patient/doctor edits, a missed bump during a Redis outage).
+"""
+import hashlib
+import logging
+from datetime import date, timedelta
+from typing import List, Optional, Sequence, Union
+
+from app.services.read_routing import pin_to_primary
+from app.services.redis_client import get_redis
+
+logger = logging.getLogger(__name__)
+
+KEY_PREFIX = "clinicflow:version:"
+DAY_VERSION_TTL_SECONDS = 400 * 24 * 3600  # Longer than any analytics window
+
+APPOINTMENTS = "appointments"
+VOICE_LOGS = "voice"
+CLINIC_SETTINGS = "settings"  # Formatting/timezone; every ETag includes it
+
+
+def _clinic_key(clinic_id, kind: Optional[str] = None) -> str:
+    return f"{KEY_PREFIX}{clinic_id}:{kind}" if kind else f"{KEY_PREFIX}{clinic_id}"
+
+
+def _day_key(clinic_id, day: Union[date, str], kind: str = APPOINTMENTS) -> str:
+    day = day.isoformat() if isinstance(day, date) else day
+    return f"{KEY_PREFIX}{clinic_id}:{kind}:{day}"
+
+
+def bump_versions(clinic_id, *days: Optional[Union[date, str]], kind: str = APPOINTMENTS) -> None:
+    """Mark the clinic (and each given day of `kind` data) as changed; None days are ignored"""
+    # Readers about to cache under the new versions must not read a lagging replica
+    pin_to_primary(clinic_id=clinic_id)
+    try:
+        pipe = get_redis().pipeline(transaction=False)
+        pipe.incr(_clinic_key(clinic_id))
+        pipe.incr(_clinic_key(clinic_id, kind))
+        for day in {d for d in days if d}:
+            key = _day_key(clinic_id, day, kind)
+            pipe.incr(key)
+            pipe.expire(key, DAY_VERSION_TTL_SECONDS)
+        pipe.execute()
+    except Exception as e:
+        logger.warning(f"Failed to bump change versions for clinic {clinic_id}: {e}")
+
+
+def get_versions(
+    clinic_id,
+    days: Optional[List[date]] = None,
+    kind: str = APPOINTMENTS,
+    kinds: Sequence[str] = ()
+) -> Optional[List[int]]:
+    """
+    Current versions: the clinic counter when days is None, otherwise one per day,
+    followed by the kind-wide counter of each of `kinds` (read in the same MGET).
+    Returns None if Redis is unavailable (callers then skip conditional handling).
+    """
+    keys = [_day_key(clinic_id, d, kind) for d in days] if days else [_clinic_key(clinic_id)]
+    keys += [_clinic_key(clinic_id, k) for k in kinds]
+    try:
+        return [int(v or 0) for v in get_redis().mget(keys)]
+    except Exception as e:
+        logger.warning(f"Failed to read change versions for clinic {clinic_id}: {e}")
+        return None
+
+
+def get_kind_version(clinic_id, kind: str) -> Optional[int]:
+    """Counter bumped by any write of `kind`, whatever its day"""
+    try:
+        return int(get_redis().get(_clinic_key(clinic_id, kind)) or 0)
+    except Exception as e:
+        logger.warning(f"Failed to read change versions for clinic {clinic_id}: {e}")
+        return None
+
+
+def get_range_version(clinic_id, start: date, end: date, kind: str = APPOINTMENTS) -> Optional[str]:
+    """Digest of the day counters from start to end inclusive; changes iff a day in the range changed"""
+    days = [start + timedelta(days=i) for i in range((end - start).days + 1)]
+    versions = get_versions(clinic_id, days, kind)
+    if versions is None:
+        return None
+    return hashlib.sha1(",".join(map(str, versions)).encode()).hexdigest()[:16]
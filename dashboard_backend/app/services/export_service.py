@@ -0,0 +1,169 @@
+"""Streaming CSV / Parquet export
+
+Rows are read through a server-side cursor (Query.yield_per) from column-only
+selects, so no ORM objects or nested response models are built, and written out
+one batch at a time as the client reads the response. Memory stays at about one
+batch (EXPORT_BATCH_ROWS rows) whatever the table size.
+
+Each export runs in its own session, opened and closed by the generator itself:
+a streamed response outlives the request's get_db() session. The endpoints
+pass the read replica's session factory when the caller may read from it.
+"""
+import csv
+import io
+import json
+import logging
+from typing import Any, Callable, Iterable, Iterator, List, Tuple
+from uuid import UUID
+
+from sqlalchemy.orm import Query, Session, sessionmaker
+
+from app.config import settings
+from app.database import SessionLocal
+
+logger = logging.getLogger(__name__)
+
+# Column kinds, used to convert values for CSV and to build the Parquet schema
+STR, UUID_, INT, FLOAT, BOOL, DATE, TIME, DATETIME, JSON = (
+    "str", "uuid", "int", "float", "bool", "date", "time", "datetime", "json"
+)
+
+# (output name, SQLAlchemy column expression, kind)
+ExportColumn = Tuple[str, Any, str]
+
+
+def parquet_available() -> bool:
+    try:
+        import pyarrow  # noqa: F401
+        import pyarrow.parquet  # noqa: F401
+        return True
+    except ImportError:
+        return False
+
+
+def stream_rows(
+    build_query: Callable[[Session], Query],
+    batch_size: int = None,
+    session_factory: sessionmaker = SessionLocal
+) -> Iterator[List[tuple]]:
+    """Yield lists of row tuples from a server-side cursor, batch_size rows at a time"""
+    batch_size = batch_size or settings.EXPORT_BATCH_ROWS
+    db = session_factory()
+    try:
+        batch = []
+        for row in build_query(db).yield_per(batch_size):
+            batch.append(tuple(row))
+            if len(batch) >= batch_size:
+                yield batch
+                batch = []
+        if batch:
+            yield batch
+    finally:
+        db.close()
+
+
+def _csv_value(value, kind: str):
+    if value is None:
+        return ""
+    if kind == JSON:
+        return json.dumps(value, default=str)
+    if kind in (DATE, TIME, DATETIME):
+        return value.isoformat()
+    return value
+
+
+def iter_csv(columns: List[ExportColumn], batches: Iterable[List[tuple]]) -> Iterator[bytes]:
+    """CSV with a header row; one encoded chunk per batch"""
+    kinds = [kind for _, _, kind in columns]
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow([name for name, _, _ in columns])
+    for batch in batches:
+        writer.writerows([_csv_value(v, k) for v, k in zip(row, kinds)] for row in batch)
+        yield buffer.getvalue().encode()
+        buffer.seek(0)
+        buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue().encode()
+
+
+class _ChunkSink(io.RawIOBase):
+    """Write-only file that hands back what was written since the last drain()"""
+
+    def __init__(self):
+        self._chunks = []
+        self._position = 0
+
+    def writable(self):
+        return True
+
+    def write(self, data):
+        self._chunks.append(bytes(data))
+        self._position += len(data)
+        return len(data)
+
+    def tell(self):
+        return self._position
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks = []
+        return data
+
+
+def _arrow_schema(columns: List[ExportColumn]):
+    import pyarrow as pa
+
+    types = {
+        STR: pa.string(), UUID_: pa.string(), JSON: pa.string(),
+        INT: pa.int64(), FLOAT: pa.float64(), BOOL: pa.bool_(),
+        DATE: pa.date32(), TIME: pa.time64("us"), DATETIME: pa.timestamp("us", tz="UTC"),
+    }
+    return pa.schema([(name, types[kind]) for name, _, kind in columns])
+
+
+def _arrow_value(value, kind: str):
+    if value is None:
+        return None
+    if kind == UUID_ and isinstance(value, UUID):
+        return str(value)
+    if kind == JSON:
+        return json.dumps(value, default=str)
+    return value
+
+
+def iter_parquet(columns: List[ExportColumn], batches: Iterable[List[tuple]]) -> Iterator[bytes]:
+    """Parquet with one row group per batch; bytes are yielded as each row group is written"""
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    schema = _arrow_schema(columns)
+    kinds = [kind for _, _, kind in columns]
+    sink = _ChunkSink()
+    writer = pq.ParquetWriter(sink, schema, compression="snappy")
+    try:
+        for batch in batches:
+            arrays = [
+                pa.array([_arrow_value(row[i], kind) for row in batch], type=schema.field(i).type)
+                for i, kind in enumerate(kinds)
+            ]
+            writer.write_table(pa.Table.from_arrays(arrays, schema=schema))
+            chunk = sink.drain()
+            if chunk:
+                yield chunk
+    finally:
+        writer.close()
+    yield sink.drain()
+
+
+def export_stream(
+    columns: List[ExportColumn],
+    build_query: Callable[[Session], Query],
+    export_format: str,
+    session_factory: sessionmaker = SessionLocal
+) -> Iterator[bytes]:
+    """Encoded export of build_query's rows; build_query must select exactly `columns`"""
+    batches = stream_rows(build_query, session_factory=session_factory)
+    if export_format == "parquet":
+        return iter_parquet(columns, batches)
+    return iter_csv(columns, batches)
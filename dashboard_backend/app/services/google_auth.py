@@ -1,13 +1,76 @@
 """Google OAuth service for authentication"""
-import httpx
+import time
+import asyncio
+import logging
 from typing import Optional, Dict
+from jose import JWTError, jwt
 from app.config import settings
+from app.services.http_clients import get_http_client
+
+logger = logging.getLogger(__name__)
+
+
+# Google signs ID tokens with rotating RSA keys published as a JWKS.
+# The keys are cached for the response's Cache-Control max-age.
+GOOGLE_ISSUERS = ("accounts.google.com", "https://accounts.google.com")
+JWKS_DEFAULT_MAX_AGE_SECONDS = 3600
+JWKS_MIN_REFRESH_SECONDS = 60  # Unknown kid forces a refresh at most this often
+
+_jwks_keys: Dict[str, Dict] = {}
+_jwks_expires_at = 0.0
+_jwks_fetched_at = 0.0
+_jwks_lock: Optional[asyncio.Lock] = None
+
+
+def _max_age(cache_control: str) -> int:
+    """Parse max-age from a Cache-Control header"""
+    for directive in cache_control.split(","):
+        name, _, value = directive.strip().partition("=")
+        if name.lower() == "max-age" and value.isdigit():
+            return int(value)
+    return JWKS_DEFAULT_MAX_AGE_SECONDS
+
+
+async def _refresh_jwks() -> None:
+    global _jwks_keys, _jwks_expires_at, _jwks_fetched_at
+    _jwks_fetched_at = time.monotonic()
+    response = await get_http_client("google").get(settings.GOOGLE_JWKS_URL)
+    response.raise_for_status()
+    _jwks_keys = {key["kid"]: key for key in response.json().get("keys", []) if "kid" in key}
+    _jwks_expires_at = _jwks_fetched_at + _max_age(response.headers.get("cache-control", ""))
+
+
+async def _get_signing_key(kid: str) -> Optional[Dict]:
+    """
+    Return the JWK for kid, refreshing the cached JWKS when it has expired or
+    doesn't know kid yet (Google rotated keys). One refresh runs at a time; if it
+    fails the previously cached keys keep being used.
+    """
+    global _jwks_lock
+    if kid in _jwks_keys and time.monotonic() < _jwks_expires_at:
+        return _jwks_keys[kid]
+
+    if _jwks_lock is None:
+        _jwks_lock = asyncio.Lock()
+    async with _jwks_lock:
+        now = time.monotonic()
+        expired = now >= _jwks_expires_at
+        unknown = kid not in _jwks_keys and now - _jwks_fetched_at >= JWKS_MIN_REFRESH_SECONDS
+        if expired or unknown:
+            try:
+                await _refresh_jwks()
+            except Exception as e:
+                logger.warning(f"Failed to refresh Google JWKS: {e}")
+    return _jwks_keys.get(kid)
 
 
 async def verify_google_token(id_token: str) -> Optional[Dict]:
     """
     Verify Google ID token and return user info
     
+    The signature is checked locally against Google's cached JWKS, along with
+    audience, issuer and expiry; no per-login call to tokeninfo.
+    
     Args:
         id_token: Google ID token from frontend
         
@@ -18,28 +81,36 @@ async def verify_google_token(id_token: str) -> Optional[Dict]:
         raise ValueError("Google OAuth not configured. Set GOOGLE_CLIENT_ID in .env")
     
     try:
-        # Verify token with Google
-        async with httpx.AsyncClient() as client:
-            response = await client.get(
-                f"https://www.googleapis.com/oauth2/v3/tokeninfo?id_token={id_token}"
-            )
-            
-            if response.status_code != 200:
-                return None
-            
-            token_data = response.json()
-            
-            # Verify audience matches our client ID
-            if token_data.get("aud") != settings.GOOGLE_CLIENT_ID:
-                return None
-            
-            # Return user info
-            return {
-                "email": token_data.get("email"),
-                "name": token_data.get("name", token_data.get("given_name", "") + " " + token_data.get("family_name", "")).strip(),
-                "google_id": token_data.get("sub"),
-                "email_verified": token_data.get("email_verified", False)
-            }
+        header = jwt.get_unverified_header(id_token)
+        key = await _get_signing_key(header.get("kid", ""))
+        if key is None:
+            return None
+        
+        token_data = jwt.decode(
+            id_token,
+            key,
+            algorithms=["RS256"],
+            audience=settings.GOOGLE_CLIENT_ID,
+            issuer=GOOGLE_ISSUERS,
+            options={
+                "require_exp": True,
+                "require_aud": True,
+                "require_iss": True,
+                "verify_at_hash": False,
+                "leeway": settings.GOOGLE_TOKEN_LEEWAY_SECONDS,
+            },
+        )
+        
+        # Return user info
+        return {
+            "email": token_data.get("email"),
+            "name": token_data.get("name", token_data.get("given_name", "") + " " + token_data.get("family_name", "")).strip(),
+            "google_id": token_data.get("sub"),
+            "email_verified": token_data.get("email_verified", False) in (True, "true")
+        }
+    except JWTError as e:
+        logger.info(f"Rejected Google ID token: {e}")
+        return None
     except Exception as e:
         print(f"Error verifying Google token: {e}")
         return None
@@ -56,23 +127,22 @@ async def get_google_user_info(access_token: str) -> Optional[Dict]:
         Dict with user info (email, name, google_id) or None if invalid
     """
     try:
-        async with httpx.AsyncClient() as client:
-            response = await client.get(
-                "https://www.googleapis.com/oauth2/v2/userinfo",
-                headers={"Authorization": f"Bearer {access_token}"}
-            )
-            
-            if response.status_code != 200:
-                return None
-            
-            user_data = response.json()
-            
-            return {
-                "email": user_data.get("email"),
-                "name": user_data.get("name", ""),
-                "google_id": user_data.get("id"),
-                "email_verified": user_data.get("verified_email", False)
-            }
+        response = await get_http_client("google").get(
+            "/oauth2/v2/userinfo",
+            headers={"Authorization": f"Bearer {access_token}"}
+        )
+        
+        if response.status_code != 200:
+            return None
+        
+        user_data = response.json()
+        
+        return {
+            "email": user_data.get("email"),
+            "name": user_data.get("name", ""),
+            "google_id": user_data.get("id"),
+            "email_verified": user_data.get("verified_email", False)
+        }
     except Exception as e:
         print(f"Error getting Google user info: {e}")
         return None
@@ -0,0 +1,64 @@
+"""Shared outbound HTTP clients
+
+One pooled httpx.AsyncClient per upstream, created on first use (or in the app
+lifespan) and closed on shutdown, so Google sign-ins reuse a warm keep-alive /
+HTTP/2 connection instead of paying a TCP + TLS handshake per request.
+"""
+import logging
+from typing import Dict, Optional
+
+import httpx
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Upstream name -> (base URL, read timeout in seconds)
+UPSTREAMS = {
+    "google": ("https://www.googleapis.com", settings.GOOGLE_HTTP_TIMEOUT_SECONDS),
+}
+
+_clients: Dict[str, httpx.AsyncClient] = {}
+_http2: Optional[bool] = None
+
+
+def _http2_enabled() -> bool:
+    """HTTP/2 needs the h2 package (httpx[http2]); fall back to HTTP/1.1 keep-alive without it"""
+    global _http2
+    if _http2 is None:
+        try:
+            import h2  # noqa: F401
+            _http2 = settings.HTTP2_ENABLED
+        except ImportError:
+            _http2 = False
+    return _http2
+
+
+def get_http_client(name: str) -> httpx.AsyncClient:
+    """Get the shared client for an upstream listed in UPSTREAMS"""
+    client = _clients.get(name)
+    if client is None or client.is_closed:
+        base_url, timeout = UPSTREAMS[name]
+        client = httpx.AsyncClient(
+            base_url=base_url,
+            http2=_http2_enabled(),
+            timeout=httpx.Timeout(timeout, connect=min(settings.HTTP_CONNECT_TIMEOUT_SECONDS, timeout)),
+            limits=httpx.Limits(
+                max_connections=settings.HTTP_MAX_CONNECTIONS,
+                max_keepalive_connections=settings.HTTP_MAX_KEEPALIVE,
+                keepalive_expiry=settings.HTTP_KEEPALIVE_EXPIRY_SECONDS,
+            ),
+        )
+        _clients[name] = client
+    return client
+
+
+async def close_http_clients() -> None:
+    """Close all shared clients (app shutdown)"""
+    clients = list(_clients.values())
+    _clients.clear()
+    for client in clients:
+        try:
+            await client.aclose()
+        except Exception as e:
+            logger.warning(f"Error closing HTTP client: {e}")
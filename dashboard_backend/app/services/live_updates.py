@@ -0,0 +1,185 @@
+"""Live dashboard updates over Redis pub/sub
+
+Writers (API endpoints, automation, Celery tasks) call publish_event() after
+committing; the event is a compact delta, not a re-rendered dashboard. Every API
+worker runs one EventBroker that holds a single pattern subscription and fans
+events out to the SSE clients connected to that worker (see app/api/events.py),
+so clients load the dashboard once and then apply patches.
+
+Publishing is best effort: if Redis is down the write still succeeds and clients
+fall back to reloading when their stream reconnects.
+"""
+import json
+import asyncio
+import logging
+from datetime import date, datetime, time
+from typing import Any, Dict, Optional, Set
+from uuid import UUID
+
+from app.config import settings
+from app.services.change_versions import APPOINTMENTS, bump_versions
+from app.services.redis_client import get_redis
+
+logger = logging.getLogger(__name__)
+
+CHANNEL_PREFIX = "clinicflow:events:"
+CLIENT_QUEUE_SIZE = 256  # Events buffered per client before it is told to resync
+
+def _channel(clinic_id) -> str:
+    return f"{CHANNEL_PREFIX}{clinic_id}"
+
+
+def _json_default(value):
+    if isinstance(value, (datetime, date, time)):
+        return value.isoformat()
+    if isinstance(value, UUID):
+        return str(value)
+    raise TypeError(f"{type(value).__name__} is not JSON serializable")
+
+
+def publish_event(
+    clinic_id,
+    event_type: str,
+    data: Dict[str, Any],
+    version_kind: str = APPOINTMENTS
+) -> None:
+    """
+    Publish a delta to everyone watching clinic_id; call after the write is committed.
+    Also bumps the clinic's change versions (ETags, cached analytics) of
+    `version_kind` data for the delta's date and previous_date, if any.
+    """
+    bump_versions(clinic_id, data.get("date"), data.get("previous_date"), kind=version_kind)
+    if not settings.LIVE_UPDATES_ENABLED:
+        return
+    message = json.dumps({"type": event_type, "data": data}, default=_json_default)
+    try:
+        get_redis().publish(_channel(clinic_id), message)
+    except Exception as e:
+        logger.warning(f"Failed to publish {event_type} for clinic {clinic_id}: {e}")
+
+
+# Delta payloads
+
+def appointment_delta(appointment) -> Dict[str, Any]:
+    return {
+        "id": appointment.id,
+        "date": appointment.date,
+        "start_time": appointment.start_time,
+        "doctor_id": appointment.doctor_id,
+        "patient_id": appointment.patient_id,
+        "status": appointment.status,
+        "intake_status": appointment.intake_status,
+        "arrived": appointment.arrived,
+        "arrived_at": appointment.arrived_at,
+    }
+
+
+def automation_execution_delta(execution, rule=None) -> Dict[str, Any]:
+    return {
+        "id": execution.id,
+        "rule_id": execution.rule_id,
+        "rule_type": rule.rule_type if rule else None,
+        "action_type": rule.action_type if rule else None,
+        "appointment_id": execution.appointment_id,
+        "status": execution.status,
+        "completed_at": execution.completed_at,
+    }
+
+
+def voice_log_delta(log) -> Dict[str, Any]:
+    return {
+        "id": log.id,
+        "date": log.created_at.date() if log.created_at else None,
+        "appointment_id": log.appointment_id,
+        "call_type": log.call_type,
+        "status": log.status,
+        "outcome": log.outcome,
+        "escalated": log.escalated,
+    }
+
+
+class EventBroker:
+    """Per-process fan-out from one Redis pattern subscription to local client queues"""
+
+    def __init__(self):
+        self._clients: Dict[str, Set[asyncio.Queue]] = {}
+        self._task: Optional[asyncio.Task] = None
+
+    def subscribe(self, clinic_id) -> asyncio.Queue:
+        queue: asyncio.Queue = asyncio.Queue(maxsize=CLIENT_QUEUE_SIZE)
+        self._clients.setdefault(str(clinic_id), set()).add(queue)
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._listen())
+        return queue
+
+    def unsubscribe(self, clinic_id, queue: asyncio.Queue) -> None:
+        queues = self._clients.get(str(clinic_id))
+        if queues is not None:
+            queues.discard(queue)
+            if not queues:
+                del self._clients[str(clinic_id)]
+
+    def _dispatch(self, channel: str, raw: bytes) -> None:
+        queues = self._clients.get(channel[len(CHANNEL_PREFIX):])
+        if not queues:
+            return
+        try:
+            event = json.loads(raw)
+        except ValueError:
+            return
+        for queue in list(queues):
+            try:
+                queue.put_nowait(event)
+            except asyncio.QueueFull:
+                # Slow client: drop its backlog and tell it to reload instead
+                while not queue.empty():
+                    queue.get_nowait()
+                queue.put_nowait({"type": "resync", "data": {}})
+
+    async def _listen(self) -> None:
+        import redis.asyncio as aioredis
+
+        reconnecting = False
+        while True:
+            client = aioredis.Redis.from_url(settings.REDIS_URL)
+            pubsub = client.pubsub(ignore_subscribe_messages=True)
+            try:
+                await pubsub.psubscribe(f"{CHANNEL_PREFIX}*")
+                if reconnecting:
+                    # Events published while disconnected are lost; have clients reload
+                    self._broadcast_resync()
+                    reconnecting = False
+                async for message in pubsub.listen():
+                    if message.get("type") == "pmessage":
+                        channel = message["channel"]
+                        self._dispatch(channel.decode() if isinstance(channel, bytes) else channel, message["data"])
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                if not reconnecting:
+                    logger.warning(f"Live update subscription lost, reconnecting: {e}")
+                reconnecting = True
+                await asyncio.sleep(1)
+            finally:
+                try:
+                    await pubsub.close()
+                    await client.close()
+                except Exception:
+                    pass
+
+    def _broadcast_resync(self) -> None:
+        for queues in self._clients.values():
+            for queue in queues:
+                try:
+                    queue.put_nowait({"type": "resync", "data": {}})
+                except asyncio.QueueFull:
+                    pass
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+
+broker = EventBroker()
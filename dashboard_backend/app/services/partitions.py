@@ -0,0 +1,164 @@
+"""Monthly range partitions for the append-only log tables
+
+voice_ai_logs (by created_at) and automation_executions (by triggered_at) are
+partitioned by calendar month in UTC, one table per month named
+<table>_pYYYY_MM, plus a <table>_default partition that catches anything
+outside the monthly ranges so an insert never fails when maintenance falls
+behind. Queries that bound the partition key (every clinic + time window
+query in owner.py / dashboard.py) only touch the months they cover.
+
+app.tasks.maintenance calls ensure_partitions() to keep months ready ahead of
+time and expire_partitions() to detach months past retention - an instant
+catalog change instead of a DELETE over millions of rows.
+"""
+import logging
+import re
+from datetime import date, datetime, timezone
+from typing import Dict, List, Optional
+
+from sqlalchemy import text
+from sqlalchemy.engine import Connection
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+# table -> partition key
+PARTITIONED_TABLES = {
+    "voice_ai_logs": "created_at",
+    "automation_executions": "triggered_at",
+}
+
+_MONTH_SUFFIX = re.compile(r"_p(\d{4})_(\d{2})$")
+
+
+def month_start(day: date) -> date:
+    return date(day.year, day.month, 1)
+
+
+def add_months(month: date, months: int) -> date:
+    index = month.year * 12 + month.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def partition_name(table: str, month: date) -> str:
+    return f"{table}_p{month:%Y_%m}"
+
+
+def default_partition_name(table: str) -> str:
+    return f"{table}_default"
+
+
+def _bounds(month: date) -> str:
+    upper = add_months(month, 1)
+    return f"FROM ('{month.isoformat()} 00:00:00+00') TO ('{upper.isoformat()} 00:00:00+00')"
+
+
+def is_partitioned(conn: Connection, table: str) -> bool:
+    """False for a table still created the old way (not yet migrated)"""
+    return conn.execute(
+        text("SELECT relkind = 'p' FROM pg_class WHERE oid = to_regclass(:table)"),
+        {"table": table}
+    ).scalar() or False
+
+
+def monthly_partitions(conn: Connection, table: str) -> Dict[date, str]:
+    """Attached monthly partitions of a table, keyed by month"""
+    names = conn.execute(text(
+        "SELECT child.relname FROM pg_inherits "
+        "JOIN pg_class child ON child.oid = pg_inherits.inhrelid "
+        "WHERE pg_inherits.inhparent = to_regclass(:table)"
+    ), {"table": table}).scalars()
+    partitions = {}
+    for name in names:
+        match = _MONTH_SUFFIX.search(name)
+        if match:
+            partitions[date(int(match.group(1)), int(match.group(2)), 1)] = name
+    return partitions
+
+
+def create_partition(conn: Connection, table: str, month: date) -> str:
+    """Create (or attach) the partition for one month"""
+    key = PARTITIONED_TABLES[table]
+    name = partition_name(table, month)
+    default = default_partition_name(table)
+    lower = datetime(month.year, month.month, 1, tzinfo=timezone.utc)
+    upper = datetime.combine(add_months(month, 1), datetime.min.time(), tzinfo=timezone.utc)
+    range_filter = f"{key} >= :lower AND {key} < :upper"
+
+    strays = conn.execute(
+        text(f"SELECT count(*) FROM {default} WHERE {range_filter}"), {"lower": lower, "upper": upper}
+    ).scalar()
+    if not strays:
+        conn.execute(text(f"CREATE TABLE {name} PARTITION OF {table} FOR VALUES {_bounds(month)}"))
+        return name
+
+    # Rows for this month already sit in the default partition, which would
+    # violate the new bound: move them into a standalone table, then attach it
+    logger.warning(f"Moving {strays} rows from {default} into new partition {name}")
+    conn.execute(text(f"CREATE TABLE {name} (LIKE {table} INCLUDING DEFAULTS INCLUDING CONSTRAINTS)"))
+    conn.execute(text(
+        f"WITH moved AS (DELETE FROM {default} WHERE {range_filter} RETURNING *) "
+        f"INSERT INTO {name} SELECT * FROM moved"
+    ), {"lower": lower, "upper": upper})
+    conn.execute(text(f"ALTER TABLE {table} ATTACH PARTITION {name} FOR VALUES {_bounds(month)}"))
+    return name
+
+
+def ensure_partitions(
+    conn: Connection,
+    months_ahead: Optional[int] = None,
+    months_back: int = 0,
+    today: Optional[date] = None
+) -> List[str]:
+    """Create any missing monthly partitions from months_back before the current
+    month through months_ahead after it. Returns the partitions created."""
+    if months_ahead is None:
+        months_ahead = settings.PARTITION_MONTHS_AHEAD
+    current = month_start(today or datetime.now(timezone.utc).date())
+    created = []
+    for table in PARTITIONED_TABLES:
+        if not is_partitioned(conn, table):
+            logger.warning(f"{table} is not partitioned; run alembic upgrade head")
+            continue
+        existing = monthly_partitions(conn, table)
+        for offset in range(-months_back, months_ahead + 1):
+            month = add_months(current, offset)
+            if month not in existing:
+                created.append(create_partition(conn, table, month))
+    return created
+
+
+def expire_partitions(
+    conn: Connection,
+    retention_months: Optional[int] = None,
+    archive_schema: Optional[str] = None,
+    today: Optional[date] = None
+) -> List[str]:
+    """Detach monthly partitions that ended more than retention_months ago.
+
+    Detached months are moved into archive_schema (kept for dumping to cold
+    storage) or dropped when it is empty. Returns the partitions expired.
+    """
+    if retention_months is None:
+        retention_months = settings.PARTITION_RETENTION_MONTHS
+    if archive_schema is None:
+        archive_schema = settings.PARTITION_ARCHIVE_SCHEMA
+    if retention_months <= 0:
+        return []
+    cutoff = add_months(month_start(today or datetime.now(timezone.utc).date()), -retention_months)
+    expired = []
+    for table in PARTITIONED_TABLES:
+        if not is_partitioned(conn, table):
+            continue
+        for month, name in sorted(monthly_partitions(conn, table).items()):
+            if add_months(month, 1) > cutoff:
+                break
+            conn.execute(text(f"ALTER TABLE {table} DETACH PARTITION {name}"))
+            if archive_schema:
+                conn.execute(text(f"CREATE SCHEMA IF NOT EXISTS {archive_schema}"))
+                conn.execute(text(f"ALTER TABLE {name} SET SCHEMA {archive_schema}"))
+            else:
+                conn.execute(text(f"DROP TABLE {name}"))
+            expired.append(name)
+    return expired
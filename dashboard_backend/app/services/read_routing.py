@@ -0,0 +1,120 @@
+"""Read-your-writes pins for read-replica routing
+
+Read-only endpoints take their session from app.api.deps.get_read_db, which
+uses the replica (DATABASE_READ_URL) unless the caller is pinned to the
+primary. A replica lags the primary slightly, so without pins a user who saves
+something and immediately reloads the list could see the old data.
+
+Pins live in Redis for READ_AFTER_WRITE_PRIMARY_SECONDS, so they hold whichever
+API worker serves the next request:
+  - a user is pinned after any successful write request they make
+    (PrimaryPinMiddleware);
+  - a clinic is pinned whenever its change versions are bumped
+    (change_versions.bump_versions), also for writes from webhooks and Celery.
+    Without that, another user's request could fill a version-keyed cache
+    entry or ETag with replica data that does not have the write yet.
+
+A copy of each pin is also kept in process, and reads go to the primary
+whenever Redis can't be asked. A Redis outage costs replica offload, never
+consistency.
+"""
+import logging
+import time
+from typing import Dict, Optional
+
+from starlette.concurrency import run_in_threadpool
+
+from app.config import settings
+from app.core.security import decode_access_token
+from app.services.redis_client import get_redis
+
+logger = logging.getLogger(__name__)
+
+KEY_PREFIX = "clinicflow:primary-pin:"
+WRITE_METHODS = {"POST", "PUT", "PATCH", "DELETE"}
+
+_local_pins: Dict[str, float] = {}
+
+
+def replica_enabled() -> bool:
+    return bool(settings.DATABASE_READ_URL)
+
+
+def _keys(user_id=None, clinic_id=None):
+    keys = []
+    if user_id:
+        keys.append(f"{KEY_PREFIX}user:{user_id}")
+    if clinic_id:
+        keys.append(f"{KEY_PREFIX}clinic:{clinic_id}")
+    return keys
+
+
+def pin_to_primary(user_id=None, clinic_id=None) -> None:
+    """Send this user's / clinic's reads to the primary for the next few seconds"""
+    keys = _keys(user_id, clinic_id)
+    if not keys or not replica_enabled():
+        return
+    seconds = settings.READ_AFTER_WRITE_PRIMARY_SECONDS
+    now = time.monotonic()
+    if len(_local_pins) > 10000:
+        for key in [k for k, until in _local_pins.items() if until <= now]:
+            _local_pins.pop(key, None)
+    for key in keys:
+        _local_pins[key] = now + seconds
+    try:
+        pipe = get_redis().pipeline(transaction=False)
+        for key in keys:
+            pipe.set(key, 1, ex=seconds)
+        pipe.execute()
+    except Exception as e:
+        logger.warning(f"Failed to pin reads to the primary: {e}")
+
+
+def is_pinned_to_primary(user_id=None, clinic_id=None) -> bool:
+    keys = _keys(user_id, clinic_id)
+    if not keys:
+        return False
+    now = time.monotonic()
+    if any(_local_pins.get(key, 0) > now for key in keys):
+        return True
+    try:
+        return bool(get_redis().exists(*keys))
+    except Exception as e:
+        logger.warning(f"Failed to read primary pins, reading from the primary: {e}")
+        return True
+
+
+def _token_subject(scope) -> Optional[str]:
+    for name, value in scope.get("headers", []):
+        if name == b"authorization":
+            scheme, _, token = value.decode("latin-1").partition(" ")
+            if scheme.lower() != "bearer":
+                return None
+            try:
+                return decode_access_token(token).get("sub")
+            except ValueError:
+                return None
+    return None
+
+
+class PrimaryPinMiddleware:
+    """Pin the authenticated caller to the primary once a write request succeeds"""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["method"] not in WRITE_METHODS or not replica_enabled():
+            await self.app(scope, receive, send)
+            return
+
+        async def send_with_pin(message):
+            # Pin before the response starts, so a request the client sends as
+            # soon as it sees this one's response already finds the pin
+            if message["type"] == "http.response.start" and message["status"] < 400:
+                user_id = _token_subject(scope)
+                if user_id:
+                    await run_in_threadpool(pin_to_primary, user_id=user_id)
+            await send(message)
+
+        await self.app(scope, receive, send_with_pin)
@@ -0,0 +1,13 @@
+"""Shared Redis client for the API (the same Redis Celery uses as its broker)"""
+from app.config import settings
+
+_redis = None
+
+
+def get_redis():
+    """Lazily created, thread-safe client with short timeouts so a Redis outage can't stall requests"""
+    global _redis
+    if _redis is None:
+        import redis
+        _redis = redis.Redis.from_url(settings.REDIS_URL, socket_timeout=2, socket_connect_timeout=2)
+    return _redis
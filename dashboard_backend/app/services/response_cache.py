@@ -0,0 +1,97 @@
+"""Redis response cache for expensive, read-mostly analytics endpoints
+
+Entries are keyed by (clinic_id, endpoint, params, data version), where the data
+version comes from app/services/change_versions.py and covers exactly the
+clinic/date range the endpoint reads. A write therefore invalidates by changing
+the version (old entries just age out), and only for ranges that contain it.
+
+Single-flight: on a miss, one caller takes a short Redis lock and computes; the
+others wait for its result instead of running the same queries, so ten owners
+opening the dashboard at 9am cost one computation. If the holder dies or is slow,
+waiters give up after RESPONSE_CACHE_WAIT_SECONDS and compute themselves. With
+Redis down everything is computed directly.
+"""
+import hashlib
+import json
+import logging
+import time
+import uuid
+from typing import Any, Callable, Dict, Type, TypeVar
+
+from pydantic import BaseModel
+
+from app.config import settings
+from app.services.redis_client import get_redis
+
+logger = logging.getLogger(__name__)
+
+KEY_PREFIX = "clinicflow:cache:"
+LOCK_TIMEOUT_SECONDS = 30
+POLL_INTERVAL_SECONDS = 0.05
+
+# Deletes the lock only if we still hold it
+_RELEASE_LOCK = """
+if redis.call("get", KEYS[1]) == ARGV[1] then
+    return redis.call("del", KEYS[1])
+end
+return 0
+"""
+
+M = TypeVar("M", bound=BaseModel)
+
+
+def cache_key(clinic_id, endpoint: str, params: Dict[str, Any], version: str) -> str:
+    raw = json.dumps(params, sort_keys=True, default=str)
+    digest = hashlib.sha1(f"{raw}|{version}".encode()).hexdigest()[:24]
+    return f"{KEY_PREFIX}{clinic_id}:{endpoint}:{digest}"
+
+
+def get_or_compute(
+    key: str,
+    model: Type[M],
+    compute: Callable[[], M],
+    ttl: int = None
+) -> M:
+    """Return the cached `model` for key, computing (once across workers) on a miss"""
+    ttl = ttl or settings.RESPONSE_CACHE_TTL_SECONDS
+    try:
+        redis = get_redis()
+        cached = redis.get(key)
+    except Exception as e:
+        logger.warning(f"Response cache unavailable, computing directly: {e}")
+        return compute()
+    if cached is not None:
+        return model.model_validate_json(cached)
+
+    lock_key = f"{key}:lock"
+    token = uuid.uuid4().hex
+    try:
+        acquired = redis.set(lock_key, token, nx=True, ex=LOCK_TIMEOUT_SECONDS)
+    except Exception:
+        acquired = False
+
+    if not acquired:
+        deadline = time.monotonic() + settings.RESPONSE_CACHE_WAIT_SECONDS
+        while time.monotonic() < deadline:
+            time.sleep(POLL_INTERVAL_SECONDS)
+            try:
+                cached = redis.get(key)
+            except Exception:
+                break
+            if cached is not None:
+                return model.model_validate_json(cached)
+        logger.info(f"Gave up waiting for {key}, computing")
+        return compute()
+
+    try:
+        result = compute()
+        try:
+            redis.set(key, result.model_dump_json(), ex=ttl)
+        except Exception as e:
+            logger.warning(f"Failed to store {key}: {e}")
+        return result
+    finally:
+        try:
+            redis.eval(_RELEASE_LOCK, 1, lock_key, token)
+        except Exception:
+            pass
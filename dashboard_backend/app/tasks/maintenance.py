@@ -0,0 +1,40 @@
+"""
+Celery tasks for database maintenance
+"""
+import logging
+
+from sqlalchemy import text
+
+from app.celery_app import celery_app
+from app.database import engine
+from app.services.partitions import ensure_partitions, expire_partitions
+
+logger = logging.getLogger(__name__)
+
+
+@celery_app.task(name="app.tasks.maintenance.maintain_partitions")
+def maintain_partitions():
+    """
+    Keep the monthly log partitions ahead of time and expire old ones.
+    Runs daily; creating a month ahead means inserts never land in the
+    default partition, and expiring is a detach instead of a DELETE.
+    """
+    created, expired = [], []
+    try:
+        # Partition DDL needs a short exclusive lock on the parent; give up
+        # rather than queue behind a long export and block every insert
+        with engine.begin() as conn:
+            conn.execute(text("SET LOCAL lock_timeout = '5s'"))
+            created = ensure_partitions(conn)
+        with engine.begin() as conn:
+            conn.execute(text("SET LOCAL lock_timeout = '5s'"))
+            expired = expire_partitions(conn)
+    except Exception as e:
+        logger.error(f"Partition maintenance failed: {e}")
+        raise
+
+    if created:
+        logger.info(f"Created partitions: {', '.join(created)}")
+    if expired:
+        logger.info(f"Expired partitions: {', '.join(expired)}")
+    return {"created": created, "expired": expired}
@@ -2,13 +2,17 @@
 Celery tasks for sending appointment reminders
 """
 from datetime import datetime, date, timedelta
-from typing import List
+from typing import Callable, Dict, List, Tuple
 import logging
+import time
+from celery import chord, group
+from sqlalchemy import or_
 from sqlalchemy.orm import Session, joinedload
 
 from app.celery_app import celery_app
 from app.database import SessionLocal
 from app.models.appointment import Appointment
+from app.models.clinic import Clinic
 from app.models.owner import ClinicSettings
 from app.services.email_service import (
     send_appointment_reminder_email,
@@ -25,251 +29,321 @@ from app.utils.date_format import format_date, format_time
 
 logger = logging.getLogger(__name__)
 
+CONFIRMATION = "confirmation"
+INTAKE = "intake"
 
 
+def _due_clinic_ids(db: Session, kind: str) -> List[str]:
+    """Clinics whose settings allow this kind of reminder to go out at all"""
+    query = db.query(ClinicSettings.clinic_id).filter(
+        or_(ClinicSettings.sms_enabled == True, ClinicSettings.email_enabled == True)
+    )
+    if kind == CONFIRMATION:
+        query = query.filter(
+            or_(ClinicSettings.sms_reminder_enabled == True, ClinicSettings.email_reminder_enabled == True)
+        )
+    return [str(clinic_id) for clinic_id, in query.order_by(ClinicSettings.clinic_id).all()]
 
-@celery_app.task(name="app.tasks.reminders.send_confirmation_reminders")
-def send_confirmation_reminders():
-    """Send confirmation reminders for all clinics"""
+
+def _dispatch(kind: str, clinic_task) -> Dict:
+    """
+    Enqueue clinic_task once per chunk of REMINDER_CLINICS_PER_TASK due clinics,
+    with aggregate_reminder_results as the chord callback that totals them.
+    """
     db = SessionLocal()
     try:
-        # Get all clinics
-        from app.models.clinic import Clinic
-        clinics = db.query(Clinic).all()
-        
-        total_sent = 0
-        total_errors = 0
-        
-        for clinic in clinics:
-            try:
-                # Get clinic settings
-                clinic_settings = db.query(ClinicSettings).filter(
-                    ClinicSettings.clinic_id == clinic.id
-                ).first()
-                
-                if not clinic_settings:
-                    continue
-                
-                # Skip if SMS and email are both disabled
-                if not clinic_settings.sms_enabled and not clinic_settings.email_enabled:
-                    continue
-                
-                if not clinic_settings.sms_reminder_enabled and not clinic_settings.email_reminder_enabled:
-                    continue
-                
-                # Get reminder hours from settings (not hardcoded)
-                reminder_hours = clinic_settings.confirmation_reminder_hours
-                
-                # Calculate target datetime
-                now = datetime.now()
-                target_datetime = now + timedelta(hours=reminder_hours)
-                target_date = target_datetime.date()
-                
-                # Get appointments that need reminders
-                appointments = db.query(Appointment).options(
-                    joinedload(Appointment.patient),
-                    joinedload(Appointment.doctor)
-                ).filter(
-                    Appointment.clinic_id == clinic.id,
-                    Appointment.date == target_date,
-                    Appointment.status.in_(["unconfirmed", "confirmed"]),
-                    Appointment.status != "cancelled"
-                ).all()
-                
-                for appointment in appointments:
-                    try:
-                        # Check if already sent (prevent duplicates)
-                        # This would require a tracking table, but for now we'll send
-                        
-                        patient = appointment.patient
-                        doctor = appointment.doctor
-                        
-                        if not patient:
-                            continue
-                        
-                        apt_date = format_date(appointment.date, clinic_settings.date_format, clinic_settings.timezone)
-                        apt_time = format_time(appointment.start_time, clinic_settings.time_format)
-                        
-                        # Send SMS if enabled
-                        if (clinic_settings.sms_enabled and 
-                            clinic_settings.sms_reminder_enabled and 
-                            patient.phone):
-                            try:
-                                result = send_appointment_reminder_sms(
-                                    patient_name=patient.first_name or "Patient",
-                                    patient_phone=patient.phone,
-                                    doctor_name=doctor.name if doctor else "Your doctor",
-                                    appointment_date=apt_date,
-                                    appointment_time=apt_time,
-                                    hours_until=reminder_hours,
-                                    clinic_name=clinic.name
-                                )
-                                if result.get("success"):
-                                    total_sent += 1
-                                    logger.info(f"Sent SMS reminder to {patient.phone} for appointment {appointment.id}")
-                                else:
-                                    logger.warning(f"Failed to send SMS reminder: {result.get('error')}")
-                                    total_errors += 1
-                            except Exception as e:
-                                logger.error(f"Error sending SMS reminder: {e}")
-                                total_errors += 1
-                        
-                        # Send email if enabled
-                        if (clinic_settings.email_enabled and 
-                            clinic_settings.email_reminder_enabled and 
-                            patient.email):
-                            try:
-                                result = send_appointment_reminder_email(
-                                    patient_name=patient.first_name or "Patient",
-                                    patient_email=patient.email,
-                                    doctor_name=doctor.name if doctor else "Your doctor",
-                                    appointment_date=apt_date,
-                                    appointment_time=apt_time,
-                                    hours_until=reminder_hours,
-                                    clinic_name=clinic.name
-                                )
-                                if result.get("success"):
-                                    total_sent += 1
-                                    logger.info(f"Sent email reminder to {patient.email} for appointment {appointment.id}")
-                                else:
-                                    logger.warning(f"Failed to send email reminder: {result.get('error')}")
-                                    total_errors += 1
-                            except Exception as e:
-                                logger.error(f"Error sending email reminder: {e}")
-                                total_errors += 1
-                                
-                    except Exception as e:
-                        logger.error(f"Error processing appointment {appointment.id}: {e}")
-                        total_errors += 1
-                        
-            except Exception as e:
-                logger.error(f"Error processing clinic {clinic.id}: {e}")
-                total_errors += 1
-        
-        logger.info(f"Confirmation reminders sent: {total_sent}, errors: {total_errors}")
-        return {"sent": total_sent, "errors": total_errors}
-        
-    except Exception as e:
-        logger.error(f"Error in send_confirmation_reminders task: {e}")
-        return {"sent": 0, "errors": 1, "error": str(e)}
+        clinic_ids = _due_clinic_ids(db, kind)
     finally:
         db.close()
 
+    if not clinic_ids:
+        logger.info(f"No clinics due for {kind} reminders")
+        return {"clinics": 0, "tasks": 0}
 
-@celery_app.task(name="app.tasks.reminders.send_intake_reminders")
-def send_intake_reminders():
-    """Send intake form reminders for all clinics"""
+    size = max(1, settings.REMINDER_CLINICS_PER_TASK)
+    chunks = [clinic_ids[i:i + size] for i in range(0, len(clinic_ids), size)]
+    header = group(clinic_task.s(chunk).set(routing_key=f"reminders.{kind}") for chunk in chunks)
+    result = chord(header)(aggregate_reminder_results.s(kind))
+
+    logger.info(f"Dispatched {kind} reminders for {len(clinic_ids)} clinics in {len(chunks)} tasks")
+    return {"clinics": len(clinic_ids), "tasks": len(chunks), "aggregate_task_id": result.id}
+
+
+def _run_for_clinics(
+    kind: str,
+    clinic_ids: List[str],
+    send_for_clinic: Callable[[Session, Clinic], Tuple[int, int]]
+) -> Dict[str, Dict]:
+    """
+    Run send_for_clinic for each clinic in the chunk, timing each one. A failing
+    clinic is counted as an error and the rest of the chunk carries on.
+    """
+    results = {}
     db = SessionLocal()
     try:
-        # Get all clinics
-        from app.models.clinic import Clinic
-        clinics = db.query(Clinic).all()
-        
-        total_sent = 0
-        total_errors = 0
-        
-        for clinic in clinics:
+        for clinic_id in clinic_ids:
+            started = time.perf_counter()
             try:
-                # Get clinic settings
-                clinic_settings = db.query(ClinicSettings).filter(
-                    ClinicSettings.clinic_id == clinic.id
-                ).first()
-                
-                if not clinic_settings:
-                    continue
-                
-                # Skip if SMS and email are both disabled
-                if not clinic_settings.sms_enabled and not clinic_settings.email_enabled:
-                    continue
-                
-                # Get reminder hours from settings (not hardcoded)
-                reminder_hours = clinic_settings.intake_reminder_hours
-                
-                # Calculate target date range
-                now = datetime.now()
-                target_datetime = now + timedelta(hours=reminder_hours)
-                target_date = target_datetime.date()
-                today = date.today()
-                
-                # Get appointments that need intake reminders
-                appointments = db.query(Appointment).options(
-                    joinedload(Appointment.patient),
-                    joinedload(Appointment.doctor)
-                ).filter(
-                    Appointment.clinic_id == clinic.id,
-                    Appointment.date >= today,
-                    Appointment.date <= target_date,
-                    Appointment.intake_status == "missing",
-                    Appointment.status != "cancelled"
-                ).all()
-                
-                for appointment in appointments:
-                    try:
-                        patient = appointment.patient
-                        doctor = appointment.doctor
-                        
-                        if not patient:
-                            continue
-                        
-                        apt_date = format_date(appointment.date, clinic_settings.date_format, clinic_settings.timezone)
-                        intake_url = f"{settings.FRONTEND_URL}/intake/{appointment.id}"
-                        
-                        # Send SMS if enabled
-                        if (clinic_settings.sms_enabled and 
-                            patient.phone):
-                            try:
-                                result = send_intake_reminder_sms(
-                                    patient_name=patient.first_name or "Patient",
-                                    patient_phone=patient.phone,
-                                    intake_url=intake_url,
-                                    appointment_date=apt_date,
-                                    clinic_name=clinic.name
-                                )
-                                if result.get("success"):
-                                    total_sent += 1
-                                    logger.info(f"Sent intake SMS reminder to {patient.phone} for appointment {appointment.id}")
-                                else:
-                                    logger.warning(f"Failed to send intake SMS reminder: {result.get('error')}")
-                                    total_errors += 1
-                            except Exception as e:
-                                logger.error(f"Error sending intake SMS reminder: {e}")
-                                total_errors += 1
-                        
-                        # Send email if enabled
-                        if (clinic_settings.email_enabled and 
-                            patient.email):
-                            try:
-                                result = send_intake_reminder_email(
-                                    patient_name=patient.first_name or "Patient",
-                                    patient_email=patient.email,
-                                    intake_url=intake_url,
-                                    appointment_date=apt_date,
-                                    clinic_name=clinic.name
-                                )
-                                if result.get("success"):
-                                    total_sent += 1
-                                    logger.info(f"Sent intake email reminder to {patient.email} for appointment {appointment.id}")
-                                else:
-                                    logger.warning(f"Failed to send intake email reminder: {result.get('error')}")
-                                    total_errors += 1
-                            except Exception as e:
-                                logger.error(f"Error sending intake email reminder: {e}")
-                                total_errors += 1
-                                
-                    except Exception as e:
-                        logger.error(f"Error processing appointment {appointment.id}: {e}")
-                        total_errors += 1
-                        
+                clinic = db.query(Clinic).filter(Clinic.id == clinic_id).first()
+                sent, errors = send_for_clinic(db, clinic) if clinic else (0, 0)
             except Exception as e:
-                logger.error(f"Error processing clinic {clinic.id}: {e}")
-                total_errors += 1
-        
-        logger.info(f"Intake reminders sent: {total_sent}, errors: {total_errors}")
-        return {"sent": total_sent, "errors": total_errors}
-        
-    except Exception as e:
-        logger.error(f"Error in send_intake_reminders task: {e}")
-        return {"sent": 0, "errors": 1, "error": str(e)}
+                logger.error(f"Error processing clinic {clinic_id}: {e}")
+                db.rollback()
+                sent, errors = 0, 1
+            seconds = round(time.perf_counter() - started, 3)
+            logger.info(f"{kind.capitalize()} reminders for clinic {clinic_id}: sent {sent}, errors {errors} in {seconds}s")
+            results[clinic_id] = {"sent": sent, "errors": errors, "seconds": seconds}
     finally:
         db.close()
+    return results
+
+
+@celery_app.task(name="app.tasks.reminders.aggregate_reminder_results")
+def aggregate_reminder_results(chunk_results: List[Dict[str, Dict]], kind: str):
+    """Chord callback: total the per-clinic results of one dispatch"""
+    clinics = {clinic_id: result for chunk in chunk_results for clinic_id, result in chunk.items()}
+    total_sent = sum(result["sent"] for result in clinics.values())
+    total_errors = sum(result["errors"] for result in clinics.values())
+    slowest = max(clinics.items(), key=lambda item: item[1]["seconds"], default=(None, {"seconds": 0}))
+
+    logger.info(
+        f"{kind.capitalize()} reminders sent: {total_sent}, errors: {total_errors} "
+        f"across {len(clinics)} clinics (slowest {slowest[0]}: {slowest[1]['seconds']}s)"
+    )
+    return {
+        "sent": total_sent,
+        "errors": total_errors,
+        "clinics": len(clinics),
+        "clinics_with_errors": sorted(clinic_id for clinic_id, result in clinics.items() if result["errors"]),
+        "slowest_clinic": {"clinic_id": slowest[0], "seconds": slowest[1]["seconds"]},
+    }
+
 
+def _send_confirmation_reminders_for_clinic(db: Session, clinic: Clinic) -> Tuple[int, int]:
+    """Send one clinic's confirmation reminders; returns (sent, errors)"""
+    sent = 0
+    errors = 0
+    
+    # Get clinic settings
+    clinic_settings = db.query(ClinicSettings).filter(
+        ClinicSettings.clinic_id == clinic.id
+    ).first()
+    
+    if not clinic_settings:
+        return 0, 0
+    
+    # Skip if SMS and email are both disabled
+    if not clinic_settings.sms_enabled and not clinic_settings.email_enabled:
+        return 0, 0
+    
+    if not clinic_settings.sms_reminder_enabled and not clinic_settings.email_reminder_enabled:
+        return 0, 0
+    
+    # Get reminder hours from settings (not hardcoded)
+    reminder_hours = clinic_settings.confirmation_reminder_hours
+    
+    # Calculate target datetime
+    now = datetime.now()
+    target_datetime = now + timedelta(hours=reminder_hours)
+    target_date = target_datetime.date()
+    
+    # Get appointments that need reminders
+    appointments = db.query(Appointment).options(
+        joinedload(Appointment.patient),
+        joinedload(Appointment.doctor)
+    ).filter(
+        Appointment.clinic_id == clinic.id,
+        Appointment.date == target_date,
+        Appointment.status.in_(["unconfirmed", "confirmed"]),
+        Appointment.status != "cancelled"
+    ).all()
+    
+    for appointment in appointments:
+        try:
+            # Check if already sent (prevent duplicates)
+            # This would require a tracking table, but for now we'll send
+            
+            patient = appointment.patient
+            doctor = appointment.doctor
+            
+            if not patient:
+                continue
+            
+            apt_date = format_date(appointment.date, clinic_settings.date_format, clinic_settings.timezone)
+            apt_time = format_time(appointment.start_time, clinic_settings.time_format)
+            
+            # Send SMS if enabled
+            if (clinic_settings.sms_enabled and 
+                clinic_settings.sms_reminder_enabled and 
+                patient.phone):
+                try:
+                    result = send_appointment_reminder_sms(
+                        patient_name=patient.first_name or "Patient",
+                        patient_phone=patient.phone,
+                        doctor_name=doctor.name if doctor else "Your doctor",
+                        appointment_date=apt_date,
+                        appointment_time=apt_time,
+                        hours_until=reminder_hours,
+                        clinic_name=clinic.name
+                    )
+                    if result.get("success"):
+                        sent += 1
+                        logger.info(f"Sent SMS reminder to {patient.phone} for appointment {appointment.id}")
+                    else:
+                        logger.warning(f"Failed to send SMS reminder: {result.get('error')}")
+                        errors += 1
+                except Exception as e:
+                    logger.error(f"Error sending SMS reminder: {e}")
+                    errors += 1
+            
+            # Send email if enabled
+            if (clinic_settings.email_enabled and 
+                clinic_settings.email_reminder_enabled and 
+                patient.email):
+                try:
+                    result = send_appointment_reminder_email(
+                        patient_name=patient.first_name or "Patient",
+                        patient_email=patient.email,
+                        doctor_name=doctor.name if doctor else "Your doctor",
+                        appointment_date=apt_date,
+                        appointment_time=apt_time,
+                        hours_until=reminder_hours,
+                        clinic_name=clinic.name
+                    )
+                    if result.get("success"):
+                        sent += 1
+                        logger.info(f"Sent email reminder to {patient.email} for appointment {appointment.id}")
+                    else:
+                        logger.warning(f"Failed to send email reminder: {result.get('error')}")
+                        errors += 1
+                except Exception as e:
+                    logger.error(f"Error sending email reminder: {e}")
+                    errors += 1
+                    
+        except Exception as e:
+            logger.error(f"Error processing appointment {appointment.id}: {e}")
+            errors += 1
+    
+    return sent, errors
+
+
+@celery_app.task(name="app.tasks.reminders.send_confirmation_reminders_for_clinics")
+def send_confirmation_reminders_for_clinics(clinic_ids: List[str]):
+    """Send confirmation reminders for a chunk of clinics"""
+    return _run_for_clinics(CONFIRMATION, clinic_ids, _send_confirmation_reminders_for_clinic)
+
+
+@celery_app.task(name="app.tasks.reminders.send_confirmation_reminders")
+def send_confirmation_reminders():
+    """Send confirmation reminders for all clinics, one sub-task per clinic chunk"""
+    return _dispatch(CONFIRMATION, send_confirmation_reminders_for_clinics)
+
+
+def _send_intake_reminders_for_clinic(db: Session, clinic: Clinic) -> Tuple[int, int]:
+    """Send one clinic's intake form reminders; returns (sent, errors)"""
+    sent = 0
+    errors = 0
+    
+    # Get clinic settings
+    clinic_settings = db.query(ClinicSettings).filter(
+        ClinicSettings.clinic_id == clinic.id
+    ).first()
+    
+    if not clinic_settings:
+        return 0, 0
+    
+    # Skip if SMS and email are both disabled
+    if not clinic_settings.sms_enabled and not clinic_settings.email_enabled:
+        return 0, 0
+    
+    # Get reminder hours from settings (not hardcoded)
+    reminder_hours = clinic_settings.intake_reminder_hours
+    
+    # Calculate target date range
+    now = datetime.now()
+    target_datetime = now + timedelta(hours=reminder_hours)
+    target_date = target_datetime.date()
+    today = date.today()
+    
+    # Get appointments that need intake reminders
+    appointments = db.query(Appointment).options(
+        joinedload(Appointment.patient),
+        joinedload(Appointment.doctor)
+    ).filter(
+        Appointment.clinic_id == clinic.id,
+        Appointment.date >= today,
+        Appointment.date <= target_date,
+        Appointment.intake_status == "missing",
+        Appointment.status != "cancelled"
+    ).all()
+    
+    for appointment in appointments:
+        try:
+            patient = appointment.patient
+            doctor = appointment.doctor
+            
+            if not patient:
+                continue
+            
+            apt_date = format_date(appointment.date, clinic_settings.date_format, clinic_settings.timezone)
+            intake_url = f"{settings.FRONTEND_URL}/intake/{appointment.id}"
+            
+            # Send SMS if enabled
+            if (clinic_settings.sms_enabled and 
+                patient.phone):
+                try:
+                    result = send_intake_reminder_sms(
+                        patient_name=patient.first_name or "Patient",
+                        patient_phone=patient.phone,
+                        intake_url=intake_url,
+                        appointment_date=apt_date,
+                        clinic_name=clinic.name
+                    )
+                    if result.get("success"):
+                        sent += 1
+                        logger.info(f"Sent intake SMS reminder to {patient.phone} for appointment {appointment.id}")
+                    else:
+                        logger.warning(f"Failed to send intake SMS reminder: {result.get('error')}")
+                        errors += 1
+                except Exception as e:
+                    logger.error(f"Error sending intake SMS reminder: {e}")
+                    errors += 1
+            
+            # Send email if enabled
+            if (clinic_settings.email_enabled and 
+                patient.email):
+                try:
+                    result = send_intake_reminder_email(
+                        patient_name=patient.first_name or "Patient",
+                        patient_email=patient.email,
+                        intake_url=intake_url,
+                        appointment_date=apt_date,
+                        clinic_name=clinic.name
+                    )
+                    if result.get("success"):
+                        sent += 1
+                        logger.info(f"Sent intake email reminder to {patient.email} for appointment {appointment.id}")
+                    else:
+                        logger.warning(f"Failed to send intake email reminder: {result.get('error')}")
+                        errors += 1
+                except Exception as e:
+                    logger.error(f"Error sending intake email reminder: {e}")
+                    errors += 1
+                    
+        except Exception as e:
+            logger.error(f"Error processing appointment {appointment.id}: {e}")
+            errors += 1
+    
+    return sent, errors
+
+
+@celery_app.task(name="app.tasks.reminders.send_intake_reminders_for_clinics")
+def send_intake_reminders_for_clinics(clinic_ids: List[str]):
+    """Send intake form reminders for a chunk of clinics"""
+    return _run_for_clinics(INTAKE, clinic_ids, _send_intake_reminders_for_clinic)
+
+
+@celery_app.task(name="app.tasks.reminders.send_intake_reminders")
+def send_intake_reminders():
+    """Send intake form reminders for all clinics, one sub-task per clinic chunk"""
+    return _dispatch(INTAKE, send_intake_reminders_for_clinics)
@@ -0,0 +1,141 @@
+"""
+Deferred-column benchmark on a large voice_ai_logs table
+Run (from dashboard_backend, database seeded with app/seed.py):
+    python scripts/deferred_columns_benchmark.py                      # 50,000 logs, 4KB transcripts
+    python scripts/deferred_columns_benchmark.py --rows 200000 --transcript-kb 8
+    python scripts/deferred_columns_benchmark.py --keep               # leave the rows for a rerun with --skip-seed
+
+Seeds call logs with transcript / ai_response / patient_response / call_metadata
+for the seeded clinic, then runs the owner-dashboard style scan
+(db.query(VoiceAILog)...all() over 90 days, counting outcomes) two ways:
+  - eager      .options(undefer_group(CALL_CONTENT)) - what every query did before
+  - deferred   the model default now: content columns are not selected
+and reports latency and peak Python heap (tracemalloc) for each.
+"""
+import argparse
+import os
+import sys
+import time
+import tracemalloc
+from datetime import date, datetime, timedelta, timezone
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from psycopg2.extras import Json, execute_values
+from sqlalchemy.orm import undefer_group
+
+from app.database import SessionLocal
+from app.models.owner import CALL_CONTENT, VoiceAILog
+from app.models.patient import Patient
+
+CALL_SID_PREFIX = "bench-deferred-"
+WINDOW_DAYS = 90
+
+
+def seed(rows: int, transcript_kb: int):
+    db = SessionLocal()
+    try:
+        patient = db.query(Patient).first()
+        line = "AI: Hi, this is Clinicflow calling to confirm your appointment.\nPatient: Yes, I'll be there.\n"
+        transcript = (line * (transcript_kb * 1024 // len(line) + 1))[:transcript_kb * 1024]
+        now = datetime.now(timezone.utc)
+        raw = db.connection().connection
+        with raw.cursor() as cur:
+            values = (
+                (patient.clinic_id, patient.id, f"{CALL_SID_PREFIX}{i}", "confirmation", "completed",
+                 "confirmed" if i % 3 else "no_answer", 45, transcript, transcript[:512], transcript[:256],
+                 Json({"model": "bench", "turns": 6, "latency_ms": [120, 95, 140]}),
+                 now - timedelta(minutes=i * WINDOW_DAYS * 24 * 60 // rows))
+                for i in range(rows)
+            )
+            execute_values(
+                cur,
+                "INSERT INTO voice_ai_logs (id, clinic_id, patient_id, call_sid, call_type, status, outcome, "
+                "duration_seconds, transcript, ai_response, patient_response, call_metadata, created_at, "
+                "direction, escalated) VALUES %s",
+                values,
+                template="(gen_random_uuid(), %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, 'outbound', false)",
+                page_size=5000
+            )
+        db.commit()
+        return patient.clinic_id
+    finally:
+        db.close()
+
+
+def cleanup():
+    db = SessionLocal()
+    try:
+        deleted = db.query(VoiceAILog).filter(
+            VoiceAILog.call_sid.like(f"{CALL_SID_PREFIX}%")
+        ).delete(synchronize_session=False)
+        db.commit()
+        print(f"Deleted {deleted} benchmark voice logs")
+    finally:
+        db.close()
+
+
+def scan(clinic_id, eager: bool):
+    db = SessionLocal()
+    try:
+        query = db.query(VoiceAILog)
+        if eager:
+            query = query.options(undefer_group(CALL_CONTENT))
+        logs = query.filter(
+            VoiceAILog.clinic_id == clinic_id,
+            VoiceAILog.created_at >= datetime.combine(date.today() - timedelta(days=WINDOW_DAYS), datetime.min.time())
+        ).all()
+        recovered = len([v for v in logs if v.outcome in ["confirmed", "rescheduled"]])
+        completed = len([v for v in logs if v.status == "completed"])
+        return len(logs), recovered, completed
+    finally:
+        db.close()
+
+
+def measure(label, clinic_id, eager, repeat):
+    scan(clinic_id, eager)  # warm-up
+    timings = []
+    peak = 0
+    for _ in range(repeat):
+        tracemalloc.start()
+        started = time.perf_counter()
+        rows, _, _ = scan(clinic_id, eager)
+        timings.append(time.perf_counter() - started)
+        peak = max(peak, tracemalloc.get_traced_memory()[1])
+        tracemalloc.stop()
+    print(
+        f"{label:<10} {rows:>8} rows  best {min(timings) * 1000:8.1f}ms  "
+        f"peak heap {peak / 1024 / 1024:8.1f}MB"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=50_000)
+    parser.add_argument("--transcript-kb", type=int, default=4)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--skip-seed", action="store_true")
+    parser.add_argument("--keep", action="store_true", help="Don't delete the benchmark rows afterwards")
+    args = parser.parse_args()
+
+    if args.skip_seed:
+        db = SessionLocal()
+        clinic_id = db.query(VoiceAILog.clinic_id).filter(
+            VoiceAILog.call_sid.like(f"{CALL_SID_PREFIX}%")
+        ).limit(1).scalar()
+        db.close()
+    else:
+        started = time.perf_counter()
+        clinic_id = seed(args.rows, args.transcript_kb)
+        print(f"Seeded {args.rows} voice logs in {time.perf_counter() - started:.1f}s\n")
+
+    try:
+        measure("eager", clinic_id, True, args.repeat)
+        measure("deferred", clinic_id, False, args.repeat)
+    finally:
+        if not args.keep:
+            cleanup()
+
+
+if __name__ == "__main__":
+    main()
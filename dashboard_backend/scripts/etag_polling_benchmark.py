@@ -0,0 +1,68 @@
+"""
+Polling benchmark for conditional GETs on an idle clinic
+Run (API running on BASE_URL, seeded data, Redis up):
+    python scripts/etag_polling_benchmark.py
+    python scripts/etag_polling_benchmark.py --polls 200 --email admin@clinic.com --password admin123
+
+Logs in and polls each dashboard/schedule endpoint twice over: as a plain
+client (full 200 every time) and as a client that sends back the ETag it got
+(If-None-Match -> 304 while nothing changes). Nothing is written in between, so
+the second run measures the idle-clinic path: auth + one Redis MGET.
+"""
+import argparse
+import statistics
+import time
+
+import httpx
+
+ENDPOINTS = [
+    "/api/dashboard/admin",
+    "/api/dashboard/needs-attention",
+    "/api/dashboard/admin/analytics",
+    "/api/schedule/day",
+    "/api/owner/dashboard?period=quarter",
+]
+
+
+def poll(client: httpx.Client, path: str, polls: int, conditional: bool):
+    latencies, statuses, body_bytes = [], {}, 0
+    etag = None
+    for _ in range(polls):
+        headers = {"If-None-Match": etag} if conditional and etag else {}
+        started = time.perf_counter()
+        response = client.get(path, headers=headers)
+        latencies.append((time.perf_counter() - started) * 1000)
+        statuses[response.status_code] = statuses.get(response.status_code, 0) + 1
+        body_bytes += len(response.content)
+        etag = response.headers.get("ETag", etag)
+    return latencies, statuses, body_bytes
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--base-url", default="http://localhost:8000")
+    parser.add_argument("--email", default="admin@clinic.com")
+    parser.add_argument("--password", default="admin123")
+    parser.add_argument("--polls", type=int, default=100)
+    args = parser.parse_args()
+
+    with httpx.Client(base_url=args.base_url, timeout=30.0) as client:
+        login = client.post("/api/auth/login", json={"email": args.email, "password": args.password})
+        login.raise_for_status()
+        client.headers["Authorization"] = f"Bearer {login.json()['access_token']}"
+
+        print(f"{args.polls} polls per endpoint against an idle clinic\n")
+        for path in ENDPOINTS:
+            for conditional in (False, True):
+                latencies, statuses, body_bytes = poll(client, path, args.polls, conditional)
+                label = "If-None-Match" if conditional else "plain"
+                codes = " ".join(f"{code}x{count}" for code, count in sorted(statuses.items()))
+                print(
+                    f"{path:<40} {label:<14} median {statistics.median(latencies):7.1f}ms "
+                    f"p95 {sorted(latencies)[int(0.95 * (len(latencies) - 1))]:7.1f}ms "
+                    f"{body_bytes / len(latencies) / 1024:7.1f}KB/poll  [{codes}]"
+                )
+
+
+if __name__ == "__main__":
+    main()
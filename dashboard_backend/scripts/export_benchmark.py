@@ -0,0 +1,169 @@
+"""
+Export throughput / memory benchmark
+Run (from dashboard_backend, database seeded with app/seed.py):
+    python scripts/export_benchmark.py                 # seed 1,000,000 appointments, then measure
+    python scripts/export_benchmark.py --rows 200000
+    python scripts/export_benchmark.py --skip-seed     # reuse rows from an earlier run
+    python scripts/export_benchmark.py --cleanup       # delete the benchmark rows
+
+Benchmark rows are inserted for the first doctor/patient of the seeded clinic,
+dated in 2099 so they never show up in a real schedule. Each run exports them
+three ways in-process and reports rows/s and peak Python heap (tracemalloc):
+  - paged      the old approach: /api/appointments-style pages of ORM objects
+               with joinedload, turned into AppointmentResponse models
+  - csv        export_service.iter_csv over a server-side cursor
+  - parquet    export_service.iter_parquet (skipped without pyarrow)
+"""
+import argparse
+import os
+import sys
+import time
+import tracemalloc
+from datetime import date, time as dtime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from psycopg2.extras import execute_values
+from sqlalchemy.orm import joinedload
+
+from app.api.exports import APPOINTMENT_COLUMNS
+from app.database import SessionLocal
+from app.models.appointment import Appointment
+from app.models.doctor import Doctor
+from app.models.patient import Patient
+from app.schemas.appointment import AppointmentResponse
+from app.services.export_service import export_stream, parquet_available
+
+BENCH_FROM = date(2099, 1, 1)
+PAGE_SIZE = 1000
+
+
+def seed(rows: int):
+    db = SessionLocal()
+    try:
+        doctor = db.query(Doctor).order_by(Doctor.created_at).first()
+        patient = db.query(Patient).filter(Patient.clinic_id == doctor.clinic_id).first()
+        raw = db.connection().connection
+        with raw.cursor() as cur:
+            values = (
+                (doctor.clinic_id, doctor.id, patient.id,
+                 BENCH_FROM + timedelta(days=i // 32), dtime(8 + (i % 32) // 4, (i % 4) * 15),
+                 dtime(8 + (i % 32) // 4, (i % 4) * 15 + 14), 15,
+                 "in-clinic", "follow-up", "confirmed", "completed")
+                for i in range(rows)
+            )
+            execute_values(
+                cur,
+                "INSERT INTO appointments (id, clinic_id, doctor_id, patient_id, date, start_time, end_time, "
+                "duration, visit_type, visit_category, status, intake_status, arrived) VALUES %s",
+                values,
+                template="(gen_random_uuid(), %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, false)",
+                page_size=10000
+            )
+        db.commit()
+        return doctor.clinic_id
+    finally:
+        db.close()
+
+
+def cleanup():
+    db = SessionLocal()
+    try:
+        deleted = db.query(Appointment).filter(Appointment.date >= BENCH_FROM).delete(synchronize_session=False)
+        db.commit()
+        print(f"Deleted {deleted} benchmark appointments")
+    finally:
+        db.close()
+
+
+def bench_clinic_id():
+    db = SessionLocal()
+    try:
+        return db.query(Appointment.clinic_id).filter(Appointment.date >= BENCH_FROM).limit(1).scalar()
+    finally:
+        db.close()
+
+
+def paged(clinic_id):
+    db = SessionLocal()
+    try:
+        query = db.query(Appointment).options(
+            joinedload(Appointment.doctor), joinedload(Appointment.patient)
+        ).filter(
+            Appointment.clinic_id == clinic_id, Appointment.date >= BENCH_FROM
+        ).order_by(Appointment.date, Appointment.start_time, Appointment.id)
+        skip = 0
+        while True:
+            page = query.offset(skip).limit(PAGE_SIZE).all()
+            if not page:
+                break
+            yield [AppointmentResponse.model_validate(apt).model_dump_json().encode() for apt in page]
+            skip += PAGE_SIZE
+            db.expunge_all()
+    finally:
+        db.close()
+
+
+def streamed(clinic_id, export_format):
+    def build_query(db):
+        return db.query(*[column for _, column, _ in APPOINTMENT_COLUMNS]).join(
+            Doctor, Doctor.id == Appointment.doctor_id
+        ).join(
+            Patient, Patient.id == Appointment.patient_id
+        ).filter(
+            Appointment.clinic_id == clinic_id, Appointment.date >= BENCH_FROM
+        ).order_by(Appointment.date, Appointment.start_time, Appointment.id)
+
+    return export_stream(APPOINTMENT_COLUMNS, build_query, export_format)
+
+
+def measure(label, chunks, rows):
+    tracemalloc.start()
+    started = time.perf_counter()
+    total = 0
+    for chunk in chunks:
+        total += sum(map(len, chunk)) if isinstance(chunk, list) else len(chunk)
+    elapsed = time.perf_counter() - started
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(
+        f"{label:<8} {elapsed:8.1f}s {rows / elapsed:10.0f} rows/s "
+        f"{total / 1024 / 1024:8.1f}MB out  peak heap {peak / 1024 / 1024:7.1f}MB"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--skip-seed", action="store_true")
+    parser.add_argument("--skip-paged", action="store_true", help="The paged baseline is slow at 1M rows")
+    parser.add_argument("--cleanup", action="store_true")
+    args = parser.parse_args()
+
+    if args.cleanup:
+        cleanup()
+        return
+
+    if args.skip_seed:
+        clinic_id = bench_clinic_id()
+    else:
+        started = time.perf_counter()
+        clinic_id = seed(args.rows)
+        print(f"Seeded {args.rows} appointments in {time.perf_counter() - started:.1f}s")
+
+    db = SessionLocal()
+    rows = db.query(Appointment).filter(Appointment.date >= BENCH_FROM).count()
+    db.close()
+    print(f"Exporting {rows} rows\n")
+
+    if not args.skip_paged:
+        measure("paged", paged(clinic_id), rows)
+    measure("csv", streamed(clinic_id, "csv"), rows)
+    if parquet_available():
+        measure("parquet", streamed(clinic_id, "parquet"), rows)
+    else:
+        print("parquet  skipped (pyarrow not installed)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,160 @@
+"""
+Serialization benchmark for list endpoints, per 1,000 rows
+Run (from dashboard_backend, database seeded with app/seed.py):
+    python scripts/serialization_benchmark.py
+    python scripts/serialization_benchmark.py --repeat 20 --transcript-kb 4
+
+Inserts 1,000 appointments (dated 2099) and 1,000 voice logs with transcripts for
+the seeded clinic, times each list path end to end (query + build + JSON encode)
+and deletes the rows again:
+  - before   ORM objects with joinedload -> AppointmentResponse / hand-built
+             VoiceAILogResponse -> pydantic JSON (transcripts included)
+  - after    list_appointments / get_voice_ai_logs: column-only select -> Row
+             tuples -> dicts -> orjson (transcripts excluded by default)
+  - sparse   the same with a narrow fields= list
+"""
+import argparse
+import os
+import sys
+import time
+import types
+from datetime import date, datetime, time as dtime, timedelta, timezone
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy.orm import joinedload
+
+from app.api.appointments import list_appointments
+from app.api.owner import get_voice_ai_logs
+from app.database import SessionLocal
+from app.models.appointment import Appointment
+from app.models.doctor import Doctor
+from app.models.owner import VoiceAILog
+from app.models.patient import Patient
+from app.schemas.appointment import AppointmentList, AppointmentResponse
+from app.schemas.owner import VoiceAILogResponse
+
+ROWS = 1000
+BENCH_DATE = date(2099, 6, 1)
+CALL_SID_PREFIX = "bench-serialization-"
+
+
+def seed(db, transcript_kb: int):
+    doctor = db.query(Doctor).order_by(Doctor.created_at).first()
+    patient = db.query(Patient).filter(Patient.clinic_id == doctor.clinic_id).first()
+    transcript = ("AI: Hi, this is Clinicflow confirming your appointment.\nPatient: Yes. " * 20)
+    transcript = (transcript * (transcript_kb * 1024 // len(transcript) + 1))[:transcript_kb * 1024]
+    now = datetime.now(timezone.utc)
+    for i in range(ROWS):
+        db.add(Appointment(
+            clinic_id=doctor.clinic_id, doctor_id=doctor.id, patient_id=patient.id,
+            date=BENCH_DATE + timedelta(days=i // 32),
+            start_time=dtime(8 + (i % 32) // 4, (i % 4) * 15), end_time=dtime(8 + (i % 32) // 4, (i % 4) * 15 + 14),
+            duration=15, visit_type="in-clinic", visit_category="follow-up", status="confirmed"
+        ))
+        db.add(VoiceAILog(
+            clinic_id=doctor.clinic_id, patient_id=patient.id, call_sid=f"{CALL_SID_PREFIX}{i}",
+            call_type="confirmation", status="completed", outcome="confirmed",
+            initiated_at=now, ended_at=now, duration_seconds=60, transcript=transcript,
+            from_number="+15550000000", to_number="+15551111111"
+        ))
+    db.commit()
+    return doctor.clinic_id
+
+
+def cleanup(db):
+    db.query(Appointment).filter(Appointment.date >= BENCH_DATE).delete(synchronize_session=False)
+    db.query(VoiceAILog).filter(VoiceAILog.call_sid.like(f"{CALL_SID_PREFIX}%")).delete(synchronize_session=False)
+    db.commit()
+
+
+def appointments_before(db, user):
+    query = db.query(Appointment).options(
+        joinedload(Appointment.doctor), joinedload(Appointment.patient)
+    ).filter(Appointment.clinic_id == user.clinic_id)
+    appointments = query.order_by(Appointment.date, Appointment.start_time).limit(ROWS).all()
+    return AppointmentList(
+        items=[AppointmentResponse.model_validate(apt) for apt in appointments],
+        total=query.count()
+    ).model_dump_json().encode()
+
+
+def appointments_after(db, user, fields=None):
+    return list_appointments(
+        skip=0, limit=ROWS, date=None, doctor_id=None, status_filter=None, intake_status=None,
+        fields=fields, current_user=user, db=db
+    ).body
+
+
+def voice_logs_before(db, user):
+    logs = db.query(VoiceAILog).filter(
+        VoiceAILog.clinic_id == user.clinic_id
+    ).order_by(VoiceAILog.created_at.desc()).limit(ROWS).all()
+    return b"[" + b",".join(VoiceAILogResponse(
+        id=str(log.id), clinic_id=str(log.clinic_id),
+        appointment_id=str(log.appointment_id) if log.appointment_id else None,
+        patient_id=str(log.patient_id) if log.patient_id else None,
+        call_sid=log.call_sid, call_type=log.call_type, direction=log.direction, status=log.status,
+        outcome=log.outcome, initiated_at=log.initiated_at, answered_at=log.answered_at,
+        ended_at=log.ended_at, duration_seconds=log.duration_seconds, transcript=log.transcript,
+        escalated=log.escalated, escalation_reason=log.escalation_reason,
+        from_number=log.from_number, to_number=log.to_number, created_at=log.created_at
+    ).model_dump_json().encode() for log in logs) + b"]"
+
+
+def voice_logs_after(db, user, fields=None):
+    # The endpoint caps limit at 100; call it ten times for 1k rows
+    return b"".join(get_voice_ai_logs(
+        skip=page * 100, limit=100, status=None, call_type=None, date_from=None, date_to=None,
+        fields=fields, current_user=user, db=db
+    ).body for page in range(ROWS // 100))
+
+
+def measure(label, fn, repeat):
+    db = SessionLocal()
+    try:
+        size = len(fn(db))  # warm-up
+        started = time.perf_counter()
+        for _ in range(repeat):
+            fn(db)
+            db.expunge_all()
+        elapsed = (time.perf_counter() - started) / repeat
+    finally:
+        db.close()
+    print(f"{label:<52} {elapsed * 1000:8.1f} ms / 1k rows {size / 1024:9.1f}KB")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--repeat", type=int, default=10)
+    parser.add_argument("--transcript-kb", type=int, default=2)
+    args = parser.parse_args()
+
+    db = SessionLocal()
+    try:
+        clinic_id = seed(db, args.transcript_kb)
+    finally:
+        db.close()
+    user = types.SimpleNamespace(clinic_id=clinic_id, role="admin", doctor_id=None)
+
+    try:
+        measure("appointments  before (ORM + pydantic)", lambda db: appointments_before(db, user), args.repeat)
+        measure("appointments  after  (Row + orjson)", lambda db: appointments_after(db, user), args.repeat)
+        measure(
+            "appointments  sparse fields=id,date,start_time,status",
+            lambda db: appointments_after(db, user, "id,date,start_time,status"), args.repeat
+        )
+        measure("voice logs    before (ORM + pydantic, transcripts)", lambda db: voice_logs_before(db, user), args.repeat)
+        measure("voice logs    after  (Row + orjson, no transcripts)", lambda db: voice_logs_after(db, user), args.repeat)
+        measure(
+            "voice logs    sparse fields=id,status,outcome,created_at",
+            lambda db: voice_logs_after(db, user, "id,status,outcome,created_at"), args.repeat
+        )
+    finally:
+        db = SessionLocal()
+        cleanup(db)
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,217 @@
+"""
+Test script for Google ID-token verification (app/services/google_auth.py)
+Run: python test_google_auth.py   (or: pytest test_google_auth.py)
+
+No Google account or network needed: tokens are signed with a locally generated
+RSA keypair and the JWKS is served by a local HTTP server that stands in for
+https://www.googleapis.com/oauth2/v3/certs.
+"""
+import json
+import time
+import asyncio
+import threading
+from http.server import BaseHTTPRequestHandler, HTTPServer
+
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import rsa
+from jose import jwk, jwt
+
+from app.config import settings
+from app.services import google_auth
+from app.services.http_clients import close_http_clients
+
+CLIENT_ID = "test-client.apps.googleusercontent.com"
+
+
+def _keypair(kid):
+    private_key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    private_pem = private_key.private_bytes(
+        serialization.Encoding.PEM, serialization.PrivateFormat.PKCS8, serialization.NoEncryption()
+    ).decode()
+    public_pem = private_key.public_key().public_bytes(
+        serialization.Encoding.PEM, serialization.PublicFormat.SubjectPublicKeyInfo
+    ).decode()
+    public_jwk = jwk.construct(public_pem, "RS256").to_dict()
+    public_jwk.update({"kid": kid, "use": "sig", "alg": "RS256"})
+    return private_pem, public_jwk
+
+
+class FakeJWKS:
+    """Serves whatever keys are in self.keys and counts fetches"""
+
+    def __init__(self):
+        self.keys = []
+        self.max_age = 300
+        self.fetches = 0
+        jwks = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                jwks.fetches += 1
+                body = json.dumps({"keys": jwks.keys}).encode()
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Cache-Control", f"public, max-age={jwks.max_age}, must-revalidate, no-transform")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        self.server = HTTPServer(("127.0.0.1", 0), Handler)
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.url = f"http://127.0.0.1:{self.server.server_address[1]}/oauth2/v3/certs"
+
+
+PRIVATE_KEY, PUBLIC_JWK = _keypair("key-1")
+OTHER_PRIVATE_KEY, OTHER_JWK = _keypair("key-2")
+JWKS = FakeJWKS()
+
+
+def _reset(keys):
+    """Point google_auth at the fake JWKS with an empty cache"""
+    settings.GOOGLE_CLIENT_ID = CLIENT_ID
+    settings.GOOGLE_JWKS_URL = JWKS.url
+    JWKS.keys = keys
+    JWKS.fetches = 0
+    google_auth._jwks_keys = {}
+    google_auth._jwks_expires_at = 0.0
+    google_auth._jwks_fetched_at = 0.0
+    google_auth._jwks_lock = None
+
+
+def _token(private_key=PRIVATE_KEY, kid="key-1", **overrides):
+    now = int(time.time())
+    claims = {
+        "iss": "https://accounts.google.com",
+        "aud": CLIENT_ID,
+        "sub": "1234567890",
+        "email": "doctor@example.com",
+        "email_verified": True,
+        "name": "Test Doctor",
+        "iat": now,
+        "exp": now + 3600,
+    }
+    claims.update(overrides)
+    return jwt.encode(claims, private_key, algorithm="RS256", headers={"kid": kid})
+
+
+def _verify(*tokens):
+    async def run():
+        try:
+            return [await google_auth.verify_google_token(t) for t in tokens]
+        finally:
+            await close_http_clients()
+
+    results = asyncio.run(run())
+    return results[0] if len(results) == 1 else results
+
+
+def test_valid_token():
+    _reset([PUBLIC_JWK])
+    user = _verify(_token())
+    assert user == {
+        "email": "doctor@example.com",
+        "name": "Test Doctor",
+        "google_id": "1234567890",
+        "email_verified": True,
+    }
+
+
+def test_issuer_without_scheme():
+    _reset([PUBLIC_JWK])
+    assert _verify(_token(iss="accounts.google.com")) is not None
+
+
+def test_wrong_audience():
+    _reset([PUBLIC_JWK])
+    assert _verify(_token(aud="someone-else.apps.googleusercontent.com")) is None
+
+
+def test_wrong_issuer():
+    _reset([PUBLIC_JWK])
+    assert _verify(_token(iss="https://evil.example.com")) is None
+
+
+def test_expired():
+    _reset([PUBLIC_JWK])
+    now = int(time.time())
+    assert _verify(_token(iat=now - 7200, exp=now - 3600)) is None
+
+
+def test_within_leeway():
+    _reset([PUBLIC_JWK])
+    assert _verify(_token(exp=int(time.time()) - 10)) is not None
+
+
+def test_missing_exp():
+    _reset([PUBLIC_JWK])
+    token = jwt.encode(
+        {"iss": "https://accounts.google.com", "aud": CLIENT_ID, "sub": "1"},
+        PRIVATE_KEY, algorithm="RS256", headers={"kid": "key-1"},
+    )
+    assert _verify(token) is None
+
+
+def test_bad_signature():
+    # Signed with key-2's private key but claims to be key-1
+    _reset([PUBLIC_JWK])
+    assert _verify(_token(private_key=OTHER_PRIVATE_KEY)) is None
+
+
+def test_hs256_rejected():
+    _reset([PUBLIC_JWK])
+    token = jwt.encode({"aud": CLIENT_ID}, "secret", algorithm="HS256", headers={"kid": "key-1"})
+    assert _verify(token) is None
+
+
+def test_malformed_token():
+    _reset([PUBLIC_JWK])
+    assert _verify("not-a-jwt") is None
+
+
+def test_jwks_cached():
+    _reset([PUBLIC_JWK])
+    assert all(_verify(_token(), _token(), _token()))
+    assert JWKS.fetches == 1
+
+
+def test_jwks_refreshed_after_max_age():
+    _reset([PUBLIC_JWK])
+    JWKS.max_age = 0
+    try:
+        assert all(_verify(_token(), _token()))
+        assert JWKS.fetches == 2
+    finally:
+        JWKS.max_age = 300
+
+
+def test_key_rotation():
+    # Cached JWKS only has key-1; a token from the new key-2 triggers one refresh
+    _reset([PUBLIC_JWK])
+    assert _verify(_token()) is not None
+    JWKS.keys = [PUBLIC_JWK, OTHER_JWK]
+    google_auth._jwks_fetched_at -= google_auth.JWKS_MIN_REFRESH_SECONDS
+    assert _verify(_token(private_key=OTHER_PRIVATE_KEY, kid="key-2")) is not None
+    assert JWKS.fetches == 2
+
+
+def test_unknown_kid_refresh_rate_limited():
+    _reset([PUBLIC_JWK])
+    assert _verify(_token(kid="nope"), _token(kid="nope")) == [None, None]
+    assert JWKS.fetches == 1
+
+
+if __name__ == "__main__":
+    tests = [(name, fn) for name, fn in sorted(globals().items()) if name.startswith("test_") and callable(fn)]
+    failed = 0
+    for name, fn in tests:
+        try:
+            fn()
+            print(f"✓ {name}")
+        except AssertionError as e:
+            failed += 1
+            print(f"✗ {name}: {e}")
+    print(f"\n{len(tests) - failed}/{len(tests)} passed")
+    raise SystemExit(1 if failed else 0)
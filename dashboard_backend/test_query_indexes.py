@@ -0,0 +1,332 @@
+"""
+EXPLAIN checks for the composite / partial indexes (alembic add_query_indexes)
+and monthly partition pruning on the log tables (alembic add_monthly_partitions)
+Run: python test_query_indexes.py   (or: pytest test_query_indexes.py)
+
+Needs the Postgres at DATABASE_URL. Everything happens in a scratch schema that
+is created from the models, seeded with a few hundred thousand rows across many
+clinics, ANALYZEd, and dropped at the end; the app's own tables are not touched.
+Each test builds the same query an endpoint or task runs and asserts the
+planner picks the index meant for it (on a partitioned table, the partitions'
+copies of it) and, for the log tables, only scans the months it needs.
+"""
+import os
+import uuid
+from datetime import date, datetime, timedelta
+
+from sqlalchemy import create_engine, text
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.database import Base
+from app.models import (
+    Appointment, VoiceAILog, AutomationRule, AutomationExecution,
+    IntakeForm, AIIntakeSummary, Invite
+)
+from app.services.partitions import ensure_partitions
+
+SCHEMA = f"index_check_{os.getpid()}"
+TODAY = date.today()
+
+_engine = None
+_ids = {}
+
+
+def _setup():
+    global _engine
+    if _engine is not None:
+        return
+    _engine = create_engine(settings.DATABASE_URL, connect_args={"options": f"-csearch_path={SCHEMA}"})
+    with _engine.begin() as conn:
+        conn.execute(text(f"CREATE SCHEMA {SCHEMA}"))
+    Base.metadata.create_all(_engine)
+    with _engine.begin() as conn:
+        ensure_partitions(conn, months_back=12)
+        conn.execute(text(SEED_SQL), {"today": TODAY})
+        conn.execute(text("ANALYZE"))
+        _ids["clinic"] = conn.execute(text("SELECT id FROM clinics ORDER BY name LIMIT 1")).scalar()
+        _ids["doctor"] = conn.execute(
+            text("SELECT id FROM doctors WHERE clinic_id = :c LIMIT 1"), {"c": _ids["clinic"]}
+        ).scalar()
+        _ids["rule"] = conn.execute(
+            text("SELECT id FROM automation_rules WHERE clinic_id = :c LIMIT 1"), {"c": _ids["clinic"]}
+        ).scalar()
+        _ids["appointment"] = conn.execute(
+            text("SELECT appointment_id FROM intake_forms WHERE clinic_id = :c LIMIT 1"), {"c": _ids["clinic"]}
+        ).scalar()
+        _ids["intake_form"] = conn.execute(
+            text("SELECT id FROM intake_forms WHERE clinic_id = :c LIMIT 1"), {"c": _ids["clinic"]}
+        ).scalar()
+
+
+def _teardown():
+    if _engine is not None:
+        with _engine.begin() as conn:
+            conn.execute(text(f"DROP SCHEMA {SCHEMA} CASCADE"))
+        _engine.dispose()
+
+
+def setup_module(module):
+    _setup()
+
+
+def teardown_module(module):
+    _teardown()
+
+
+# 40 clinics x (4 doctors, 100 patients, ~2.5k appointments, 2k calls, 8 rules,
+# 2k executions, 500 intake forms, 50 invites)
+SEED_SQL = """
+INSERT INTO clinics (id, name) SELECT gen_random_uuid(), 'Clinic ' || lpad(g::text, 3, '0') FROM generate_series(1, 40) g;
+INSERT INTO users (id, email, name, role, clinic_id)
+    SELECT gen_random_uuid(), 'owner' || row_number() OVER () || '@example.com', 'Owner', 'owner', id FROM clinics;
+INSERT INTO doctors (id, clinic_id, name) SELECT gen_random_uuid(), c.id, 'Dr ' || g FROM clinics c, generate_series(1, 4) g;
+INSERT INTO patients (id, clinic_id, first_name, last_name)
+    SELECT gen_random_uuid(), c.id, 'P', 'N' || g FROM clinics c, generate_series(1, 100) g;
+
+INSERT INTO appointments (id, clinic_id, doctor_id, patient_id, date, start_time, end_time, duration,
+                          visit_type, visit_category, status, intake_status, arrived)
+SELECT gen_random_uuid(), d.clinic_id, d.id,
+       (SELECT p.id FROM patients p WHERE p.clinic_id = d.clinic_id OFFSET (g % 100) LIMIT 1),
+       CAST(:today AS date) - 300 + g / 2, make_time(8 + (g % 16) / 2, (g % 2) * 30, 0),
+       make_time(8 + (g % 16) / 2, (g % 2) * 30 + 29, 0), 30, 'in-clinic', 'follow-up',
+       (ARRAY['confirmed', 'unconfirmed', 'completed', 'completed', 'completed', 'completed', 'no-show', 'cancelled'])[1 + g % 8],
+       CASE WHEN g % 10 = 0 THEN 'missing' ELSE 'completed' END, false
+FROM doctors d, generate_series(1, 640) g;
+
+INSERT INTO voice_ai_logs (id, clinic_id, call_type, direction, status, outcome, duration_seconds, escalated, created_at)
+SELECT gen_random_uuid(), c.id, 'confirmation', 'outbound',
+       CASE WHEN g % 20 = 0 THEN 'failed' ELSE 'completed' END, 'confirmed', 60, g % 50 = 0,
+       now() - make_interval(mins => g * 200)
+FROM clinics c, generate_series(1, 2000) g;
+
+INSERT INTO automation_rules (id, clinic_id, name, rule_type, trigger_event, action_type, enabled, priority)
+SELECT gen_random_uuid(), c.id, 'Rule ' || g, 'reminder',
+       (ARRAY['appointment_created', 'appointment_24h_before', 'appointment_cancelled', 'intake_missing'])[1 + g % 4],
+       'send_sms', g % 3 <> 0, g
+FROM clinics c, generate_series(1, 8) g;
+
+INSERT INTO automation_executions (id, clinic_id, rule_id, status, triggered_at)
+SELECT gen_random_uuid(), r.clinic_id, r.id,
+       (ARRAY['success', 'failed', 'skipped', 'pending'])[1 + g % 4], now() - make_interval(mins => g * 150)
+FROM automation_rules r, generate_series(1, 250) g;
+
+INSERT INTO intake_forms (id, clinic_id, patient_id, appointment_id, raw_answers, status, submitted_at)
+SELECT gen_random_uuid(), a.clinic_id, a.patient_id, a.id, '{}'::jsonb, 'submitted', a.date::timestamptz
+FROM (SELECT *, row_number() OVER (PARTITION BY clinic_id ORDER BY id) AS n FROM appointments) a WHERE a.n <= 500;
+
+INSERT INTO ai_intake_summaries (id, clinic_id, patient_id, appointment_id, intake_form_id, summary_text)
+SELECT gen_random_uuid(), f.clinic_id, f.patient_id, f.appointment_id, f.id, 'Summary' FROM intake_forms f;
+
+INSERT INTO invites (id, email, role, clinic_id, invited_by, token, status, expires_at)
+SELECT gen_random_uuid(), 'invite' || g || '@' || u.id || '.example.com', (ARRAY['doctor', 'admin'])[1 + g % 2],
+       u.clinic_id, u.id, md5(random()::text || g || u.id), (ARRAY['accepted', 'expired', 'cancelled', 'pending'])[1 + g % 4],
+       now() + interval '7 days'
+FROM users u, generate_series(1, 50) g;
+"""
+
+
+def _plan(query):
+    """All nodes of the plan EXPLAIN gives for an ORM query"""
+    _setup()
+    statement = query.statement.compile(dialect=_engine.dialect)
+    params = {k: str(v) if isinstance(v, uuid.UUID) else v for k, v in statement.params.items()}
+    with _engine.connect() as conn:
+        plan = conn.exec_driver_sql(f"EXPLAIN (FORMAT JSON) {statement}", params).scalar()
+        # A partition's copy of an index -> the index declared on the parent table
+        parents = dict(conn.execute(text(
+            "SELECT child.relname, parent.relname FROM pg_inherits "
+            "JOIN pg_class child ON child.oid = pg_inherits.inhrelid "
+            "JOIN pg_class parent ON parent.oid = pg_inherits.inhparent "
+            "WHERE child.relkind = 'i'"
+        )).all())
+
+    nodes = []
+
+    def walk(node):
+        if "Index Name" in node:
+            node["Index Name"] = parents.get(node["Index Name"], node["Index Name"])
+        nodes.append(node)
+        for child in node.get("Plans", []):
+            walk(child)
+
+    walk(plan[0]["Plan"])
+    return nodes
+
+
+def _indexes_used(query):
+    return {node["Index Name"] for node in _plan(query) if "Index Name" in node}
+
+
+def _partitions_scanned(query):
+    return {node["Relation Name"] for node in _plan(query) if "Relation Name" in node}
+
+
+def _assert_index(query, index_name):
+    used = _indexes_used(query)
+    assert index_name in used, f"expected {index_name}, plan used {sorted(used) or 'no index'}"
+
+
+def _session():
+    _setup()
+    return Session(_engine)
+
+
+def test_admin_dashboard_day():
+    # dashboard.get_admin_dashboard / needs-attention / analytics day loop
+    with _session() as db:
+        _assert_index(db.query(Appointment).filter(
+            Appointment.clinic_id == _ids["clinic"],
+            Appointment.date == TODAY,
+            Appointment.status != "cancelled"
+        ), "idx_appointments_clinic_date_active")
+
+
+def test_schedule_doctor_day():
+    # schedule.get_day_schedule / scheduling_service slot validation
+    with _session() as db:
+        _assert_index(db.query(Appointment).filter(
+            Appointment.doctor_id == _ids["doctor"],
+            Appointment.date == TODAY,
+            Appointment.status != "cancelled"
+        ).order_by(Appointment.start_time), "idx_appointments_doctor_date_active")
+
+
+def test_intake_reminder_scan():
+    # tasks.reminders intake reminders / automation_service intake-missing lookup
+    with _session() as db:
+        _assert_index(db.query(Appointment).filter(
+            Appointment.clinic_id == _ids["clinic"],
+            Appointment.date >= TODAY,
+            Appointment.date <= TODAY + timedelta(days=2),
+            Appointment.intake_status == "missing",
+            Appointment.status != "cancelled"
+        ), "idx_appointments_clinic_date_intake_missing")
+
+
+def test_voice_log_list():
+    # owner.get_voice_ai_logs
+    with _session() as db:
+        _assert_index(db.query(VoiceAILog).filter(
+            VoiceAILog.clinic_id == _ids["clinic"]
+        ).order_by(VoiceAILog.created_at.desc()).limit(50), "idx_voice_ai_logs_clinic_created")
+
+
+def test_voice_stats_range():
+    # owner._build_voice_ai_stats / owner dashboard voice counts
+    with _session() as db:
+        _assert_index(db.query(VoiceAILog).filter(
+            VoiceAILog.clinic_id == _ids["clinic"],
+            VoiceAILog.created_at >= datetime.combine(TODAY - timedelta(days=7), datetime.min.time()),
+            VoiceAILog.created_at <= datetime.combine(TODAY, datetime.max.time())
+        ), "idx_voice_ai_logs_clinic_created")
+
+
+def test_voice_stats_range_prunes_partitions():
+    # Only the months the 7-day window touches are scanned
+    with _session() as db:
+        start = TODAY - timedelta(days=7)
+        scanned = _partitions_scanned(db.query(VoiceAILog).filter(
+            VoiceAILog.clinic_id == _ids["clinic"],
+            VoiceAILog.created_at >= datetime.combine(start, datetime.min.time()),
+            VoiceAILog.created_at <= datetime.combine(TODAY, datetime.max.time())
+        ))
+        expected = {f"voice_ai_logs_p{month:%Y_%m}" for month in (start.replace(day=1), TODAY.replace(day=1))}
+        assert scanned == expected, f"expected {sorted(expected)}, plan scanned {sorted(scanned)}"
+
+
+def test_recent_executions_prune_partitions():
+    # dashboard recent activity, bounded to RECENT_ACTIVITY_DAYS
+    with _session() as db:
+        since = datetime.now() - timedelta(days=30)
+        scanned = _partitions_scanned(db.query(AutomationExecution).filter(
+            AutomationExecution.clinic_id == _ids["clinic"],
+            AutomationExecution.status == "success",
+            AutomationExecution.triggered_at >= since
+        ).order_by(AutomationExecution.triggered_at.desc()).limit(10))
+        older = {name for name in scanned if "_p" in name and name < f"automation_executions_p{since:%Y_%m}"}
+        assert scanned and not older, f"expected no month before {since:%Y-%m}, plan scanned {sorted(scanned)}"
+
+
+def test_execution_history():
+    # owner.get_automation_executions
+    with _session() as db:
+        _assert_index(db.query(AutomationExecution).filter(
+            AutomationExecution.clinic_id == _ids["clinic"]
+        ).order_by(AutomationExecution.triggered_at.desc()).limit(50), "idx_automation_executions_clinic_triggered")
+
+
+def test_execution_history_for_rule():
+    with _session() as db:
+        _assert_index(db.query(AutomationExecution).filter(
+            AutomationExecution.clinic_id == _ids["clinic"],
+            AutomationExecution.rule_id == _ids["rule"]
+        ).order_by(AutomationExecution.triggered_at.desc()).limit(50), "idx_automation_executions_rule_triggered")
+
+
+def test_recent_successful_executions():
+    # dashboard recent activity
+    with _session() as db:
+        _assert_index(db.query(AutomationExecution).filter(
+            AutomationExecution.clinic_id == _ids["clinic"],
+            AutomationExecution.status == "success"
+        ).order_by(AutomationExecution.triggered_at.desc()).limit(10), "idx_automation_executions_clinic_success")
+
+
+def test_active_rules_for_event():
+    # AutomationEngine.get_active_rules, on every appointment event
+    with _session() as db:
+        _assert_index(db.query(AutomationRule).filter(
+            AutomationRule.clinic_id == _ids["clinic"],
+            AutomationRule.enabled == True,
+            AutomationRule.trigger_event == "appointment_created"
+        ).order_by(AutomationRule.priority.desc()), "idx_automation_rules_clinic_event_enabled")
+
+
+def test_summary_by_appointment():
+    # intake.get_intake_summary / dashboard needs-attention
+    with _session() as db:
+        _assert_index(db.query(AIIntakeSummary).filter(
+            AIIntakeSummary.appointment_id == _ids["appointment"]
+        ), "idx_ai_intake_summaries_appointment")
+
+
+def test_summary_by_intake_form():
+    with _session() as db:
+        _assert_index(db.query(AIIntakeSummary).filter(
+            AIIntakeSummary.intake_form_id == _ids["intake_form"]
+        ), "idx_ai_intake_summaries_intake_form")
+
+
+def test_intake_form_by_appointment():
+    # intake.regenerate_summary
+    with _session() as db:
+        _assert_index(db.query(IntakeForm).filter(
+            IntakeForm.appointment_id == _ids["appointment"]
+        ), "idx_intake_forms_appointment")
+
+
+def test_pending_invite_count():
+    # invites.list_invites counts / team-size check
+    with _session() as db:
+        _assert_index(db.query(Invite).filter(
+            Invite.clinic_id == _ids["clinic"],
+            Invite.status == "pending"
+        ), "idx_invites_clinic_status")
+
+
+if __name__ == "__main__":
+    tests = [(name, fn) for name, fn in sorted(globals().items()) if name.startswith("test_") and callable(fn)]
+    failed = 0
+    try:
+        for name, fn in tests:
+            try:
+                fn()
+                print(f"✓ {name}")
+            except AssertionError as e:
+                failed += 1
+                print(f"✗ {name}: {e}")
+    finally:
+        _teardown()
+    print(f"\n{len(tests) - failed}/{len(tests)} passed")
+    raise SystemExit(1 if failed else 0)
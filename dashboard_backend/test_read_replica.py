@@ -0,0 +1,239 @@
+"""
+Read-replica routing checks (get_read_db, read-your-writes pins)
+Run: python test_read_replica.py   (or: pytest test_read_replica.py)
+
+Needs the Postgres at DATABASE_URL and the Redis at REDIS_URL. The primary and
+the replica are stood in for by two scratch schemas on that Postgres, each
+holding the same clinic and user but a different clinic name, so a read shows
+which side served it. Both schemas are dropped at the end; the app's tables and
+settings are not touched beyond the duration of the run.
+"""
+import asyncio
+import os
+import time
+import uuid
+
+import redis
+from sqlalchemy import create_engine, text
+from sqlalchemy.orm import sessionmaker
+
+from app.api import deps
+from app.config import settings
+from app.core.security import create_access_token
+from app.database import Base
+from app.models import Clinic, User
+from app.services import read_routing
+from app.services.change_versions import bump_versions
+
+PRIMARY = f"primary_check_{os.getpid()}"
+REPLICA = f"replica_check_{os.getpid()}"
+PIN_SECONDS = 1
+
+_engines = {}
+_saved = {}
+_users = []
+
+
+def _setup():
+    if _engines:
+        return
+    for schema in (PRIMARY, REPLICA):
+        engine = create_engine(settings.DATABASE_URL, connect_args={"options": f"-csearch_path={schema}"})
+        with engine.begin() as conn:
+            conn.execute(text(f"CREATE SCHEMA {schema}"))
+        Base.metadata.create_all(engine)
+        _engines[schema] = engine
+
+    clinic_id = uuid.uuid4()
+    for n in range(3):
+        _users.append(User(
+            id=uuid.uuid4(), email=f"replica-check-{n}-{clinic_id}@example.com", name="Check",
+            role="admin", clinic_id=clinic_id
+        ))
+    # A user of another clinic, to check clinic pins stay per clinic
+    other_clinic_id = uuid.uuid4()
+    _users.append(User(
+        id=uuid.uuid4(), email=f"replica-check-other-{clinic_id}@example.com", name="Check",
+        role="admin", clinic_id=other_clinic_id
+    ))
+    for schema in (PRIMARY, REPLICA):
+        with _engines[schema].begin() as conn:
+            conn.execute(Clinic.__table__.insert(), [
+                {"id": clinic_id, "name": schema},
+                {"id": other_clinic_id, "name": schema},
+            ])
+            conn.execute(User.__table__.insert(), [
+                {c.name: getattr(u, c.name) for c in User.__table__.columns if getattr(u, c.name) is not None}
+                for u in _users
+            ])
+
+    _saved.update(
+        url=settings.DATABASE_READ_URL, seconds=settings.READ_AFTER_WRITE_PRIMARY_SECONDS,
+        engine=deps.engine, read_engine=deps.read_engine,
+        session=deps.SessionLocal, read_session=deps.ReadSessionLocal
+    )
+    settings.DATABASE_READ_URL = "stand-in"
+    settings.READ_AFTER_WRITE_PRIMARY_SECONDS = PIN_SECONDS
+    _route_to_replica(True)
+
+
+def _route_to_replica(enabled):
+    deps.engine = _engines[PRIMARY]
+    deps.SessionLocal = sessionmaker(bind=_engines[PRIMARY])
+    deps.read_engine = _engines[REPLICA] if enabled else _engines[PRIMARY]
+    deps.ReadSessionLocal = sessionmaker(bind=deps.read_engine)
+
+
+def _teardown():
+    if not _engines:
+        return
+    settings.DATABASE_READ_URL = _saved["url"]
+    settings.READ_AFTER_WRITE_PRIMARY_SECONDS = _saved["seconds"]
+    deps.engine, deps.read_engine = _saved["engine"], _saved["read_engine"]
+    deps.SessionLocal, deps.ReadSessionLocal = _saved["session"], _saved["read_session"]
+    for schema, engine in _engines.items():
+        with engine.begin() as conn:
+            conn.execute(text(f"DROP SCHEMA {schema} CASCADE"))
+        engine.dispose()
+    _engines.clear()
+
+
+def setup_module(module):
+    _setup()
+
+
+def teardown_module(module):
+    _teardown()
+
+
+def _served_by(user):
+    """Which schema get_read_db's session reads from for this user"""
+    _setup()
+    primary = deps.SessionLocal()
+    current_user = primary.query(User).filter(User.id == user.id).one()
+    factory = deps.get_read_session_factory(current_user)
+    sessions = deps.get_read_db(factory, primary, current_user)
+    db = next(sessions)
+    try:
+        return db.query(Clinic.name).filter(Clinic.id == user.clinic_id).scalar(), db is primary
+    finally:
+        sessions.close()
+        primary.close()
+
+
+def _request(method, status, user=None):
+    """Send a request with the given outcome through PrimaryPinMiddleware"""
+    async def endpoint(scope, receive, send):
+        await send({"type": "http.response.start", "status": status, "headers": []})
+        await send({"type": "http.response.body", "body": b""})
+
+    async def receive():
+        return {"type": "http.request", "body": b""}
+
+    async def send(message):
+        pass
+
+    headers = []
+    if user:
+        token = create_access_token({"sub": str(user.id), "clinic_id": str(user.clinic_id)})
+        headers.append((b"authorization", f"Bearer {token}".encode()))
+    scope = {"type": "http", "method": method, "path": "/api/appointments", "headers": headers}
+    asyncio.run(read_routing.PrimaryPinMiddleware(endpoint)(scope, receive, send))
+
+
+def _wait_for_pins_to_expire():
+    _setup()
+    time.sleep(PIN_SECONDS + 0.2)
+
+
+def test_reads_use_replica():
+    _wait_for_pins_to_expire()
+    assert _served_by(_users[0]) == (REPLICA, False)
+
+
+def test_replica_reads_release_primary_connection():
+    # get_current_user's session must not stay checked out while the replica serves the request
+    _wait_for_pins_to_expire()
+    primary = deps.SessionLocal()
+    current_user = primary.query(User).filter(User.id == _users[0].id).one()
+    assert primary.in_transaction()
+    sessions = deps.get_read_db(deps.get_read_session_factory(current_user), primary, current_user)
+    db = next(sessions)
+    try:
+        assert not primary.in_transaction()
+        # Lazy loads on the user go to the replica too
+        assert current_user.clinic.name == REPLICA
+    finally:
+        sessions.close()
+        primary.close()
+
+
+def test_without_replica_reads_share_request_session():
+    _wait_for_pins_to_expire()
+    _route_to_replica(False)
+    try:
+        assert _served_by(_users[0]) == (PRIMARY, True)
+    finally:
+        _route_to_replica(True)
+
+
+def test_write_pins_user_to_primary_then_expires():
+    _wait_for_pins_to_expire()
+    _request("POST", 201, _users[0])
+    assert _served_by(_users[0]) == (PRIMARY, True)
+    _wait_for_pins_to_expire()
+    assert _served_by(_users[0]) == (REPLICA, False)
+
+
+def test_pin_is_shared_through_redis():
+    # A pin set by another API worker (no in-process copy) still routes to the primary
+    _wait_for_pins_to_expire()
+    _request("PUT", 200, _users[1])
+    read_routing._local_pins.clear()
+    assert _served_by(_users[1]) == (PRIMARY, True)
+
+
+def test_failed_write_or_read_does_not_pin():
+    _wait_for_pins_to_expire()
+    _request("POST", 422, _users[0])
+    _request("GET", 200, _users[0])
+    _request("POST", 201)  # Unauthenticated, e.g. login
+    assert _served_by(_users[0]) == (REPLICA, False)
+
+
+def test_version_bump_pins_clinic():
+    # Webhook / Celery writes bump versions without a user; the whole clinic reads
+    # from the primary so version-keyed caches aren't filled from a lagging replica
+    _wait_for_pins_to_expire()
+    bump_versions(_users[3].clinic_id)
+    read_routing._local_pins.clear()
+    assert _served_by(_users[3]) == (PRIMARY, True)
+    assert _served_by(_users[0]) == (REPLICA, False)
+
+
+def test_redis_outage_reads_from_primary():
+    _wait_for_pins_to_expire()
+    real_get_redis = read_routing.get_redis
+    unreachable = redis.Redis(port=1, socket_timeout=0.2, socket_connect_timeout=0.2)
+    read_routing.get_redis = lambda: unreachable
+    try:
+        assert _served_by(_users[2]) == (PRIMARY, True)
+    finally:
+        read_routing.get_redis = real_get_redis
+
+
+if __name__ == "__main__":
+    tests = [(name, fn) for name, fn in sorted(globals().items()) if name.startswith("test_") and callable(fn)]
+    failed = 0
+    try:
+        for name, fn in tests:
+            try:
+                fn()
+                print(f"✓ {name}")
+            except AssertionError as e:
+                failed += 1
+                print(f"✗ {name}: {e}")
+    finally:
+        _teardown()
+    print(f"\n{len(tests) - failed}/{len(tests)} passed")
+    raise SystemExit(1 if failed else 0)
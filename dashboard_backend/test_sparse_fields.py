@@ -0,0 +1,77 @@
+"""
+Sparse fieldset checks (app/api/sparse.py)
+Run: python test_sparse_fields.py   (or: pytest test_sparse_fields.py)
+
+Uses the real appointment and voice-log field sets; no database needed, rows are
+built by hand in the order select() lays the columns out.
+"""
+from datetime import datetime, timezone
+
+from fastapi import HTTPException
+
+from app.api.appointments import APPOINTMENT_FIELDS
+from app.api.owner import VOICE_LOG_FIELDS
+from app.api.sparse import FastJSONResponse
+
+
+def test_unknown_field_is_400():
+    try:
+        APPOINTMENT_FIELDS.parse("id,date,favourite_colour")
+        assert False, "an unknown field should be rejected"
+    except HTTPException as e:
+        assert e.status_code == 400
+        assert "favourite_colour" in e.detail
+
+
+def test_parse_keeps_declaration_order():
+    assert APPOINTMENT_FIELDS.parse(" status, patient ,id,") == ["id", "status", "patient"]
+
+
+def test_default_excludes_optional_fields():
+    default = VOICE_LOG_FIELDS.parse(None)
+    assert "transcript" not in default
+    assert default == [f for f in VOICE_LOG_FIELDS.available if f != "transcript"]
+    assert "transcript" in VOICE_LOG_FIELDS.parse("id,transcript")
+    # Appointments have no optional fields: everything by default
+    assert APPOINTMENT_FIELDS.parse("") == APPOINTMENT_FIELDS.available
+
+
+def test_to_dicts_nests_groups_and_computes_full_name():
+    selected = APPOINTMENT_FIELDS.parse("id,status,patient")
+    patient = ("p1", "c1", "Ada", "Lovelace", "ada@example.com", "555", None, None, None)
+    assert len(APPOINTMENT_FIELDS.select(selected)) == 2 + len(patient)
+
+    [item] = APPOINTMENT_FIELDS.to_dicts([("a1", "scheduled") + patient], selected)
+    assert item["id"] == "a1" and item["status"] == "scheduled"
+    assert item["patient"]["full_name"] == "Ada Lovelace"
+    assert item["patient"]["email"] == "ada@example.com"
+    assert list(item) == ["id", "status", "patient"]
+
+
+def test_to_dicts_outer_join_miss_is_null_group():
+    selected = APPOINTMENT_FIELDS.parse("id,doctor,patient")
+    doctor = (None,) * 7  # no doctor row for this appointment
+    patient = ("p1", "c1", "Ada", "Lovelace", None, None, None, None, None)
+
+    [item] = APPOINTMENT_FIELDS.to_dicts([("a1",) + doctor + patient], selected)
+    assert item["doctor"] is None
+    assert item["patient"]["full_name"] == "Ada Lovelace"
+
+
+def test_datetimes_render_like_pydantic():
+    at = datetime(2026, 3, 1, 9, 30, tzinfo=timezone.utc)
+    assert FastJSONResponse({"at": at}).body == b'{"at":"2026-03-01T09:30:00Z"}'
+
+
+if __name__ == "__main__":
+    tests = [(name, fn) for name, fn in sorted(globals().items()) if name.startswith("test_") and callable(fn)]
+    failed = 0
+    for name, fn in tests:
+        try:
+            fn()
+            print(f"✓ {name}")
+        except AssertionError as e:
+            failed += 1
+            print(f"✗ {name}: {e}")
+    print(f"\n{len(tests) - failed}/{len(tests)} passed")
+    raise SystemExit(1 if failed else 0)
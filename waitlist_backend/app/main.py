@@ -56,23 +56,21 @@ async def health_check():
 async def submit_waitlist(submission: WaitlistSubmission):
     """
     Submit a new waitlist entry.
-    Saves the submission to Google Sheets with timestamp.
+    Stores the submission locally and acknowledges it; it is replicated to Google
+    Sheets in the background (app/sheets_writer.py).
     """
     try:
-        # Initialize service on each request for serverless compatibility
+        # Cheap after the first request: opens the local store, not Google
         sheets_service = get_google_sheets_service()
-        
-        # Check if Google Sheets is configured
-        if sheets_service.client is None or sheets_service.spreadsheet is None:
-            # Return success but log that Google Sheets is not configured
-            print(f"Warning: Waitlist submission received but Google Sheets not configured. Submission: {submission.email}")
+        await sheets_service.add_waitlist_submission(submission)
+
+        if not sheets_service.configured:
+            print(f"Warning: Waitlist submission stored but Google Sheets not configured. Submission: {submission.email}")
             return WaitlistResponse(
                 success=True,
                 message="Successfully received submission (Google Sheets not configured)"
             )
-        
-        await sheets_service.add_waitlist_submission(submission)
-        
+
         return WaitlistResponse(
             success=True,
             message="Successfully added to waitlist"
@@ -91,22 +89,19 @@ async def submit_waitlist(submission: WaitlistSubmission):
 async def submit_contact(submission: ContactSubmission):
     """
     Submit a contact form entry.
-    Saves the submission to Google Sheets with timestamp.
+    Stores the submission locally; it is replicated to Google Sheets in the background.
     """
     try:
-        # Initialize service on each request for serverless compatibility
         sheets_service = get_google_sheets_service()
-        
-        # Check if Google Sheets is configured
-        if sheets_service.client is None or sheets_service.spreadsheet is None:
-            print(f"Warning: Contact submission received but Google Sheets not configured. Submission: {submission.email}")
+        await sheets_service.add_contact_submission(submission)
+
+        if not sheets_service.configured:
+            print(f"Warning: Contact submission stored but Google Sheets not configured. Submission: {submission.email}")
             return ContactResponse(
                 success=True,
                 message="Successfully received contact submission (Google Sheets not configured)"
             )
-        
-        await sheets_service.add_contact_submission(submission)
-        
+
         return ContactResponse(
             success=True,
             message="Successfully submitted contact form"
@@ -1,2 +1,10 @@
-# Direct import - let google_sheets handle its own errors
-from .google_sheets import GoogleSheetsService, get_google_sheets_service
+# Lazy re-exports: importing app.services (e.g. from app.main on a cold start) must not
+# load gspread / google-auth — they are only imported when the Sheets service is built
+__all__ = ["GoogleSheetsService", "get_google_sheets_service"]
+
+
+def __getattr__(name):
+    if name in __all__:
+        from . import google_sheets
+        return getattr(google_sheets, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")